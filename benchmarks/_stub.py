@@ -0,0 +1,74 @@
+"""
+Minimal local Dkron stub used by the benchmarks
+"""
+import json
+import threading
+import time
+
+from six.moves import BaseHTTPServer, socketserver
+
+
+class _StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self, status=200):
+        with self.server.lock:
+            self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = self.server.routes.get(self.path.split("?")[0], b"{}")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        # Dkron answers 201 to a job save
+        self._reply(201 if self.path == "/v1/jobs" else 200)
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def start_stub(routes=None, latency=0):
+    """
+    Start a stub server in a background thread and return it
+
+    :param routes: Mapping of path to response payload
+    :param latency: Seconds to wait before every response
+    """
+    server = _StubServer(("127.0.0.1", 0), _StubHandler)
+    server.latency = latency
+    server.requests = 0
+    server.lock = threading.Lock()
+    server.routes = {}
+    for path, payload in (routes or {"/v1/": {"stub": True}}).items():
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode("utf-8")
+        server.routes[path] = payload
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    server.host = "127.0.0.1:%d" % server.server_address[1]
+    return server
+
+
+def percentile(samples, pct):
+    """
+    Return the pct percentile of the samples
+    """
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
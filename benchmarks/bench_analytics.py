@@ -0,0 +1,75 @@
+"""
+Execution statistics over a large fleet, per execution dict loop against
+the columnar ExecutionTable
+
+Usage: PYTHONPATH=. python benchmarks/bench_analytics.py [jobs] [executions]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+from pydkron import analytics
+from pydkron.analytics import ExecutionTable
+from pydkron.executions import parse_time
+
+BASE = 1792137600
+
+
+def _stamp(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _executions(job, count):
+    executions = []
+    for index in range(count):
+        group = BASE + index * 60 + job % 60
+        started = group + random.random() * 2
+        executions.append({
+            "job_name": "job-%d" % job,
+            "started_at": _stamp(started),
+            "finished_at": _stamp(started + random.expovariate(0.1)),
+            "success": random.random() > 0.02,
+            "node_name": "node-%d" % (index % 5),
+            "attempt": 1 if random.random() > 0.01 else 2,
+            "group": int(group * 1e9),
+        })
+    return executions
+
+
+def _dict_loop(history):
+    stats = {}
+    for name, executions in history.items():
+        durations = sorted(
+            (parse_time(execution["finished_at"]) - parse_time(execution["started_at"]))
+            .total_seconds() for execution in executions)
+        failures = sum(1 for execution in executions if not execution["success"])
+        stats[name] = (durations[len(durations) // 2], failures / float(len(executions)))
+    return stats
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    history = dict(("job-%d" % job, _executions(job, count)) for job in range(jobs))
+    start = time.perf_counter()
+    _dict_loop(history)
+    print("dict loop (p50, failure rate) %8.2f s" % (time.perf_counter() - start))
+    start = time.perf_counter()
+    table = ExecutionTable.from_executions(history)
+    print("build table                   %8.2f s (%d rows)" % (
+        time.perf_counter() - start, len(table)))
+    installed = analytics.numpy
+    for label, numpy in (("numpy", installed), ("python", None)):
+        if label == "numpy" and numpy is None:
+            continue
+        analytics.numpy = numpy
+        for by in ("job", "node"):
+            start = time.perf_counter()
+            table.summary(by=by)
+            print("summary by %-4s %-6s        %8.2f s" % (by, label, time.perf_counter() - start))
+    analytics.numpy = installed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Indexed JobCatalog queries against a linear scan of the job list
+
+Usage: PYTHONPATH=. python benchmarks/bench_catalog.py [jobs] [queries]
+"""
+import sys
+import time
+
+from pydkron.catalog import JobCatalog
+
+
+def _job(index):
+    return {
+        "name": "job-%06d" % index,
+        "schedule": "@every %dm" % (index % 60 + 1),
+        "owner": "team-%d" % (index % 50),
+        "disabled": index % 10 == 0,
+        "tags": {"role": "worker-%d:1" % (index % 200)},
+    }
+
+
+def _scan(jobs):
+    return [job for job in jobs
+            if job["owner"] == "team-7" and job["tags"].get("role") == "worker-57:1"
+            and not job["disabled"]]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    jobs = [_job(index) for index in range(total)]
+    start = time.perf_counter()
+    catalog = JobCatalog(jobs=jobs)
+    print("build %8.1f ms" % ((time.perf_counter() - start) * 1000))
+    start = time.perf_counter()
+    for _ in range(queries):
+        expected = _scan(jobs)
+    print("scan  %8.3f ms/query" % ((time.perf_counter() - start) * 1000 / queries))
+    start = time.perf_counter()
+    for _ in range(queries):
+        found = catalog.query(owner="team-7", tags={"role": "worker-57:1"}, disabled=False)
+    print("index %8.3f ms/query" % ((time.perf_counter() - start) * 1000 / queries))
+    assert len(found) == len(expected)
+
+
+if __name__ == "__main__":
+    main()
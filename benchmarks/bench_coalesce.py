@@ -0,0 +1,55 @@
+"""
+Burst of threads reading the same job with and without coalescing
+
+Reports the requests that reached the server and the caller latency.
+
+Usage: PYTHONPATH=. python benchmarks/bench_coalesce.py [threads] [calls]
+"""
+import sys
+import threading
+import time
+
+from _stub import percentile, start_stub
+from pydkron.client import DkronClient
+from pydkron.ratelimit import RateLimiter
+
+
+def _burst(client, threads, calls):
+    latencies = []
+    lock = threading.Lock()
+
+    def _worker():
+        for _ in range(calls):
+            start = time.perf_counter()
+            client.get_job("job1")
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=_worker) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return latencies
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    for coalesce, rate_limit in ((False, None), (True, None), (False, RateLimiter(rate=200))):
+        server = start_stub({"/v1/jobs/job1": {"name": "job1"}}, latency=0.005)
+        with DkronClient(hosts=[server.host], max_connections=threads, coalesce=coalesce,
+                         rate_limit=rate_limit) as client:
+            start = time.perf_counter()
+            latencies = _burst(client, threads, calls)
+            elapsed = time.perf_counter() - start
+        print("coalesce=%-5s rate_limit=%-4s %5d server requests %7.0f req/s at server "
+              "p50 %6.1f ms p99 %6.1f ms" % (
+                  coalesce, rate_limit and int(rate_limit.bucket.rate), server.requests,
+                  server.requests / elapsed, percentile(latencies, 50) * 1000,
+                  percentile(latencies, 99) * 1000))
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Marshal and unmarshal micro-benchmarks for the available JSON codecs
+
+Usage: PYTHONPATH=. python benchmarks/bench_codec.py [iterations]
+"""
+import json
+import sys
+import timeit
+
+from pydkron.codec import CODECS, get_codec
+from pydkron.job import DkronJob
+
+SMALL = {"name": "job1", "schedule": "@every 5m", "command": "true"}
+LARGE = {
+    "name": "job1",
+    "schedule": "0 */5 * * * *",
+    "command": "/usr/local/bin/task",
+    "owner": "Platform Team",
+    "owner_email": "platform@example.com",
+    "disabled": False,
+    "retries": 2,
+    "concurrency": "forbid",
+    "tags": dict(("tag%d" % index, "value%d:1" % index) for index in range(50)),
+    "processors": {"files": {"forward": True, "log_dir": "/var/log/dkron"}},
+    "dependent_jobs": ["child%d" % index for index in range(50)],
+    "executor_config": {"command": "x" * 4096},
+}
+
+
+def _copy_marshal(job):
+    # the marshal path before codecs: copy into a plain dict, then json.dumps
+    data = {}
+    for key, value in job.items():
+        if key.startswith("_"):
+            continue
+        data[key] = value
+    return json.dumps(data)
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("%-8s %-16s %12s %12s" % ("job", "codec", "marshal us", "unmarshal us"))
+    for label, data in (("small", SMALL), ("large", LARGE)):
+        job = DkronJob(None, **data)
+        payload = json.dumps([data] * 100).encode("utf-8")
+        cases = [("json (copy)", lambda: _copy_marshal(job), None)]
+        for name in CODECS:
+            try:
+                codec = get_codec(name)
+            except ValueError:
+                continue
+            cases.append((name, lambda codec=codec: job.marshal(codec), codec))
+        for name, marshal, codec in cases:
+            dump = timeit.timeit(marshal, number=number) / number * 1e6
+            load = "-"
+            if codec is not None:
+                seconds = timeit.timeit(lambda: codec.loads(payload), number=number // 100 or 1)
+                load = "%12.2f" % (seconds / (number // 100 or 1) / 100 * 1e6)
+            print("%-8s %-16s %12.2f %12s" % (label, name, dump, load))
+
+
+if __name__ == "__main__":
+    main()
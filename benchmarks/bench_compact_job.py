@@ -0,0 +1,52 @@
+"""
+Construction, attribute access and memory of DkronJob against CompactJob
+
+Usage: PYTHONPATH=. python benchmarks/bench_compact_job.py [jobs]
+"""
+import sys
+import time
+import tracemalloc
+
+from pydkron.job import DkronJob, CompactJob
+
+
+def _data(index):
+    return {
+        "name": "job-%06d" % index,
+        "schedule": "@every 5m",
+        "command": "/usr/local/bin/task --id %d" % index,
+        "owner": "Platform Team",
+        "success_count": index,
+        "error_count": 0,
+        "disabled": False,
+        "tags": {"role": "worker:1"},
+        "retries": 2,
+        "concurrency": "allow",
+    }
+
+
+def _bench(job_class, payload):
+    tracemalloc.start()
+    start = time.time()
+    jobs = [job_class.from_dict(data, None) for data in payload]
+    construct = time.time() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.time()
+    for job in jobs:
+        job.name, job.schedule, job.command, job.owner, job.retries
+    access = time.time() - start
+    return construct, access, size / float(len(jobs))
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    payload = [_data(index) for index in range(total)]
+    print("%-11s %12s %12s %14s" % ("", "construct s", "5 attrs s", "bytes per job"))
+    for job_class in (DkronJob, CompactJob):
+        construct, access, per_job = _bench(job_class, payload)
+        print("%-11s %12.3f %12.3f %14.0f" % (job_class.__name__, construct, access, per_job))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Client CPU of polling an unchanged job list with and without conditional_jobs
+
+The stub sends no validators, so the content hash path is measured.
+
+Usage: PYTHONPATH=. python benchmarks/bench_conditional.py [jobs] [polls]
+"""
+import sys
+import time
+
+from _stub import start_stub
+from pydkron.client import DkronClient
+
+
+def _job(index):
+    return {
+        "name": "job-%06d" % index,
+        "schedule": "@every 5m",
+        "command": "/usr/local/bin/task --id %d" % index,
+        "owner": "Platform Team",
+        "tags": {"role": "worker:1"},
+        "retries": 2,
+    }
+
+
+def _poll(client, polls):
+    client.jobs()
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(polls):
+        client.jobs()
+    return (time.perf_counter() - wall) / polls, (time.process_time() - cpu) / polls
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    polls = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    server = start_stub({"/v1/jobs": [_job(index) for index in range(total)]})
+    for conditional in (False, True):
+        with DkronClient(hosts=[server.host], conditional_jobs=conditional) as client:
+            wall, cpu = _poll(client, polls)
+        print("conditional_jobs=%-5s %8.1f ms/poll wall %8.1f ms/poll cpu" % (
+            conditional, wall * 1000, cpu * 1000))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Time to jobs() of short-lived processes, each starting a new client,
+with and without the disk cache (the interpreter and imports are not timed)
+
+The stub answers with a delay, like a busy cluster across the network.
+
+Usage: PYTHONPATH=. python benchmarks/bench_diskcache.py [jobs] [processes]
+"""
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from _stub import start_stub
+
+_CHILD = """
+import sys, time
+from pydkron.client import DkronClient
+from pydkron.diskcache import DiskCache
+start = time.perf_counter()
+disk_cache = DiskCache(sys.argv[2], ttl=300) if sys.argv[2] else None
+with DkronClient(hosts=[sys.argv[1]], disk_cache=disk_cache) as client:
+    count = len(client.jobs())
+print("%d %f" % (count, time.perf_counter() - start))
+"""
+
+
+def _job(index):
+    return {
+        "name": "job-%06d" % index,
+        "schedule": "@every 5m",
+        "command": "/usr/local/bin/task --id %d" % index,
+        "owner": "Platform Team",
+        "tags": {"role": "worker:1"},
+    }
+
+
+def _run(host, path, processes):
+    timings = []
+    for _ in range(processes):
+        output = subprocess.check_output([sys.executable, "-c", _CHILD, host, path])
+        timings.append(float(output.split()[1]))
+    return timings
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    server = start_stub({"/v1/jobs": [_job(index) for index in range(total)]}, latency=0.05)
+    path = tempfile.mkdtemp()
+    try:
+        for label, cache_path in (("no cache", ""), ("disk cache", path)):
+            before = server.requests
+            timings = sorted(_run(server.host, cache_path, processes))
+            print("%-10s %5d processes %4d server reads  median %7.1f ms  max %7.1f ms" % (
+                label, processes, server.requests - before,
+                timings[len(timings) // 2] * 1000, timings[-1] * 1000))
+    finally:
+        shutil.rmtree(path)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Load test of every DkronClient request method against a FakeCluster,
+reporting ops/sec and latency percentiles per method
+
+The fake cluster runs in the same interpreter as the client, so the
+numbers are for comparing revisions on one machine, not absolute server
+capacity. Every method keeps its best of --repeat runs to damp the
+noise. With --baseline the ops/sec are compared to a previous --save and
+the script exits with 1 when a method got slower than --tolerance.
+
+Usage: PYTHONPATH=. python benchmarks/bench_load.py [--jobs N] [--ops N]
+    [--threads N] [--nodes N] [--latency MS] [--repeat N] [--save PATH] [--baseline PATH]
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import sys
+import time
+
+from _stub import percentile
+from pydkron.client import DkronClient
+from pydkron.fakeserver import FakeCluster
+from pydkron.job import DkronJob
+
+
+def _job(name):
+    return {
+        "name": name,
+        "schedule": "@every 5m",
+        "command": "/usr/local/bin/task --name %s" % name,
+        "owner": "Platform Team",
+        "tags": {"role": "worker:1"},
+    }
+
+
+def _operations(jobs):
+    """
+    Return (method, setup(cluster, ops), op(client, index)) of every measured method
+    """
+    def _name(index):
+        return "job-%06d" % (index % jobs)
+
+    def _created(prefix):
+        def _setup(cluster, ops):
+            cluster.add_jobs(_job("%s-%d" % (prefix, index)) for index in range(ops))
+        return _setup
+
+    def _drain(iterator):
+        for _ in iterator:
+            pass
+
+    return [
+        ("status", None, lambda client, index: client.status()),
+        ("leader", None, lambda client, index: client.leader(refresh=True)),
+        ("jobs", None, lambda client, index: client.jobs()),
+        ("iter_jobs", None, lambda client, index: _drain(client.iter_jobs())),
+        ("get_job", None, lambda client, index: client.get_job(_name(index))),
+        ("save_job", None, lambda client, index: client.save_job(
+            DkronJob(client, **_job("saved-%d" % index)))),
+        ("run_job", None, lambda client, index: client.run_job(_name(index))),
+        ("toggle", None, lambda client, index: client.toggle(_name(index))),
+        ("get_executions", None, lambda client, index: client.get_executions(_name(index))),
+        ("iter_executions", None, lambda client, index: _drain(
+            client.iter_executions(_name(index), limit=5))),
+        ("delete_job", _created("deleted"), lambda client, index: client.delete_job(
+            "deleted-%d" % index)),
+        ("save_jobs(10)", None, lambda client, index: client.save_jobs(
+            [_job("bulk-%d-%d" % (index, item)) for item in range(10)])),
+    ]
+
+
+def _measure(client, func, ops, threads):
+    """
+    Run func ops times on threads workers, returns the wall time, latencies and errors
+    """
+    def _timed(index):
+        start = time.perf_counter()
+        try:
+            func(client, index)
+        except Exception:  # pylint: disable=broad-except
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(_timed, range(ops)))
+    wall = time.perf_counter() - start
+    latencies = [latency for latency in results if latency is not None]
+    return wall, latencies, len(results) - len(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=1.0, help="server latency in ms")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare to the results of a previous --save")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="ops/sec drop reported as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    with FakeCluster(nodes=args.nodes, latency=args.latency / 1000.0, seed=0) as cluster:
+        cluster.add_jobs(_job("job-%06d" % index) for index in range(args.jobs))
+        with DkronClient(hosts=cluster.hosts, max_connections=args.threads) as client:
+            print("%-16s %7s %10s %9s %9s %9s %7s" % (
+                "method", "ops", "ops/sec", "p50 ms", "p95 ms", "p99 ms", "errors"))
+            for method, setup, func in _operations(args.jobs):
+                runs = []
+                for _ in range(args.repeat):
+                    if setup is not None:
+                        setup(cluster, args.ops)
+                    runs.append(_measure(client, func, args.ops, args.threads))
+                wall, latencies, errors = min(runs, key=lambda run: run[0])
+                result = {"ops_per_sec": args.ops / wall, "errors": errors}
+                for pct in (50, 95, 99):
+                    result["p%d" % pct] = percentile(latencies, pct) if latencies else None
+                results[method] = result
+                print("%-16s %7d %10.1f %9.2f %9.2f %9.2f %7d" % (
+                    method, args.ops, result["ops_per_sec"], (result["p50"] or 0) * 1000,
+                    (result["p95"] or 0) * 1000, (result["p99"] or 0) * 1000, errors))
+
+    if args.save:
+        with open(args.save, "w") as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as source:
+            baseline = json.load(source)
+        regressions = []
+        for method, result in sorted(results.items()):
+            previous = baseline.get(method)
+            if previous is None:
+                continue
+            change = result["ops_per_sec"] / previous["ops_per_sec"] - 1
+            if change < -args.tolerance:
+                regressions.append(method)
+            print("%-16s %+7.1f%% ops/sec" % (method, change * 100))
+        if regressions:
+            print("Regressions: %s" % ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Per call overhead of DkronClient._call with metrics disabled and enabled
+
+The HTTP session is replaced by an in-process fake so only the client
+bookkeeping is measured.
+
+Usage: PYTHONPATH=. python benchmarks/bench_metrics.py [calls]
+"""
+import sys
+import time
+import timeit
+
+import requests
+
+from pydkron.client import DkronClient
+from pydkron.metrics import ClientMetrics
+
+
+class _FakeSession(object):
+    def __init__(self):
+        self.resp = requests.Response()
+        self.resp.status_code = 200
+        self.resp._content = b"{}"
+        self.resp.headers["Content-Length"] = "2"
+
+    def request(self, *args, **kwargs):
+        return self.resp
+
+
+def _bench(client, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        client._call("get", "/jobs/job1")
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    session = _FakeSession()
+    results = []
+    for label, metrics in (("disabled", None), ("enabled", ClientMetrics())):
+        client = DkronClient(hosts=["localhost:8080"], metrics=metrics)
+        client._sessions["localhost:8080"] = session
+        _bench(client, calls // 10)
+        results.append((label, min(_bench(client, calls) for _ in range(3))))
+    baseline = results[0][1]
+    for label, micros in results:
+        print("%-9s %7.3f us/call  (+%.3f us)" % (label, micros, micros - baseline))
+    # the only work the disabled path adds to _call is two "is not None" checks
+    check = timeit.timeit(
+        "if metrics is not None: pass", setup="metrics = None", number=calls * 10)
+    print("disabled path cost %.1f ns/call" % (check / (calls * 10) * 2 * 1e9))
+
+
+if __name__ == "__main__":
+    main()
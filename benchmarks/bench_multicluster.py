@@ -0,0 +1,42 @@
+"""
+jobs() over several clusters, one client per cluster in a loop against
+MultiClusterClient
+
+Every stub cluster answers after a different latency.
+
+Usage: PYTHONPATH=. python benchmarks/bench_multicluster.py [clusters] [rounds]
+"""
+import sys
+import time
+
+from _stub import start_stub
+from pydkron.client import DkronClient
+from pydkron.multicluster import MultiClusterClient
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    servers = [
+        start_stub({"/v1/jobs": [{"name": "job-%d-%d" % (index, job)} for job in range(100)]},
+                   latency=0.02 * (index + 1))
+        for index in range(count)]
+    clusters = dict(("cluster-%d" % index, DkronClient(hosts=[server.host]))
+                    for index, server in enumerate(servers))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        jobs = [job for client in clusters.values() for job in client.jobs()]
+    print("sequential   %7.1f ms/round %d jobs" % (
+        (time.perf_counter() - start) * 1000 / rounds, len(jobs)))
+    with MultiClusterClient(clusters) as client:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            jobs = client.jobs()
+        print("multicluster %7.1f ms/round %d jobs (slowest cluster %d ms)" % (
+            (time.perf_counter() - start) * 1000 / rounds, len(jobs), 20 * count))
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Compare per-request connections against pooled keep-alive sessions
+
+Usage: PYTHONPATH=. python benchmarks/bench_pooling.py [requests]
+"""
+import sys
+import time
+
+import requests
+
+from _stub import start_stub, percentile
+from pydkron.client import DkronClient
+
+
+def _run(call, count):
+    latencies = []
+    start = time.time()
+    for _ in range(count):
+        begin = time.time()
+        call()
+        latencies.append(time.time() - begin)
+    elapsed = time.time() - start
+    return count / elapsed, percentile(latencies, 99) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    server = start_stub()
+    url = "http://%s/v1/" % server.host
+
+    def unpooled():
+        requests.get(url, timeout=10).json()
+
+    with DkronClient(hosts=[server.host]) as client:
+        results = [
+            ("unpooled", _run(unpooled, count)),
+            ("pooled", _run(client.status, count)),
+        ]
+    server.shutdown()
+    for name, (rate, p99) in results:
+        print("%-10s %10.1f req/s  p99 %7.3f ms" % (name, rate, p99))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Per second load histogram of a large job set over a day
+
+Usage: PYTHONPATH=. python benchmarks/bench_schedule.py [jobs]
+"""
+import sys
+import time
+
+from pydkron import schedule
+from pydkron.schedule import load_histogram, peaks
+
+START = "2026-10-16T00:00:00Z"
+END = "2026-10-17T00:00:00Z"
+
+
+def _job(index):
+    kinds = (
+        "@every 1m",
+        "@hourly",
+        "%d %d * * * *" % (index % 60, index // 60 % 60),
+        "%d %d */2 * * *" % (index % 60, index // 60 % 60),
+        "0 %d 9 * * mon-fri" % (index % 60),
+        "%d * * * * *" % (index % 60),
+    )
+    return {"name": "job-%06d" % index, "schedule": kinds[index % len(kinds)]}
+
+
+def _run(label, jobs):
+    schedule.parse_schedule.cache_clear()
+    start = time.perf_counter()
+    counts, _ = load_histogram(jobs, START, END)
+    print("%-8s %8.1f ms %d fires" % (label, (time.perf_counter() - start) * 1000, sum(counts)))
+    return counts
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    jobs = [_job(index) for index in range(total)]
+    numpy = schedule.numpy
+    if numpy is not None:
+        counts = _run("numpy", jobs)
+    schedule.numpy = None
+    counts = _run("python", jobs)
+    schedule.numpy = numpy
+    for when, count in peaks(counts, START, top=5):
+        print("%s %d jobs" % (when.isoformat(), count))
+
+
+if __name__ == "__main__":
+    main()
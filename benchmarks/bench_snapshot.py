@@ -0,0 +1,76 @@
+"""
+Snapshot size, export and load time of a large job set
+
+Compares the snapshot against a plain JSON dump of the job list, the
+peak memory is the tracemalloc peak while reading every job.
+
+Usage: PYTHONPATH=. python benchmarks/bench_snapshot.py [jobs]
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pydkron.job import CompactJob
+from pydkron.snapshot import export_snapshot, iter_snapshot
+
+
+def _job(index):
+    return {
+        "name": "job-%06d" % index,
+        "schedule": "@every 5m",
+        "command": "/usr/local/bin/task --id %d" % index,
+        "owner": "Platform Team",
+        "owner_email": "platform@example.com",
+        "tags": {"role": "worker:1"},
+        "retries": 2,
+        "disabled": False,
+        "success_count": index,
+        "error_count": 0,
+    }
+
+
+def _measure(label, path, load):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = load(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("%-22s %7.1f MB %8.1f ms load %7.1f MB peak (%d jobs)" % (
+        label, os.path.getsize(path) / 1e6, elapsed * 1000, peak / 1e6, count))
+
+
+def _load_json(path):
+    with open(path) as source:
+        return len(json.load(source))
+
+
+def _count_lazy(path):
+    return sum(1 for _ in iter_snapshot(path, job_class=CompactJob))
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    jobs = [_job(index) for index in range(total)]
+    tmpdir = tempfile.mkdtemp()
+    try:
+        plain = os.path.join(tmpdir, "jobs.json")
+        with open(plain, "w") as output:
+            json.dump(jobs, output)
+        _measure("json.load", plain, _load_json)
+        for name in ("jobs.ndjson", "jobs.ndjson.gz"):
+            path = os.path.join(tmpdir, name)
+            start = time.perf_counter()
+            export_snapshot(jobs, path)
+            print("export %-15s %8.1f ms" % (name, (time.perf_counter() - start) * 1000))
+            _measure("iter_snapshot " + name.split(".", 1)[1], path, _count_lazy)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
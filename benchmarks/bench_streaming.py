@@ -0,0 +1,55 @@
+"""
+Peak memory of jobs() against the streaming iter_jobs() on a large payload
+
+Usage: PYTHONPATH=. python benchmarks/bench_streaming.py [jobs]
+"""
+import sys
+import time
+import tracemalloc
+
+from _stub import start_stub
+from pydkron.client import DkronClient
+
+
+def _job(index):
+    return {
+        "name": "job-%06d" % index,
+        "schedule": "@every 5m",
+        "command": "/usr/local/bin/task --id %d" % index,
+        "owner": "Platform Team",
+        "owner_email": "platform@example.com",
+        "success_count": index,
+        "error_count": 0,
+        "disabled": False,
+        "tags": {"role": "worker:1", "dc": "dc1"},
+        "retries": 2,
+        "processors": {"log": {"forward": True}},
+        "concurrency": "allow",
+    }
+
+
+def _measure(func):
+    tracemalloc.start()
+    start = time.time()
+    count = func()
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / (1024.0 * 1024.0)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    server = start_stub({"/v1/jobs": [_job(index) for index in range(total)]})
+    with DkronClient(hosts=[server.host]) as client:
+        results = [
+            ("jobs()", _measure(lambda: len(client.jobs()))),
+            ("iter_jobs()", _measure(lambda: sum(1 for _ in client.iter_jobs()))),
+        ]
+    server.shutdown()
+    for name, (count, elapsed, peak) in results:
+        print("%-12s %8d jobs %7.2f s  peak %8.1f MiB" % (name, count, elapsed, peak))
+
+
+if __name__ == "__main__":
+    main()
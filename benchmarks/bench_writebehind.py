@@ -0,0 +1,46 @@
+"""
+Burst of repeated saves and toggles of the same jobs, written right away
+against the write-behind queue
+
+Usage: PYTHONPATH=. python benchmarks/bench_writebehind.py [jobs] [updates]
+"""
+import sys
+import time
+
+from _stub import start_stub
+from pydkron.client import DkronClient
+from pydkron.job import DkronJob
+
+
+def _burst(client, jobs, updates):
+    results = []
+    for update in range(updates):
+        for index in range(jobs):
+            job = DkronJob(client, name="job-%d" % index, schedule="@every %dm" % (update + 1))
+            results.append(job.save())
+            results.append(client.toggle(job.name))
+    return results
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    for write_behind in (False, True):
+        server = start_stub({"/v1/jobs": {"name": "job"}}, latency=0.002)
+        with DkronClient(hosts=[server.host]) as client:
+            if write_behind:
+                queue = client.enable_write_behind(interval=0.5)
+            start = time.perf_counter()
+            results = _burst(client, jobs, updates)
+            if write_behind:
+                queue.flush()
+                for future in results:
+                    future.result()
+            elapsed = time.perf_counter() - start
+        print("write_behind=%-5s %5d calls %5d server writes %8.1f ms" % (
+            write_behind, len(results), server.requests, elapsed * 1000))
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Asyncio Dkron Client Object
+
+Requires the optional ``aiohttp`` dependency (``pip install pydkron[async]``).
+"""
+import asyncio
+import time
+
+import aiohttp
+
+from pydkron.client import (
+    DkronClientException, DkronJobNotFound, _GET, _POST, _DELETE, _UNHEALTHY_STATUSES)
+from pydkron.codec import get_codec
+from pydkron.hosts import HostPool, LEAST_LATENCY
+from pydkron.job import DkronJob
+
+
+class AsyncDkronClient(object):
+    """
+    AsyncDkronClient is a non-blocking API client for DKRON
+
+    It mirrors DkronClient, every API method is a coroutine and the
+    returned DkronJob objects have awaitable save/run/delete/executions.
+    """
+    def __init__(self, hosts, max_connections=100, keep_alive=True, timeout=10,
+                 host_strategy=LEAST_LATENCY, codec=None):
+        """
+        Creates a new API client
+
+        :param hosts: List of hosts (including port)
+        :param max_connections: Maximum number of open connections across all hosts
+        :param keep_alive: Reuse connections between requests
+        :param timeout: Total timeout (in seconds) of a single request
+        :param host_strategy: Host ordering, least_latency, round_robin or random
+        :param codec: JSON codec name or instance, the fastest installed one by default
+        """
+        if not isinstance(hosts, list):
+            hosts = [hosts]
+        self.hosts = hosts
+        self.max_connections = max_connections
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.host_pool = HostPool(hosts, strategy=host_strategy)
+        self.codec = get_codec(codec)
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the underlying HTTP session
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        """
+        Return the shared HTTP session, creating it if needed
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections, force_close=not self.keep_alive)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'Content-Type': 'application/json'})
+        return self._session
+
+    async def _call(self, method, endpoint, payload=None, idempotent=None):
+        """
+        Call the endpoint and return the (status, body) of the response
+
+        Like DkronClient, an idempotent request (every method but POST by
+        default) answered with 502, 503 or 504 is retried on the next host,
+        the last host's answer is returned as is.
+        """
+        if idempotent is None:
+            idempotent = method != _POST
+        session = self._get_session()
+        hosts = self.host_pool.order()
+        for index, host in enumerate(hosts):
+            url = "http://%s/v1%s" % (host, endpoint)
+            start = time.monotonic()
+            try:
+                async with session.request(method, url, data=payload) as resp:
+                    body = await resp.read()
+            except (aiohttp.ClientError, OSError, asyncio.TimeoutError):
+                self.host_pool.record_failure(host)
+                continue
+            if resp.status in _UNHEALTHY_STATUSES:
+                self.host_pool.record_failure(host)
+                if idempotent and index + 1 < len(hosts):
+                    continue
+            else:
+                self.host_pool.record_success(host, time.monotonic() - start)
+            return resp.status, body
+        raise DkronClientException("No valid host found")
+
+    async def status(self):
+        """
+        Return the general status of the DKRON cluster
+        """
+        _, body = await self._call(_GET, "/")
+        return self.codec.loads(body)
+
+    async def jobs(self):
+        """
+        Returns a list of jobs
+        """
+        _, body = await self._call(_GET, "/jobs")
+        return [DkronJob.from_dict(job_data, self) for job_data in self.codec.loads(body)]
+
+    async def get_job(self, name):
+        """
+        Return a job by name
+        """
+        status, body = await self._call(_GET, "/jobs/%s" % name)
+        if status == 404:
+            raise DkronJobNotFound("Job %s was not found" % name)
+        return DkronJob.from_dict(self.codec.loads(body), self)
+
+    async def save_job(self, job):
+        """
+        Save a job to the cluster
+        """
+        status, body = await self._call(
+            _POST, "/jobs", job.marshal(self.codec), idempotent=True)
+        if status != 201:
+            raise DkronClientException("Job could not be saved [status=%d]" % status)
+        return self.codec.loads(body)
+
+    async def run_job(self, name):
+        """
+        Run the job by name
+        """
+        status, body = await self._call(_POST, "/jobs/%s" % name)
+        if status == 404:
+            raise DkronJobNotFound("Job %s was not found" % name)
+        return self.codec.loads(body)
+
+    async def delete_job(self, name):
+        """
+        Delete the job by name
+        """
+        status, body = await self._call(_DELETE, "/jobs/%s" % name)
+        if status == 404:
+            raise DkronJobNotFound("Job %s was not found" % name)
+        return self.codec.loads(body)
+
+    async def create_job(self, data):
+        """
+        Create/update a job
+        """
+        job = DkronJob.from_dict(data, self)
+        await self.save_job(job)
+        return job
+
+    async def get_executions(self, name):
+        """
+        Get the job executions for a named job
+        """
+        status, body = await self._call(_GET, "/jobs/%s/executions/" % name)
+        if status == 404:
+            raise DkronJobNotFound("Job %s was not found" % name)
+        return self.codec.loads(body)
+
+    async def toggle(self, name):
+        """
+        Enable/disable a job
+        """
+        status, body = await self._call(_POST, "/jobs/%s/toggle" % name)
+        if status == 404:
+            raise DkronJobNotFound("Job %s was not found" % name)
+        return DkronJob.from_dict(self.codec.loads(body), self)
@@ -0,0 +1,388 @@
+"""
+Columnar execution history and fleet wide statistics
+
+The executions of many jobs are fetched concurrently into an
+ExecutionTable holding one column per field (numpy arrays when numpy is
+installed, array.array otherwise). summary() computes the duration
+percentiles, failure rates, retries and late start skew per job, node or
+tag over whole columns instead of looping over execution dicts.
+"""
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+import math
+
+from pydkron.bulk import run_bulk
+from pydkron.exceptions import DkronJobNotFound
+from pydkron.executions import parse_time
+from pydkron.schedule import CronSchedule, parse_schedule
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+NAN = float("nan")
+
+_fromisoformat = datetime.fromisoformat
+
+# Dkron reports unfinished executions with the zero time (year 1)
+_ZERO_TIME = -62135596800.0
+
+
+def _timestamp(value):
+    """
+    Return the epoch of an RFC3339 timestamp, NaN for the zero time
+    """
+    if not value:
+        return NAN
+    try:
+        stamp = _fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        stamp = parse_time(value).timestamp()
+    return NAN if stamp <= _ZERO_TIME else stamp
+
+
+class _Codes(object):
+    """
+    Dictionary encoding of a string column
+    """
+    def __init__(self):
+        self.labels = []
+        self.codes = {}
+
+    def code(self, label):
+        code = self.codes.get(label)
+        if code is None:
+            code = self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+
+class ExecutionTable(object):
+    """
+    Executions of many jobs stored as columns
+
+    job and node hold integer codes into job_names and node_names;
+    started, finished and group are epoch seconds (NaN when unknown),
+    success is 1/0 and attempt the execution attempt (1 for the first).
+    """
+    def __init__(self, jobs=None):
+        """
+        :param jobs: Optional jobs (DkronJob or dict) used for the tag groups and schedule skew
+        """
+        self.jobs = dict((job["name"], job) for job in jobs or [])
+        self._job_codes = _Codes()
+        self._node_codes = _Codes()
+        self.job = array("l")
+        self.node = array("l")
+        self.started = array("d")
+        self.finished = array("d")
+        self.group = array("d")
+        self.success = array("b")
+        self.attempt = array("l")
+        self.errors = {}
+
+    @property
+    def job_names(self):
+        """
+        Job name of every job code
+        """
+        return self._job_codes.labels
+
+    @property
+    def node_names(self):
+        """
+        Node name of every node code
+        """
+        return self._node_codes.labels
+
+    def __len__(self):
+        return len(self.started)
+
+    def add(self, name, executions):
+        """
+        Append the executions of a job (None, a null response body, is no executions)
+
+        Every column is computed before any is extended, so a malformed
+        execution raises without leaving the columns of unequal length.
+        """
+        if executions is None:
+            return
+        if not isinstance(executions, list):
+            executions = list(executions)
+        started = [_timestamp(execution.get("started_at")) for execution in executions]
+        finished = [_timestamp(execution.get("finished_at")) for execution in executions]
+        # the group is the dispatch time in nanoseconds
+        group = [
+            execution["group"] / 1e9 if execution.get("group") else NAN
+            for execution in executions]
+        success = [1 if execution.get("success") else 0 for execution in executions]
+        attempt = [execution.get("attempt") or 1 for execution in executions]
+        node_code = self._node_codes.code
+        node = [node_code(execution.get("node_name") or "") for execution in executions]
+        self.job.extend(array("l", [self._job_codes.code(name)]) * len(executions))
+        self.node.extend(node)
+        self.started.extend(started)
+        self.finished.extend(finished)
+        self.group.extend(group)
+        self.success.extend(success)
+        self.attempt.extend(attempt)
+
+    @classmethod
+    def from_executions(cls, executions, jobs=None):
+        """
+        Build a table from a mapping of job name to its executions
+        """
+        table = cls(jobs)
+        for name, job_executions in executions.items():
+            table.add(name, job_executions)
+        return table
+
+    def columns(self):
+        """
+        Return the columns as a dict of numpy arrays (lists without numpy)
+        """
+        names = ("job", "node", "started", "finished", "group", "success", "attempt")
+        if numpy is None:
+            return dict((name, list(getattr(self, name))) for name in names)
+        return dict(
+            (name, numpy.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode))
+            for name in names)
+
+    def _fires(self, code, first, last):
+        """
+        Return the cron fire times of a job around [first, last], None
+        when the job or its cron schedule is unknown
+        """
+        job = self.jobs.get(self.job_names[code])
+        if job is None or not job.get("schedule"):
+            return None
+        try:
+            schedule = parse_schedule(job["schedule"], job.get("timezone") or None)
+        except ValueError:
+            return None
+        if not isinstance(schedule, CronSchedule):
+            return None
+        return schedule.fire_epochs(int(first) - 86400, int(last) + 1) or None
+
+    def _scheduled(self, columns):
+        """
+        Return the nominal start of every execution: the last fire time of
+        the job cron schedule at or before the start, else the dispatch time
+        """
+        scheduled = numpy.array(columns["group"], dtype=float)
+        started = columns["started"]
+        order = numpy.argsort(columns["job"], kind="stable")
+        bounds = numpy.cumsum(numpy.bincount(columns["job"], minlength=len(self.job_names)))
+        for code in range(len(self.job_names)):
+            rows = order[bounds[code - 1] if code else 0:bounds[code]]
+            rows = rows[~numpy.isnan(started[rows])]
+            if not len(rows):
+                continue
+            fires = self._fires(code, started[rows].min(), started[rows].max())
+            if fires is None:
+                continue
+            fires = numpy.asarray(fires, dtype=float)
+            index = numpy.searchsorted(fires, started[rows], side="right") - 1
+            found = index >= 0
+            scheduled[rows[found]] = fires[index[found]]
+        return scheduled
+
+    def _labels(self, by, tag):
+        """
+        Return the group label of every job code (by job, tag) or node code
+        """
+        if by == "job":
+            return list(self.job_names)
+        if by == "node":
+            return list(self.node_names)
+        if by == "tag":
+            if tag is None:
+                raise ValueError("Grouping by tag needs the tag name")
+            return [
+                ((self.jobs.get(name) or {}).get("tags") or {}).get(tag)
+                for name in self.job_names
+            ]
+        raise ValueError("Unknown grouping %s [valid=job,node,tag]" % by)
+
+    def summary(self, by="job", tag=None, percentiles=(50, 95, 99)):
+        """
+        Return the statistics of every group as {label: stats}
+
+        stats holds count, failures, failure_rate, running, retries (the
+        executions beyond the first attempt), the duration percentiles
+        (duration_p50...) and mean of the finished executions and the late
+        start skew percentiles (skew_p50...) and max in seconds. The skew
+        is measured against the job cron schedule when the job is known,
+        else against the dispatch time of the execution group.
+
+        :param by: job, node or tag
+        :param tag: Tag name when grouping by tag
+        :param percentiles: Percentiles to report
+        """
+        labels = self._labels(by, tag)
+        if not len(self):
+            return {}
+        if numpy is None:
+            return _summary_python(self, by, labels, percentiles)
+        columns = self.columns()
+        codes = columns["node"] if by == "node" else columns["job"]
+        label_codes = _Codes()
+        group_of_code = numpy.array(
+            [label_codes.code(label) for label in labels], dtype=numpy.int64)
+        groups = group_of_code[codes]
+        count = len(label_codes.labels)
+        started, finished = columns["started"], columns["finished"]
+        duration = finished - started
+        skew = started - self._scheduled(columns)
+        totals = numpy.bincount(groups, minlength=count)
+        unfinished = numpy.isnan(finished)
+        running = numpy.bincount(groups, weights=unfinished, minlength=count)
+        failures = numpy.bincount(
+            groups, weights=(columns["success"] == 0) & ~unfinished, minlength=count)
+        retries = numpy.bincount(
+            groups, weights=numpy.maximum(columns["attempt"] - 1, 0), minlength=count)
+        stats = dict((label, {
+            "count": int(totals[index]),
+            "failures": int(failures[index]),
+            "failure_rate": float(failures[index] / max(totals[index] - running[index], 1)),
+            "running": int(running[index]),
+            "retries": int(retries[index]),
+        }) for index, label in enumerate(label_codes.labels))
+        for name, values in (("duration", duration), ("skew", skew)):
+            points, means, maxima = _group_percentiles(groups, values, count, percentiles)
+            for index, label in enumerate(label_codes.labels):
+                for pct, value in zip(percentiles, points[index]):
+                    stats[label]["%s_p%s" % (name, pct)] = value
+                if name == "duration":
+                    stats[label]["duration_mean"] = means[index]
+                else:
+                    stats[label]["skew_max"] = maxima[index]
+        return stats
+
+
+def _group_percentiles(groups, values, count, percentiles):
+    """
+    Linear interpolation percentiles, mean and max of values per group, NaN values ignored
+    """
+    valid = ~numpy.isnan(values)
+    groups, values = groups[valid], values[valid]
+    # sort by value, then stable by group (a radix sort for small group codes)
+    order = numpy.argsort(values)
+    keys = groups[order]
+    if count <= 1 << 16:
+        keys = keys.astype(numpy.uint16)
+    order = order[numpy.argsort(keys, kind="stable")]
+    groups, values = groups[order], values[order]
+    sizes = numpy.bincount(groups, minlength=count)
+    starts = numpy.concatenate(([0], numpy.cumsum(sizes)[:-1]))
+    points = numpy.full((count, len(percentiles)), NAN)
+    present = sizes > 0
+    for column, pct in enumerate(percentiles):
+        rank = (sizes[present] - 1) * pct / 100.0
+        low = numpy.floor(rank).astype(numpy.int64)
+        high = numpy.minimum(low + 1, sizes[present] - 1)
+        fraction = rank - low
+        base = starts[present]
+        points[present, column] = (
+            values[base + low] * (1 - fraction) + values[base + high] * fraction)
+    sums = numpy.bincount(groups, weights=values, minlength=count)
+    means = numpy.where(present, sums / numpy.maximum(sizes, 1), NAN)
+    maxima = numpy.full(count, NAN)
+    maxima[present] = values[starts[present] + sizes[present] - 1]
+    return points.tolist(), means.tolist(), maxima.tolist()
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return NAN
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(math.floor(rank))
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] * (1 - (rank - low)) + ordered[high] * (rank - low)
+
+
+def _summary_python(table, by, labels, percentiles):
+    """
+    summary() without numpy
+    """
+    codes = table.node if by == "node" else table.job
+    bounds = {}
+    for row, code in enumerate(table.job):
+        started = table.started[row]
+        if not math.isnan(started):
+            first, last = bounds.get(code, (started, started))
+            bounds[code] = (min(first, started), max(last, started))
+    fires = dict(
+        (code, table._fires(code, first, last)) for code, (first, last) in bounds.items())
+    stats = {}
+    values = {}
+    for row, code in enumerate(codes):
+        label = labels[code]
+        entry = stats.get(label)
+        if entry is None:
+            entry = stats[label] = {
+                "count": 0, "failures": 0, "running": 0, "retries": 0}
+            values[label] = ([], [])
+        entry["count"] += 1
+        entry["retries"] += max(table.attempt[row] - 1, 0)
+        started, finished = table.started[row], table.finished[row]
+        if math.isnan(finished):
+            entry["running"] += 1
+        else:
+            if not table.success[row]:
+                entry["failures"] += 1
+            values[label][0].append(finished - started)
+        scheduled = table.group[row]
+        job_fires = fires.get(table.job[row])
+        if job_fires is not None and not math.isnan(started):
+            index = bisect_right(job_fires, started) - 1
+            if index >= 0:
+                scheduled = job_fires[index]
+        if not math.isnan(scheduled) and not math.isnan(started):
+            values[label][1].append(started - scheduled)
+    for label, entry in stats.items():
+        durations, skews = sorted(values[label][0]), sorted(values[label][1])
+        entry["failure_rate"] = float(entry["failures"]) / max(entry["count"] - entry["running"], 1)
+        for pct in percentiles:
+            entry["duration_p%s" % pct] = _percentile(durations, pct)
+            entry["skew_p%s" % pct] = _percentile(skews, pct)
+        entry["duration_mean"] = sum(durations) / len(durations) if durations else NAN
+        entry["skew_max"] = skews[-1] if skews else NAN
+    return stats
+
+
+def fetch_executions(client, jobs=None, since=None, until=None, limit=None, max_workers=None):
+    """
+    Fetch the executions of many jobs concurrently into an ExecutionTable
+
+    Jobs whose executions could not be fetched or read are mapped to their
+    exception in table.errors (DkronJobNotFound for the missing jobs).
+
+    :param client: DkronClient
+    :param jobs: Jobs (or job names), every job of the cluster by default
+    :param since: Oldest start time (datetime or RFC3339 string)
+    :param until: Newest start time (datetime or RFC3339 string)
+    :param limit: Maximum number of executions per job
+    :param max_workers: Concurrency, the client max_workers by default
+    """
+    if jobs is None:
+        jobs = client.jobs()
+    jobs = [job if isinstance(job, dict) else {"name": job} for job in jobs]
+    result = run_bulk(
+        lambda job: client.get_executions(job["name"], since=since, until=until, limit=limit),
+        jobs, key=lambda job: job["name"],
+        max_workers=max_workers if max_workers is not None else client.max_workers)
+    table = ExecutionTable(jobs)
+    table.errors = dict(result.failed)
+    for job in jobs:
+        if job["name"] in result.succeeded:
+            try:
+                table.add(job["name"], result.succeeded[job["name"]])
+            except Exception as exc:  # pylint: disable=broad-except
+                # one malformed response does not lose the whole report
+                table.errors[job["name"]] = exc
+    for name in result.not_found:
+        table.errors[name] = DkronJobNotFound("Job %s was not found" % name)
+    return table
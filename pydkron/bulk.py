@@ -0,0 +1,83 @@
+"""
+Bulk job operations with bounded parallelism
+"""
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from pydkron.exceptions import DkronJobNotFound
+
+
+class BulkResult(object):
+    """
+    Per item outcome of a bulk operation
+
+    succeeded maps the item key to the API response, not_found lists the
+    keys that raised DkronJobNotFound and failed maps the key to any other
+    exception raised for it.
+    """
+    def __init__(self):
+        self.succeeded = {}
+        self.not_found = []
+        self.failed = {}
+
+    @property
+    def ok(self):
+        """
+        True when every item succeeded
+        """
+        return not self.not_found and not self.failed
+
+    def __len__(self):
+        return len(self.succeeded) + len(self.not_found) + len(self.failed)
+
+    def __repr__(self):
+        return "<BulkResult succeeded=%d not_found=%d failed=%d>" % (
+            len(self.succeeded), len(self.not_found), len(self.failed))
+
+    def update(self, other):
+        """
+        Merge the outcomes of another BulkResult
+        """
+        self.succeeded.update(other.succeeded)
+        self.not_found.extend(other.not_found)
+        self.failed.update(other.failed)
+
+    def add(self, key, func, item):
+        """
+        Call func(item) and record the outcome under key
+        """
+        try:
+            self.succeeded[key] = func(item)
+        except DkronJobNotFound:
+            self.not_found.append(key)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.failed[key] = exc
+
+
+def run_bulk(func, items, key=None, max_workers=8):
+    """
+    Call func for every item on a thread pool and collect a BulkResult
+
+    At most max_workers calls run at the same time and only a bounded
+    number of items are pulled from the iterable ahead of the workers,
+    so large generators are never materialised.
+
+    :param func: Callable taking a single item
+    :param items: Iterable of items
+    :param key: Callable returning the result key for an item (default: the item)
+    :param max_workers: Maximum number of concurrent calls
+    """
+    if key is None:
+        key = lambda item: item
+    result = BulkResult()
+    if max_workers <= 1:
+        for item in items:
+            result.add(key(item), func, item)
+        return result
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for item in items:
+            if len(pending) >= max_workers * 2:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            pending.add(pool.submit(result.add, key(item), func, item))
+        wait(pending)
+    return result
@@ -0,0 +1,75 @@
+"""
+Client side TTL cache
+"""
+from collections import OrderedDict
+from threading import Lock
+import time
+
+
+class TTLCache(object):
+    """
+    Thread safe, size bounded LRU cache whose entries expire after ttl seconds
+    """
+    def __init__(self, ttl=5, maxsize=256):
+        """
+        :param ttl: Seconds an entry stays fresh
+        :param maxsize: Maximum number of entries, the least recently used is evicted
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None, record_miss=True):
+        """
+        Return the fresh value for key, or default
+
+        :param record_miss: Count a lookup that finds nothing as a miss
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+            if record_miss:
+                self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Store value under key for ttl seconds
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, *keys):
+        """
+        Drop the given keys
+        """
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Drop every entry
+        """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        Return the hit/miss counters and current size
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
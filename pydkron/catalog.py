@@ -0,0 +1,173 @@
+"""
+Indexed in-memory job catalog
+"""
+from collections import defaultdict
+
+
+def _tag_items(job):
+    tags = job.get("tags") or {}
+    return list(tags.items())
+
+
+class JobCatalog(object):
+    """
+    Jobs of a cluster with secondary indexes for fast queries
+
+    Indexes are kept on the tags (key/value pairs and keys), owner,
+    parent_job, dependent_jobs, disabled and schedule. query() intersects
+    the matching name sets starting with the smallest one, so lookups do
+    not scan the jobs. refresh() only re-indexes the jobs that changed.
+    """
+    def __init__(self, client=None, jobs=None):
+        """
+        :param client: DkronClient used by refresh()
+        :param jobs: Initial jobs, fetched from the client when omitted
+        """
+        self.client = client
+        self.jobs = {}
+        self._tags = defaultdict(set)
+        self._tag_keys = defaultdict(set)
+        self._owners = defaultdict(set)
+        self._children = defaultdict(set)
+        self._dependents = defaultdict(set)
+        self._disabled = defaultdict(set)
+        self._schedules = defaultdict(set)
+        if jobs is None and client is not None:
+            self.refresh()
+        else:
+            for job in jobs or []:
+                self.add(job)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def __contains__(self, name):
+        return name in self.jobs
+
+    def __iter__(self):
+        return iter(self.jobs.values())
+
+    def get(self, name):
+        """
+        Return the job by name, None when it is not in the catalog
+        """
+        return self.jobs.get(name)
+
+    def _index(self, job, add):
+        name = job["name"]
+        entries = [
+            (self._owners, job.get("owner")),
+            (self._children, job.get("parent_job") or None),
+            (self._disabled, bool(job.get("disabled"))),
+            (self._schedules, job.get("schedule")),
+        ]
+        entries.extend((self._tags, item) for item in _tag_items(job))
+        entries.extend((self._tag_keys, key) for key, _ in _tag_items(job))
+        entries.extend((self._dependents, child) for child in job.get("dependent_jobs") or [])
+        for index, value in entries:
+            if add:
+                index[value].add(name)
+                continue
+            names = index.get(value)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del index[value]
+
+    def add(self, job):
+        """
+        Add or replace a job
+        """
+        self.remove(job["name"])
+        self.jobs[job["name"]] = job
+        self._index(job, True)
+
+    def remove(self, name):
+        """
+        Remove a job by name, returns it (None when it was not in the catalog)
+        """
+        job = self.jobs.pop(name, None)
+        if job is not None:
+            self._index(job, False)
+        return job
+
+    def refresh(self, jobs=None):
+        """
+        Sync the catalog with the cluster (or the given jobs)
+
+        Only added, removed and changed jobs are re-indexed. Returns the
+        (added, changed, removed) job names.
+        """
+        if jobs is None:
+            jobs = self.client.jobs()
+        current = dict((job["name"], job) for job in jobs)
+        added, changed = [], []
+        for name, job in current.items():
+            old = self.jobs.get(name)
+            if old is None:
+                added.append(name)
+            elif old is not job and old != job:
+                changed.append(name)
+            else:
+                continue
+            self.add(job)
+        removed = [name for name in self.jobs if name not in current]
+        for name in removed:
+            self.remove(name)
+        return added, changed, removed
+
+    def query(self, tags=None, tag_keys=None, owner=None, parent=None, child=None,
+              disabled=None, schedule=None):
+        """
+        Return the jobs matching every given criteria
+
+        :param tags: Dict of tag values, e.g. {"role": "etl"}
+        :param tag_keys: Iterable of tag keys the jobs must have
+        :param owner: Job owner
+        :param parent: Name of the parent job (returns its children)
+        :param child: Name of a dependent job (returns its parent)
+        :param disabled: True or False
+        :param schedule: Schedule expression
+        """
+        sets = []
+        for key, value in (tags or {}).items():
+            sets.append(self._tags.get((key, value), ()))
+        for key in tag_keys or ():
+            sets.append(self._tag_keys.get(key, ()))
+        if owner is not None:
+            sets.append(self._owners.get(owner, ()))
+        if parent is not None:
+            sets.append(self._children.get(parent, ()))
+        if child is not None:
+            sets.append(self._dependents.get(child, ()))
+        if disabled is not None:
+            sets.append(self._disabled.get(bool(disabled), ()))
+        if schedule is not None:
+            sets.append(self._schedules.get(schedule, ()))
+        if not sets:
+            return list(self.jobs.values())
+        sets.sort(key=len)
+        names = set(sets[0])
+        for other in sets[1:]:
+            if not names:
+                break
+            names.intersection_update(other)
+        return [self.jobs[name] for name in names]
+
+    def children(self, name):
+        """
+        Return the jobs whose parent_job is name
+        """
+        return self.query(parent=name)
+
+    def owners(self):
+        """
+        Return the job count per owner
+        """
+        return dict((owner, len(names)) for owner, names in self._owners.items())
+
+    def tags(self):
+        """
+        Return the job count per (tag key, tag value)
+        """
+        return dict((item, len(names)) for item, names in self._tags.items())
@@ -1,120 +1,557 @@
 """
 Dkron Client Object
 """
-from random import shuffle
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from threading import Lock
+import hashlib
+import time
 
 import requests
+import requests.adapters
 import requests.exceptions
 
 from six.moves import xrange
+from six.moves.urllib.parse import urlencode
 
+from pydkron.bulk import BulkResult, run_bulk
+from pydkron.catalog import JobCatalog
+from pydkron.codec import get_codec
+from pydkron.diskcache import DiskCache
+from pydkron.exceptions import DkronClientException, DkronJobNotFound
+from pydkron.graph import delete_tree, save_tree
+from pydkron.executions import (
+    ExecutionTail, UnsortedExecutions, execution_key, filter_executions, parse_time)
+from pydkron.hosts import HostPool, LEAST_LATENCY
 from pydkron.job import DkronJob
+from pydkron.reconcile import reconcile as reconcile_jobs
+from pydkron.ratelimit import RateLimiter
+from pydkron.retry import RETRY_STATUSES, RetryPolicy, not_sent
+from pydkron.singleflight import SingleFlight
+from pydkron.snapshot import export_snapshot, iter_snapshot
+from pydkron.stream import iter_json_array
+from pydkron.watch import JobWatcher
+from pydkron.writebehind import WriteBehindQueue
 
 _GET = "get"
 _POST = "post"
 _DELETE = "delete"
 
+# statuses that mean the host itself is unhealthy, the ones retried on another host
+_UNHEALTHY_STATUSES = RETRY_STATUSES
 
-class DkronClientException(Exception):
+# validators and decoded jobs of the last GET /jobs response
+_JobsState = namedtuple("_JobsState", ["etag", "last_modified", "digest", "jobs"])
+
+
+def _body_size(resp, stream):
     """
-    Generic client exception
+    Return the size of a response body without reading a streamed one
     """
-    pass
+    length = resp.headers.get("Content-Length")
+    if length is not None:
+        return int(length)
+    return 0 if stream else len(resp.content)
+
 
-class DkronJobNotFound(Exception):
+def _close_response(future):
     """
-    Job not found
+    Close the response of a request that lost a hedge
     """
-    pass
+    if future.exception() is None:
+        future.result().close()
 
 
 class DkronClient(object):
     """
     DkronClient is an API client for DKRON
     """
-    def __init__(self, hosts):
+    def __init__(self, hosts, pool_size=1, max_connections=10, keep_alive=True,
+                 max_workers=8, cache=None, host_strategy=LEAST_LATENCY,
+                 leader_routing=False, leader_ttl=30, codec=None, metrics=None,
+                 retry=None, conditional_jobs=False, rate_limit=None, coalesce=False,
+                 disk_cache=None):
         """
         Creates a new API client
 
         :param hosts: List of hosts (including port)
+        :param pool_size: Number of connection pools kept per host session
+        :param max_connections: Maximum number of connections kept alive per host
+        :param keep_alive: Reuse connections between requests
+        :param max_workers: Default concurrency of the bulk job operations
+        :param cache: Optional pydkron.cache.TTLCache for jobs() and get_job()
+        :param host_strategy: Host ordering, least_latency, round_robin or random
+        :param leader_routing: Send writes to the Raft leader and reads to the followers
+        :param leader_ttl: Seconds the discovered leader is trusted before it is looked up again
+        :param codec: JSON codec name or instance, the fastest installed one by default
+        :param metrics: Optional pydkron.metrics.ClientMetrics to record every request in
+        :param retry: pydkron.retry.RetryPolicy with the timeouts, retries and hedging
+        :param conditional_jobs: Revalidate jobs() (ETag, Last-Modified or a content hash)
+            and return the previous job objects when the list has not changed
+        :param rate_limit: pydkron.ratelimit.RateLimiter, or the maximum requests per second
+        :param coalesce: Share one request between the identical GETs made at the same time
+        :param disk_cache: pydkron.diskcache.DiskCache shared with the other processes for
+            status(), jobs() and get_job(), or True for one in the default directory
         """
         if not isinstance(hosts, list):
             hosts = [hosts]
         self.hosts = hosts
+        self.pool_size = pool_size
+        self.max_connections = max_connections
+        self.keep_alive = keep_alive
+        self.max_workers = max_workers
+        self.cache = cache
+        self.codec = get_codec(codec)
+        self.metrics = metrics
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.conditional_jobs = conditional_jobs
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+        self.rate_limit = rate_limit
+        self.coalesce = coalesce
+        if disk_cache is True:
+            disk_cache = DiskCache()
+        self.disk_cache = disk_cache or None
+        self._cluster_key = ",".join(sorted(hosts))
+        self._flights = SingleFlight()
+        self._jobs_state = None
+        self._watchers = {}
+        self.host_pool = HostPool(hosts, strategy=host_strategy)
+        self.leader_routing = leader_routing
+        self.leader_ttl = leader_ttl
+        self._leader = None
+        self._leader_checked = None
+        self._leader_lock = Lock()
+        self._sessions = {}
+        self._sessions_lock = Lock()
+        self._hedge_executor = None
+        self.write_behind = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Flush the write-behind queue, stop the job watchers and close all the
+        pooled host sessions
+        """
+        self.disable_write_behind()
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            watchers = list(self._watchers.values())
+            self._watchers.clear()
+            executor, self._hedge_executor = self._hedge_executor, None
+        for watcher in watchers:
+            watcher.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+        for session in sessions:
+            session.close()
+
+    def _session(self, host):
+        """
+        Return the pooled session for a host, creating it if needed
+        """
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.pool_size,
+                    pool_maxsize=self.max_connections)
+                session.mount("http://", adapter)
+                session.headers['Content-Type'] = 'application/json'
+                if not self.keep_alive:
+                    session.headers['Connection'] = 'close'
+                self._sessions[host] = session
+        return session
+
+    def leader(self, refresh=False):
+        """
+        Return the host of the Raft leader, None when no host claims to be it
+
+        The answer (including not finding a leader) is cached for leader_ttl seconds.
+        """
+        checked = self._leader_checked
+        if not refresh and checked is not None and time.monotonic() - checked < self.leader_ttl:
+            return self._leader
+        with self._leader_lock:
+            # another thread may have looked it up while this one waited
+            if not refresh and self._leader_checked not in (None, checked):
+                return self._leader
+            leader = None
+            for host in self.host_pool.order():
+                try:
+                    # a probe counts against the rate limit and shows in the metrics
+                    resp = self._attempt(
+                        host, _GET, "/isleader", None, False, self.retry.timeout(), None,
+                        redirects=False)
+                except (requests.exceptions.RequestException, DkronClientException):
+                    continue
+                if resp.status_code == 200:
+                    leader = host
+                    break
+            self._leader = leader
+            self._leader_checked = time.monotonic()
+        return leader
+
+    def _forget_leader(self):
+        """
+        Drop the cached leader so the next write looks it up again
+        """
+        self._leader = None
+        self._leader_checked = None
+
+    def _route(self, method):
+        """
+        Return the hosts to try for a method and the leader they were routed by
+        """
+        hosts = self.host_pool.order()
+        if not self.leader_routing:
+            return hosts, None
+        leader = self.leader()
+        if leader is None or leader not in hosts or len(hosts) == 1:
+            return hosts, None
+        hosts.remove(leader)
+        if method == _GET:
+            hosts.append(leader)
+        else:
+            hosts.insert(0, leader)
+        return hosts, leader
+
+    def _attempt(self, host, method, endpoint, payload, stream, timeout, leader, headers=None,
+                 redirects=True):
+        """
+        Send a single request to host and record its outcome
+
+        The request waits for the rate limit and is recorded in the metrics
+        and the host pool, redirects=False returns redirects as they are.
+        """
+        metrics = self.metrics
+        if self.rate_limit is not None:
+            waited = self.rate_limit.acquire(host, timeout=self.retry.deadline)
+            if waited is None:
+                raise DkronClientException("Rate limit for %s exceeded" % host)
+            if waited and metrics is not None:
+                metrics.record_throttle(waited)
+        url = "http://%s/v1%s" % (host, endpoint)
+        start = time.monotonic()
+        try:
+            resp = self._session(host).request(
+                method, url, data=payload, timeout=timeout, stream=stream, headers=headers,
+                allow_redirects=redirects)
+        except requests.exceptions.RequestException as exc:
+            self.host_pool.record_failure(host)
+            if host == leader:
+                self._forget_leader()
+            if metrics is not None:
+                metrics.record(
+                    method, endpoint, host, time.monotonic() - start,
+                    error=exc, sent=len(payload or ""))
+            raise
+        latency = time.monotonic() - start
+        if resp.status_code in _UNHEALTHY_STATUSES:
+            self.host_pool.record_failure(host)
+        else:
+            self.host_pool.record_success(host, latency)
+            if method == _GET:
+                self.retry.record_latency(latency)
+        if host == leader and (resp.history or resp.status_code in _UNHEALTHY_STATUSES):
+            # the leader moved (redirect) or is failing, find it again on the next write
+            self._forget_leader()
+        if metrics is not None:
+            metrics.record(
+                method, endpoint, host, latency, status=resp.status_code,
+                sent=len(payload or ""), received=_body_size(resp, stream))
+        return resp
 
-    def _call(self, method, endpoint, payload=None):
+    def _hedged(self, hosts, endpoint, timeout, headers=None):
+        """
+        GET from the first host and, if it is slower than the hedge delay, from
+        the second host too; returns the first good response or None
+        """
+        delay = self.retry.hedge_delay()
+        if delay is None:
+            return None
+        pool = self._hedge_pool()
+        futures = [pool.submit(
+            self._attempt, hosts[0], _GET, endpoint, None, False, timeout, None, headers)]
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            if self.metrics is not None:
+                self.metrics.record_retry()
+            futures.append(pool.submit(
+                self._attempt, hosts[1], _GET, endpoint, None, False, timeout, None, headers))
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    resp = future.result()
+                    if resp.status_code not in self.retry.retry_statuses:
+                        for other in pending:
+                            other.add_done_callback(_close_response)
+                        return resp
+                    resp.close()
+        return None
+
+    def _hedge_pool(self):
+        """
+        Return the thread pool that runs hedged requests
+        """
+        with self._sessions_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._hedge_executor
+
+    def _call(self, method, endpoint, payload=None, stream=False, idempotent=None,
+              headers=None):
         """
         Call the endpoint and return the response
+
+        With stream=True the body is not read, the caller must close the response.
+        headers are added to the session headers. Non-idempotent calls (POST by
+        default) are only retried when the request was never sent. With coalesce
+        on, identical GETs in flight at the same time share one response.
+        """
+        if self.coalesce and method == _GET and not stream:
+            key = (endpoint, tuple(sorted(headers.items())) if headers else None)
+            resp, shared = self._flights.do(
+                key, self._request, method, endpoint, payload, stream, idempotent, headers)
+            if shared and self.metrics is not None:
+                self.metrics.record_coalesced()
+            return resp
+        return self._request(method, endpoint, payload, stream, idempotent, headers)
+
+    def _request(self, method, endpoint, payload, stream, idempotent, headers):
+        """
+        Send a request with the retry policy, see _call
         """
+        policy = self.retry
+        if idempotent is None:
+            idempotent = method != _POST
+        hosts, leader = self._route(method)
+        deadline = None
+        if policy.deadline is not None:
+            deadline = time.monotonic() + policy.deadline
+        if policy.hedge and method == _GET and not stream and len(hosts) > 1:
+            resp = self._hedged(hosts, endpoint, policy.timeout(policy.deadline), headers)
+            if resp is not None:
+                return resp
         resp = None
-        shuffle(self.hosts)
-        for index in xrange(len(self.hosts)):
-            url = "http://%s/v1%s" % (self.hosts[index], endpoint)
-            req_args = {'timeout': 10, 'headers': {'Content-Type': 'application/json'}}
+        previous = None
+        for attempt in xrange(policy.attempts(len(hosts))):
+            host = hosts[attempt % len(hosts)]
+            remaining = None
+            if attempt:
+                if attempt % len(hosts) == 0:
+                    time.sleep(policy.backoff(attempt // len(hosts)))
+                if self.metrics is not None:
+                    self.metrics.record_retry()
+                    if host != previous:
+                        self.metrics.record_failover()
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+            previous = host
             try:
-                if method == _GET:
-                    resp = requests.get(url, **req_args)
-                elif method == _POST:
-                    resp = requests.post(
-                        url, data=payload, **req_args)
-                elif method == _DELETE:
-                    resp = requests.delete(url, **req_args)
-                break
-            except requests.exceptions.RequestException:
+                resp = self._attempt(
+                    host, method, endpoint, payload, stream, policy.timeout(remaining), leader,
+                    headers)
+            except requests.exceptions.RequestException as exc:
+                resp = None
+                if not idempotent and not not_sent(exc):
+                    raise DkronClientException(
+                        "Request to %s failed and can not be retried [%s]" % (host, exc))
+                continue
+            if (idempotent and resp.status_code in policy.retry_statuses
+                    and attempt + 1 < policy.attempts(len(hosts))):
+                resp.close()
+                resp = None
                 continue
+            break
         if resp is None:
             raise DkronClientException("No valid host found")
         return resp
 
+    def _decode(self, resp):
+        """
+        Decode the JSON body of a response with the client codec
+        """
+        return self.codec.loads(resp.content)
+
+    def _read(self, endpoint):
+        """
+        GET an endpoint and return the status code and body, from the disk
+        cache when it has a fresh copy (only successful bodies are stored)
+        """
+        disk_cache = self.disk_cache
+        if disk_cache is not None:
+            body = disk_cache.get(self._cluster_key, endpoint)
+            if body is not None:
+                return 200, body
+        resp = self._call(_GET, endpoint)
+        if disk_cache is not None and resp.status_code == 200:
+            disk_cache.set(self._cluster_key, endpoint, resp.content)
+        return resp.status_code, resp.content
+
     def status(self):
         """
         Return the general status of the DKRON cluster
         """
-        return self._call(_GET, "/").json()
+        return self.codec.loads(self._read("/")[1])
+
+    def _invalidate(self, name):
+        """
+        Drop the cached entries affected by a change to the named job
+        """
+        if self.cache is not None:
+            self.cache.invalidate("/jobs", "/jobs/%s" % name)
+        if self.disk_cache is not None:
+            self.disk_cache.invalidate(self._cluster_key, "/jobs", "/jobs/%s" % name)
+
+    def _jobs_snapshot(self):
+        """
+        Return the jobs data indexed by name, from the cache when it is fresh
+        """
+        snapshot = self.cache.get("/jobs")
+        if snapshot is None:
+            if self.conditional_jobs:
+                data = self._conditional_jobs()
+            else:
+                data = self.codec.loads(self._read("/jobs")[1])
+            snapshot = OrderedDict((job_data["name"], job_data) for job_data in data)
+            self.cache.set("/jobs", snapshot)
+        return snapshot
+
+    def _conditional_jobs(self):
+        """
+        GET /jobs with the validators of the last response and return the
+        previous DkronJob objects when the list has not changed
+        """
+        state = self._jobs_state
+        headers = None
+        if state is not None:
+            headers = {}
+            if state.etag:
+                headers["If-None-Match"] = state.etag
+            if state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
+        resp = self._call(_GET, "/jobs", headers=headers)
+        if state is not None and resp.status_code == 304:
+            return list(state.jobs)
+        digest = hashlib.sha1(resp.content).digest()
+        if state is not None and digest == state.digest:
+            jobs = state.jobs
+        else:
+            jobs = [DkronJob.from_dict(job_data, self) for job_data in self._decode(resp)]
+        self._jobs_state = _JobsState(
+            resp.headers.get("ETag"), resp.headers.get("Last-Modified"), digest, jobs)
+        return list(jobs)
 
     def jobs(self):
         """
         Returns a list of jobs
         """
-        data = self._call(_GET, "/jobs").json()
+        if self.cache is not None:
+            data = self._jobs_snapshot().values()
+        elif self.conditional_jobs:
+            return self._conditional_jobs()
+        else:
+            data = self.codec.loads(self._read("/jobs")[1])
         return [DkronJob.from_dict(job_data, self) for job_data in data]
 
+    def iter_jobs(self, chunk_size=65536, job_class=DkronJob):
+        """
+        Yield the jobs one at a time while the response is streamed
+
+        :param job_class: DkronJob or pydkron.job.CompactJob to hold many jobs in less memory
+        """
+        resp = self._call(_GET, "/jobs", stream=True)
+        try:
+            for job_data in iter_json_array(resp.iter_content(chunk_size)):
+                yield job_class.from_dict(job_data, self)
+        finally:
+            resp.close()
 
     def get_job(self, name):
         """
         Return a job by name
         """
-        resp = self._call(_GET, "/jobs/%s" % name)
-        if resp.status_code == 404:
+        if self.cache is not None:
+            snapshot = self.cache.get("/jobs", record_miss=False)
+            if snapshot is not None and name in snapshot:
+                return DkronJob.from_dict(snapshot[name], self)
+            data = self.cache.get("/jobs/%s" % name)
+            if data is not None:
+                return DkronJob.from_dict(data, self)
+        status_code, body = self._read("/jobs/%s" % name)
+        if status_code == 404:
             raise DkronJobNotFound("Job %s was not found" % name)
-        return DkronJob.from_dict(resp.json(), self)
+        data = self.codec.loads(body)
+        if self.cache is not None:
+            self.cache.set("/jobs/%s" % name, data)
+        return DkronJob.from_dict(data, self)
 
     def save_job(self, job):
         """
         Save a job to the cluster
+
+        With write-behind enabled the save is queued and a Future is returned.
+        """
+        queue = self.write_behind
+        if queue is not None:
+            return queue.save(job)
+        return self._save_job(job)
+
+    def _save_job(self, job):
+        """
+        Send a job save now
         """
-        resp = self._call(_POST, "/jobs", job.marshal())
+        resp = self._call(_POST, "/jobs", job.marshal(self.codec), idempotent=True)
+        self._invalidate(job["name"])
         if resp.status_code != 201:
             raise DkronClientException("Job could not be saved [status=%d]" % resp.status_code)
-        return resp.json()
+        return self._decode(resp)
 
     def run_job(self, name):
         """
         Run the job by name
         """
         resp = self._call(_POST, "/jobs/%s" % name)
+        self._invalidate(name)
         if resp.status_code == 404:
             raise DkronJobNotFound("Job %s was not found" % name)
-        return resp.json()
+        return self._decode(resp)
 
     def delete_job(self, name):
         """
         Delete the job by name
+
+        With write-behind enabled the delete is queued and a Future is returned.
+        """
+        queue = self.write_behind
+        if queue is not None:
+            return queue.delete(name)
+        return self._delete_job(name)
+
+    def _delete_job(self, name):
+        """
+        Send a job delete now
         """
         resp = self._call(_DELETE, "/jobs/%s" % name)
+        self._invalidate(name)
         if resp.status_code == 404:
             raise DkronJobNotFound("Job %s was not found" % name)
-        return resp.json()
+        return self._decode(resp)
 
     def create_job(self, data):
         """
@@ -124,14 +561,94 @@ class DkronClient(object):
         self.save_job(job)
         return job
 
-    def get_executions(self, name):
+    def get_executions(self, name, since=None, until=None, limit=None):
         """
         Get the job executions for a named job
+
+        With since, until or limit only the matching executions are
+        returned, newest first (see iter_executions).
         """
+        if since is not None or until is not None or limit is not None:
+            return list(self.iter_executions(name, since=since, until=until, limit=limit))
         resp = self._call(_GET, "/jobs/%s/executions/" % name)
         if resp.status_code == 404:
             raise DkronJobNotFound("Job %s was not found" % name)
-        return resp.json()
+        return self._decode(resp)
+
+    def iter_executions(self, name, chunk_size=65536, since=None, until=None, limit=None):
+        """
+        Yield the executions of a named job one at a time while the response is streamed
+
+        With since, until or limit the executions are requested newest first
+        and the response is closed as soon as the window is exhausted, so
+        only the matching part of the history is downloaded. When the
+        server turns out to ignore the order, the whole history is read
+        and sorted here instead.
+
+        :param since: Oldest start time (datetime or RFC3339 string)
+        :param until: Newest start time (datetime or RFC3339 string)
+        :param limit: Maximum number of executions
+        """
+        endpoint = "/jobs/%s/executions/" % name
+        windowed = since is not None or until is not None or limit is not None
+        if windowed:
+            params = [("_sort", "started_at"), ("_order", "DESC")]
+            if limit is not None and until is None:
+                params.extend([("_start", 0), ("_end", limit)])
+            endpoint = "%s?%s" % (endpoint, urlencode(params))
+        resp = self._call(_GET, endpoint, stream=True)
+        seen = set()
+        try:
+            if resp.status_code == 404:
+                raise DkronJobNotFound("Job %s was not found" % name)
+            executions = iter_json_array(resp.iter_content(chunk_size))
+            if windowed:
+                executions = filter_executions(
+                    executions, since=since, until=until, limit=limit, stop_early=True)
+            for execution in executions:
+                if windowed:
+                    seen.add(execution_key(execution))
+                yield execution
+            return
+        except UnsortedExecutions:
+            pass
+        finally:
+            resp.close()
+        # the server ignored _sort/_order, scan everything skipping what was yielded
+        executions = [
+            execution for execution in self.get_executions(name) or []
+            if execution_key(execution) not in seen]
+        executions.sort(key=lambda execution: parse_time(execution["started_at"]), reverse=True)
+        for execution in filter_executions(
+                executions, since=since, until=until,
+                limit=None if limit is None else limit - len(seen)):
+            yield execution
+
+    def tail_executions(self, name, interval=60, since=None, finished_only=True):
+        """
+        Return an ExecutionTail, iterate it to get every new execution of a named job
+
+        :param interval: Seconds between polls
+        :param since: Start time to tail from, by default only executions after the first poll
+        :param finished_only: Hold running executions back until they finish
+        """
+        return ExecutionTail(
+            self, name, interval=interval, since=since, finished_only=finished_only)
+
+    def execution_table(self, jobs=None, since=None, until=None, limit=None, max_workers=None):
+        """
+        Fetch the executions of many jobs concurrently into a columnar
+        pydkron.analytics.ExecutionTable, every job by default
+
+        :param jobs: Jobs (or job names) to fetch the executions of
+        :param since: Oldest start time (datetime or RFC3339 string)
+        :param until: Newest start time (datetime or RFC3339 string)
+        :param limit: Maximum number of executions per job
+        :param max_workers: Concurrency, max_workers by default
+        """
+        # imported here so importing the client does not load numpy
+        from pydkron.analytics import fetch_executions
+        return fetch_executions(self, jobs, since, until, limit, max_workers)
 
     def toggle(self, name):
         '''
@@ -144,9 +661,182 @@ class DkronClient(object):
             DkronJobNotFound -- raise if the job not exists
 
         Returns:
-            DkronJob -- a job of Dkron
+            DkronJob -- a job of Dkron (a Future of it with write-behind enabled)
         '''
+        queue = self.write_behind
+        if queue is not None:
+            return queue.toggle(name)
+        return self._toggle(name)
+
+    def _toggle(self, name):
+        """
+        Send a job toggle now
+        """
         resp = self._call(_POST, "/jobs/%s/toggle" % name)
+        self._invalidate(name)
         if resp.status_code == 404:
             raise DkronJobNotFound("Job %s was not found" % name)
-        return DkronJob.from_dict(resp.json(), self)
+        return DkronJob.from_dict(self._decode(resp), self)
+
+    def _bulk(self, func, items, key=None, max_workers=None):
+        """
+        Run a bulk operation with the client concurrency by default
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+        return run_bulk(func, items, key=key, max_workers=max_workers)
+
+    def save_jobs(self, jobs, max_workers=None):
+        """
+        Save many jobs concurrently, returns a BulkResult keyed by job name
+        """
+        return self._bulk(self._save_job, jobs, lambda job: job["name"], max_workers)
+
+    def run_jobs(self, names, max_workers=None):
+        """
+        Run many jobs by name concurrently, returns a BulkResult
+        """
+        return self._bulk(self.run_job, names, max_workers=max_workers)
+
+    def delete_jobs(self, names, max_workers=None):
+        """
+        Delete many jobs by name concurrently, returns a BulkResult
+        """
+        return self._bulk(self._delete_job, names, max_workers=max_workers)
+
+    def toggle_jobs(self, names, max_workers=None):
+        """
+        Enable/disable many jobs by name concurrently, returns a BulkResult
+        """
+        return self._bulk(self._toggle, names, max_workers=max_workers)
+
+    def save_job_tree(self, jobs, max_workers=None):
+        """
+        Save jobs in dependency order, parents first, returns a BulkResult
+
+        Each topological wave is saved concurrently and the dependent jobs
+        of a failed save are skipped. Raises DkronJobCycle on circular
+        parent_job/dependent_jobs relations.
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+        jobs = [
+            job if isinstance(job, DkronJob) else DkronJob.from_dict(job, self)
+            for job in jobs
+        ]
+        return save_tree(self._save_job, jobs, max_workers=max_workers)
+
+    def delete_job_tree(self, jobs, max_workers=None):
+        """
+        Delete jobs (or job names) in reverse dependency order, returns a BulkResult
+
+        Names are resolved against jobs() to find their relations. Each
+        wave is deleted concurrently and the parents of a failed delete
+        are kept.
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+        jobs = list(jobs)
+        if any(not isinstance(job, dict) for job in jobs):
+            live = dict((job["name"], job) for job in self.jobs())
+            jobs = [
+                job if isinstance(job, dict) else live.get(job, {"name": job})
+                for job in jobs
+            ]
+        return delete_tree(self._delete_job, jobs, max_workers=max_workers)
+
+    def export_snapshot(self, path):
+        """
+        Write every job to a snapshot file (gzip when path ends with .gz)
+
+        Returns the number of jobs written, see pydkron.snapshot.
+        """
+        return export_snapshot(self.jobs(), path, codec=self.codec)
+
+    def load_snapshot(self, path, job_class=DkronJob):
+        """
+        Lazily yield the jobs of a snapshot file without calling the cluster
+
+        :param path: Snapshot path
+        :param job_class: DkronJob or CompactJob
+        """
+        return iter_snapshot(path, self, job_class, codec=self.codec)
+
+    def restore_snapshot(self, path, chunk_size=1000, max_workers=None):
+        """
+        Save the jobs of a snapshot file back to the cluster, returns a BulkResult
+
+        The file is read chunk_size jobs at a time and every chunk is saved
+        concurrently with save_job_tree; snapshots list parents before
+        their dependent jobs so chunks never break the ordering.
+        """
+        result = BulkResult()
+        chunk = []
+        for job in self.load_snapshot(path):
+            chunk.append(job)
+            if len(chunk) >= chunk_size:
+                result.update(self.save_job_tree(chunk, max_workers))
+                chunk = []
+        if chunk:
+            result.update(self.save_job_tree(chunk, max_workers))
+        return result
+
+    def reconcile(self, desired_jobs, prune=False, dry_run=False, max_workers=None):
+        """
+        Save only the desired jobs that differ from the cluster, returns the ReconcilePlan
+
+        :param desired_jobs: Iterable of DkronJob (or dict) definitions
+        :param prune: Delete cluster jobs that are not desired
+        :param dry_run: Only plan, print(plan) shows the pending changes
+        """
+        return reconcile_jobs(
+            self, desired_jobs, prune=prune, dry_run=dry_run, max_workers=max_workers)
+
+    def watch_jobs(self, interval=5, initial=False, maxsize=0):
+        """
+        Subscribe to the job change events (pydkron.watch.JobEvent)
+
+        Every subscription with the same interval shares one polling loop.
+        Iterate the returned Subscription for the events and close it when done.
+
+        :param interval: Seconds between polls
+        :param initial: Also get an added event for every job already in the cluster
+        :param maxsize: Bound of the subscription queue (0 is unbounded), the
+            events that do not fit are dropped and counted in subscription.dropped
+        """
+        with self._sessions_lock:
+            watcher = self._watchers.get(interval)
+            if watcher is None:
+                watcher = self._watchers[interval] = JobWatcher(self, interval)
+        return watcher.subscribe(initial=initial, maxsize=maxsize)
+
+    def catalog(self):
+        """
+        Return a JobCatalog of the current jobs, call refresh() on it to sync
+        """
+        return JobCatalog(self)
+
+    def enable_write_behind(self, interval=1.0, max_pending=100, max_workers=None):
+        """
+        Queue save_job, toggle and delete_job calls and write them in batches
+
+        Those calls then return a Future; the writes to the same job are
+        merged until the next flush (see pydkron.writebehind). Bulk, tree
+        and reconcile operations still write right away. Returns the
+        WriteBehindQueue, flushed on close() and at interpreter exit.
+
+        :param interval: Maximum seconds a mutation waits before it is written
+        :param max_pending: Number of waiting jobs that triggers a flush
+        :param max_workers: Concurrency of a flush, max_workers by default
+        """
+        if self.write_behind is None:
+            self.write_behind = WriteBehindQueue(self, interval, max_pending, max_workers)
+        return self.write_behind
+
+    def disable_write_behind(self):
+        """
+        Flush the pending mutations and write every following call right away
+        """
+        queue, self.write_behind = self.write_behind, None
+        if queue is not None:
+            queue.close()
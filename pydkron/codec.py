@@ -0,0 +1,66 @@
+"""
+Pluggable JSON codecs
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec(object):
+    """
+    Standard library json codec
+    """
+    name = "json"
+
+    def dumps(self, obj):
+        """
+        Encode obj, returns str or bytes
+        """
+        return json.dumps(obj)
+
+    def loads(self, data):
+        """
+        Decode str or bytes
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    orjson codec, encodes to bytes
+    """
+    name = "orjson"
+
+    def dumps(self, obj):
+        return orjson.dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+CODECS = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+JSON = JSONCodec()
+
+
+def get_codec(codec=None):
+    """
+    Return a codec instance
+
+    :param codec: None for the fastest installed codec, a codec name or a codec instance
+    """
+    if codec is None:
+        return OrjsonCodec() if orjson is not None else JSON
+    if not isinstance(codec, str):
+        return codec
+    if codec not in CODECS:
+        raise ValueError("Unknown codec %s [valid=%s]" % (codec, ",".join(CODECS)))
+    if codec == OrjsonCodec.name and orjson is None:
+        raise ValueError("Codec orjson requires the orjson package")
+    return CODECS[codec]()
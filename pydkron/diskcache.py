@@ -0,0 +1,232 @@
+"""
+On-disk response cache shared between processes
+"""
+from contextlib import closing, contextmanager
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# magic, format version, expiry (epoch seconds), key length
+_HEADER = struct.Struct("<4sBdI")
+_MAGIC = b"PDKC"
+_VERSION = 1
+_SUFFIX = ".entry"
+_TMP_SUFFIX = ".tmp"
+# temporary files older than this were left by a writer that died
+_TMP_MAX_AGE = 60
+
+
+def default_path():
+    """
+    Return the default cache directory, under XDG_CACHE_HOME or ~/.cache
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pydkron")
+
+
+class DiskCache(object):
+    """
+    Raw response bodies kept in files for ttl seconds
+
+    Every entry is one file named after the hash of its cluster and
+    endpoint: a small header with the expiry and the key, then the body.
+    Entries are written to a temporary file and renamed into place, read
+    through mmap, and an flock on the directory lock file keeps eviction
+    from racing with the other processes. Once the entries exceed
+    max_bytes the least recently used ones are removed.
+
+    Scanning the directory costs a few syscalls per entry, so a write only
+    evicts when the size seen at the last scan plus what this process
+    wrote since goes over max_bytes, and otherwise every evict_every
+    writes to pick up the expired entries, the writes of the other
+    processes and the temporary files of crashed writers.
+    """
+    def __init__(self, path=None, ttl=30, max_bytes=64 * 1024 * 1024, evict_every=100):
+        """
+        :param path: Cache directory, see default_path()
+        :param ttl: Seconds an entry is served
+        :param max_bytes: Size of the entries above which the oldest are evicted
+        :param evict_every: Number of writes after which the directory is scanned anyway
+        """
+        self.path = path or default_path()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        # bytes on disk at the last scan plus the bytes written since
+        self._estimate = None
+        self._writes = 0
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path, 0o700, exist_ok=True)
+        self._lock_path = os.path.join(self.path, ".lock")
+
+    @contextmanager
+    def _locked(self, exclusive):
+        if fcntl is None:  # pragma: no cover
+            yield
+            return
+        with open(self._lock_path, "a+") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _key(cluster, endpoint):
+        return ("%s|%s" % (cluster, endpoint)).encode("utf-8")
+
+    def _file(self, key):
+        return os.path.join(self.path, hashlib.sha1(key).hexdigest() + _SUFFIX)
+
+    def get(self, cluster, endpoint):
+        """
+        Return the cached body (bytes) of an endpoint, None when missing or expired
+
+        :param cluster: Cluster identifier, e.g. the sorted hosts
+        :param endpoint: API endpoint, e.g. /jobs
+        """
+        key = self._key(cluster, endpoint)
+        path = self._file(key)
+        body = None
+        try:
+            with self._locked(False), open(path, "rb") as source:
+                size = os.fstat(source.fileno()).st_size
+                if size >= _HEADER.size:
+                    with closing(mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)) as data:
+                        magic, version, expires, key_size = _HEADER.unpack_from(data)
+                        start = _HEADER.size + key_size
+                        if (magic == _MAGIC and version == _VERSION and expires > time.time()
+                                and data[_HEADER.size:start] == key):
+                            body = data[start:]
+        except (IOError, OSError, struct.error):
+            body = None
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            # the access time drives the eviction order
+            os.utime(path, None)
+        except OSError:
+            pass
+        return body
+
+    def set(self, cluster, endpoint, body, ttl=None):
+        """
+        Store the body (bytes) of an endpoint for ttl seconds (the cache ttl by default)
+        """
+        key = self._key(cluster, endpoint)
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        handle, tmp_path = tempfile.mkstemp(dir=self.path, suffix=_TMP_SUFFIX)
+        size = _HEADER.size + len(key) + len(body)
+        try:
+            with os.fdopen(handle, "wb") as output:
+                output.write(_HEADER.pack(_MAGIC, _VERSION, expires, len(key)))
+                output.write(key)
+                output.write(body)
+            path = self._file(key)
+            with self._locked(True):
+                os.replace(tmp_path, path)
+                self._writes += 1
+                if (self._estimate is None or self._estimate + size > self.max_bytes
+                        or self._writes >= self.evict_every):
+                    self._evict(keep=path)
+                else:
+                    self._estimate += size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def invalidate(self, cluster, *endpoints):
+        """
+        Remove the entries of the given endpoints
+        """
+        with self._locked(True):
+            for endpoint in endpoints:
+                try:
+                    os.remove(self._file(self._key(cluster, endpoint)))
+                except OSError:
+                    pass
+
+    def clear(self):
+        """
+        Remove every entry
+        """
+        with self._locked(True):
+            for _, path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _entries(self):
+        """
+        Return (mtime, path, size, expired) of every entry
+        """
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.path):
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                stat = os.stat(path)
+                with open(path, "rb") as source:
+                    header = source.read(_HEADER.size)
+                expired = len(header) < _HEADER.size or _HEADER.unpack(header)[2] <= now
+            except (IOError, OSError, struct.error):
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size, expired))
+        return entries
+
+    def _evict(self, keep=None):
+        """
+        Remove the expired entries, then the least recently used ones above
+        max_bytes, but never the entry that was just written (keep), and
+        the stale temporary files
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size, _ in entries)
+        for _, path, size, expired in entries:
+            if path == keep or (not expired and total <= self.max_bytes):
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        stale = time.time() - _TMP_MAX_AGE
+        for name in os.listdir(self.path):
+            if not name.endswith(_TMP_SUFFIX):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                if os.stat(path).st_mtime < stale:
+                    os.remove(path)
+            except OSError:
+                pass
+        self._estimate = total
+        self._writes = 0
+
+    def stats(self):
+        """
+        Return the hit/miss counters of this process and the entries on disk
+        """
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, _, size, _ in entries),
+        }
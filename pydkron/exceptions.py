@@ -0,0 +1,25 @@
+"""
+Dkron Client Exceptions
+"""
+
+
+class DkronClientException(Exception):
+    """
+    Generic client exception
+    """
+    pass
+
+class DkronJobNotFound(Exception):
+    """
+    Job not found
+    """
+    pass
+
+class DkronJobCycle(DkronClientException):
+    """
+    The parent_job/dependent_jobs relations of a job set form a cycle
+    """
+    def __init__(self, names):
+        super(DkronJobCycle, self).__init__(
+            "Job dependency cycle between: %s" % ", ".join(sorted(names)))
+        self.names = names
@@ -0,0 +1,184 @@
+"""
+Execution history filtering and tailing
+"""
+from datetime import datetime, timedelta, timezone
+import re
+import time
+
+_RFC3339 = re.compile(
+    r"(\d{4})-(\d\d)-(\d\d)[Tt ](\d\d):(\d\d):(\d\d)(?:\.(\d+))?"
+    r"(?:([Zz])|([+-])(\d\d):?(\d\d))?$")
+
+# Dkron reports unfinished executions with the zero time
+_ZERO_YEAR = 1
+
+
+def parse_time(value):
+    """
+    Parse an RFC3339 timestamp (as returned by Dkron) into an aware datetime
+
+    datetime values are returned as is, naive ones are assumed to be UTC.
+    Fractional seconds are truncated to microseconds.
+    """
+    if isinstance(value, datetime):
+        return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+    match = _RFC3339.match(value)
+    if match is None:
+        raise ValueError("Invalid timestamp %s" % value)
+    (year, month, day, hour, minute, second,
+     fraction, _, sign, offset_hours, offset_minutes) = match.groups()
+    tzinfo = timezone.utc
+    if sign:
+        offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+        tzinfo = timezone(offset if sign == "+" else -offset)
+    return datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second),
+        int((fraction or "0")[:6].ljust(6, "0")), tzinfo)
+
+
+def is_finished(execution):
+    """
+    True when the execution has a finished_at time
+    """
+    finished = execution.get("finished_at")
+    return bool(finished) and parse_time(finished).year != _ZERO_YEAR
+
+
+def execution_key(execution):
+    """
+    Return a key that identifies an execution
+    """
+    return execution.get("id") or (
+        execution.get("started_at"), execution.get("node_name"), execution.get("attempt"))
+
+
+class UnsortedExecutions(ValueError):
+    """
+    The executions given to filter_executions(stop_early=True) are not newest first
+    """
+
+
+def _newest_first(executions):
+    """
+    Yield (execution, started) once the next execution confirms the order,
+    raises UnsortedExecutions at the first one newer than the one before
+    """
+    pending = None
+    for execution in executions:
+        started = parse_time(execution["started_at"])
+        if pending is not None:
+            if started > pending[1]:
+                raise UnsortedExecutions("Executions are not ordered newest first")
+            yield pending
+        pending = (execution, started)
+    if pending is not None:
+        yield pending
+
+
+def filter_executions(executions, since=None, until=None, limit=None, stop_early=False):
+    """
+    Yield the executions started in [since, until], at most limit of them
+
+    With stop_early the executions should be newest first (as asked from
+    the server with _sort/_order): the iteration stops at the first one
+    before since, and every execution is only yielded once the next one
+    confirms the order, UnsortedExecutions is raised otherwise.
+
+    :param executions: Iterable of execution dicts
+    :param since: Oldest start time (datetime or RFC3339 string)
+    :param until: Newest start time (datetime or RFC3339 string)
+    :param limit: Maximum number of executions to yield
+    :param stop_early: Stop reading once the window is exhausted
+    """
+    since = parse_time(since) if since is not None else None
+    until = parse_time(until) if until is not None else None
+    if limit is not None and limit <= 0:
+        return
+    if stop_early:
+        executions = _newest_first(executions)
+    else:
+        executions = (
+            (execution, parse_time(execution["started_at"])) for execution in executions)
+    count = 0
+    for execution, started in executions:
+        if until is not None and started > until:
+            continue
+        if since is not None and started < since:
+            if stop_early:
+                return
+            continue
+        yield execution
+        count += 1
+        if limit is not None and count >= limit:
+            return
+
+
+class ExecutionTail(object):
+    """
+    Polls the executions of a job and returns only the ones not seen before
+
+    Each poll asks for the executions newest first from the last seen start
+    time and stops reading the response once it gets past it, so the cost of
+    a poll is proportional to the new executions. With finished_only (the
+    default) running executions are held back until they finish.
+    """
+    def __init__(self, client, name, interval=60, since=None, finished_only=True):
+        """
+        :param client: DkronClient
+        :param name: Job name
+        :param interval: Seconds between polls when iterating
+        :param since: Start time to tail from, by default only executions after the first poll
+        :param finished_only: Only return finished executions
+        """
+        self.client = client
+        self.name = name
+        self.interval = interval
+        self.finished_only = finished_only
+        self.since = parse_time(since) if since is not None else None
+        self._seen = {}
+        self._baseline = since is None
+
+    def _record(self, execution, started):
+        self._seen[execution_key(execution)] = started
+
+    def poll(self):
+        """
+        Return the new executions, oldest first
+        """
+        if self._baseline:
+            self._baseline = False
+            for execution in self.client.iter_executions(self.name, limit=1):
+                started = parse_time(execution["started_at"])
+                self.since = started
+                if is_finished(execution) or not self.finished_only:
+                    self._record(execution, started)
+            return []
+        new, running = [], []
+        for execution in self.client.iter_executions(self.name, since=self.since):
+            if execution_key(execution) in self._seen:
+                continue
+            started = parse_time(execution["started_at"])
+            if self.finished_only and not is_finished(execution):
+                running.append(started)
+                continue
+            self._record(execution, started)
+            new.append((started, execution))
+        new.sort(key=lambda item: item[0])
+        if new or running:
+            bounds = [started for started, _ in new]
+            if self.since is not None:
+                bounds.append(self.since)
+            since = max(bounds) if bounds else None
+            if running:
+                # keep the oldest running execution in the next window
+                since = min(running) if since is None else min(since, min(running))
+            self.since = since
+            self._seen = dict(
+                (key, started) for key, started in self._seen.items() if started >= since)
+        return [execution for _, execution in new]
+
+    def __iter__(self):
+        while True:
+            for execution in self.poll():
+                yield execution
+            time.sleep(self.interval)
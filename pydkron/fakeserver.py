@@ -0,0 +1,501 @@
+"""
+In-process fake Dkron cluster for tests and benchmarks
+"""
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import parse_qsl, urlsplit
+
+from pydkron.job import JOB_READ_ONLY_FIELDS
+
+_JOB_PATH = re.compile(r"^/v1/jobs/([^/]+)(/toggle|/executions/?)?$")
+
+# fields of a stored job the request did not set
+_JOB_DEFAULTS = (
+    ("schedule", ""),
+    ("shell", False),
+    ("command", ""),
+    ("owner", ""),
+    ("owner_email", ""),
+    ("success_count", 0),
+    ("error_count", 0),
+    ("last_success", None),
+    ("last_error", None),
+    ("disabled", False),
+    ("tags", {}),
+    ("retries", 0),
+    ("dependent_jobs", None),
+    ("parent_job", ""),
+    ("processors", {}),
+    ("concurrency", "allow"),
+)
+_DEFAULTS = dict(_JOB_DEFAULTS)
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _route(method, path):
+    """
+    Return the route of a request, with the job name replaced by :name
+    """
+    return "%s %s" % (method, _JOB_PATH.sub(
+        lambda match: "/v1/jobs/:name%s" % (match.group(2) or ""), path))
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _handle(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, payload, headers = self.server.node.handle(method, self.path, body, self.headers)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._handle("GET")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self._handle("POST")
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        self._handle("DELETE")
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients hang up on purpose (deadlines, lost hedges, streams closed early)
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        BaseHTTPServer.HTTPServer.handle_error(self, request, client_address)
+
+
+class FakeNode(object):
+    """
+    One node of a FakeCluster, an HTTP server on a local port
+
+    latency, jitter, error_rate and error_status can be changed while the
+    node serves, down makes it answer 503 to everything.
+    """
+    def __init__(self, cluster, name, latency=0, jitter=0, error_rate=0, error_status=500):
+        """
+        :param cluster: FakeCluster holding the jobs
+        :param name: Node name
+        :param latency: Seconds to wait before every response
+        :param jitter: Maximum random seconds added to the latency
+        :param error_rate: Fraction of the requests answered with error_status
+        :param error_status: Status code of the injected errors
+        """
+        self.cluster = cluster
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.down = False
+        self.requests = 0
+        self.hits = defaultdict(int)
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.node = self
+        self.host = "127.0.0.1:%d" % self._server.server_address[1]
+        # a short poll keeps shutdown() quick
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), name="pydkron-fake-%s" % name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def is_leader(self):
+        """
+        True when the node is the cluster leader
+        """
+        return self.cluster.leader is self
+
+    def fail_next(self, count=1, status=500):
+        """
+        Answer the next count requests with status
+        """
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def _injected(self):
+        """
+        Return the status of an injected error for this request, None for none
+        """
+        with self._lock:
+            if self._failures:
+                return self._failures.pop(0)
+        if self.down:
+            return 503
+        if self.error_rate and self.cluster.random() < self.error_rate:
+            return self.error_status
+        return None
+
+    def handle(self, method, path, body, headers):
+        """
+        Answer a request, returns the status code, body and response headers
+        """
+        with self._lock:
+            self.requests += 1
+            self.hits[_route(method, path.split("?", 1)[0])] += 1
+        delay = self.latency + (self.jitter * self.cluster.random() if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        status = self._injected()
+        if status is not None:
+            return self.cluster.reply(status, {"error": "Injected failure on %s" % self.name})
+        return self.cluster.dispatch(self, method, path, body, headers)
+
+    def member(self):
+        """
+        Return the node as listed by /v1/members
+        """
+        host, port = self.host.split(":")
+        return {
+            "Name": self.name,
+            "Addr": host,
+            "Port": int(port),
+            "Tags": {"dc": "dc1", "role": "dkron", "rpc_addr": self.host, "server": "true"},
+            "Status": 4 if self.down else 1,
+        }
+
+    def shutdown(self):
+        """
+        Stop the HTTP server
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class FakeCluster(object):
+    """
+    A fake Dkron cluster of one or more nodes sharing the same jobs
+
+    Implements /v1/, /v1/members, /v1/leader, /v1/isleader and the job
+    endpoints (list, get, save, run, delete, toggle and executions, with
+    the _sort, _order, _start and _end parameters). Running a job records
+    a successful execution right away. GET /v1/jobs sends an ETag and
+    answers 304 to a matching If-None-Match. Writes to a follower are
+    applied as if forwarded, or redirected to the leader with
+    redirect_writes, and fail with 500 while there is no leader.
+
+        with FakeCluster(nodes=3, latency=0.001) as cluster:
+            client = DkronClient(hosts=cluster.hosts)
+    """
+    def __init__(self, nodes=1, latency=0, jitter=0, error_rate=0, error_status=500,
+                 leader=0, redirect_writes=False, seed=None):
+        """
+        :param nodes: Number of nodes
+        :param latency: Seconds every node waits before a response
+        :param jitter: Maximum random seconds added to the latency
+        :param error_rate: Fraction of the requests answered with error_status
+        :param error_status: Status code of the injected errors
+        :param leader: Index of the leader node, None for a cluster without leader
+        :param redirect_writes: Followers redirect writes to the leader (307)
+        :param seed: Seed of the latency jitter and error injection
+        """
+        self.redirect_writes = redirect_writes
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._jobs = OrderedDict()
+        self._executions = defaultdict(list)
+        self._version = 0
+        self._listing = None
+        self.nodes = [
+            FakeNode(self, "node%d" % index, latency, jitter, error_rate, error_status)
+            for index in range(nodes)]
+        self.leader = None
+        self.set_leader(leader)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    @property
+    def hosts(self):
+        """
+        Hosts of the nodes, to pass to a DkronClient
+        """
+        return [node.host for node in self.nodes]
+
+    @property
+    def requests(self):
+        """
+        Number of requests answered by every node
+        """
+        return sum(node.requests for node in self.nodes)
+
+    def hits(self, route):
+        """
+        Number of requests of a route (e.g. "GET /v1/jobs/:name") on every node
+        """
+        return sum(node.hits.get(route, 0) for node in self.nodes)
+
+    def random(self):
+        """
+        Return the next number of the seeded generator
+        """
+        with self._lock:
+            return self._random.random()
+
+    def set_leader(self, index):
+        """
+        Make the node at index the leader, None leaves the cluster without one
+        """
+        self.leader = None if index is None else self.nodes[index]
+
+    def add_jobs(self, jobs):
+        """
+        Store jobs (dicts) directly, e.g. to seed a benchmark
+        """
+        with self._lock:
+            for job in jobs:
+                self._store(dict(job))
+            self._changed()
+
+    def get_job(self, name):
+        """
+        Return a copy of a stored job, None when it does not exist
+        """
+        with self._lock:
+            job = self._jobs.get(name)
+            return dict(job) if job is not None else None
+
+    def job_names(self):
+        """
+        Return the names of the stored jobs
+        """
+        with self._lock:
+            return list(self._jobs)
+
+    def executions(self, name):
+        """
+        Return the executions recorded for a job, oldest first
+        """
+        with self._lock:
+            return list(self._executions.get(name, ()))
+
+    def shutdown(self):
+        """
+        Stop every node
+        """
+        for node in self.nodes:
+            node.shutdown()
+
+    @staticmethod
+    def reply(status, payload=None, headers=None):
+        """
+        Return a JSON response
+        """
+        response_headers = {"Content-Type": "application/json"}
+        response_headers.update(headers or {})
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        return status, body, response_headers
+
+    def _changed(self):
+        self._version += 1
+        self._listing = None
+
+    def _store(self, data):
+        """
+        Store a job like Dkron: defaults for the missing fields, the read
+        only fields kept from the stored job and the parent updated
+        """
+        name = data["name"]
+        previous = self._jobs.get(name)
+        job = OrderedDict([("name", name)])
+        job.update(_JOB_DEFAULTS)
+        job["tags"] = {}
+        job["processors"] = {}
+        job.update(data)
+        for field in JOB_READ_ONLY_FIELDS:
+            job[field] = previous[field] if previous is not None else _DEFAULTS[field]
+        old_parent = previous.get("parent_job") if previous is not None else None
+        if old_parent and old_parent != job["parent_job"] and old_parent in self._jobs:
+            dependents = self._jobs[old_parent]["dependent_jobs"] or []
+            self._jobs[old_parent]["dependent_jobs"] = [
+                dependent for dependent in dependents if dependent != name] or None
+        parent = job["parent_job"]
+        if parent in self._jobs:
+            dependents = self._jobs[parent]["dependent_jobs"] or []
+            if name not in dependents:
+                self._jobs[parent]["dependent_jobs"] = dependents + [name]
+        self._jobs[name] = job
+        return job
+
+    def _jobs_listing(self, headers):
+        """
+        GET /v1/jobs, the encoded list is kept until the next write
+        """
+        with self._lock:
+            if self._listing is None:
+                body = json.dumps(list(self._jobs.values())).encode("utf-8")
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                self._listing = (body, etag)
+            body, etag = self._listing
+        if headers.get("If-None-Match") == etag:
+            return 304, b"", {"ETag": etag}
+        return 200, body, {"Content-Type": "application/json", "ETag": etag}
+
+    def _save(self, body):
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except ValueError:
+            return self.reply(400, {"error": "Invalid job JSON"})
+        if not isinstance(data, dict) or not data.get("name"):
+            return self.reply(400, {"error": "Job name is required"})
+        with self._lock:
+            parent = data.get("parent_job")
+            if parent and (parent == data["name"] or parent not in self._jobs):
+                return self.reply(422, {"error": "Parent job %s was not found" % parent})
+            job = self._store(data)
+            self._changed()
+            return self.reply(201, job)
+
+    def _run(self, node, name):
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None:
+                return self.reply(404, {"error": "Job %s was not found" % name})
+            started = _now()
+            executions = self._executions[name]
+            executions.append({
+                "id": "%s-%d" % (name, len(executions) + 1),
+                "group": time.time_ns(),
+                "job_name": name,
+                "started_at": started,
+                "finished_at": _now(),
+                "success": True,
+                "output": "",
+                "node_name": node.name,
+                "attempt": 1,
+            })
+            job["success_count"] += 1
+            job["last_success"] = started
+            self._changed()
+            return self.reply(202, job)
+
+    def _delete(self, name):
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None:
+                return self.reply(404, {"error": "Job %s was not found" % name})
+            if job["dependent_jobs"]:
+                return self.reply(422, {"error": "Job %s has dependent jobs" % name})
+            parent = job["parent_job"]
+            if parent in self._jobs:
+                dependents = [
+                    dependent for dependent in self._jobs[parent]["dependent_jobs"] or []
+                    if dependent != name]
+                self._jobs[parent]["dependent_jobs"] = dependents or None
+            del self._jobs[name]
+            self._executions.pop(name, None)
+            self._changed()
+            return self.reply(200, job)
+
+    def _toggle(self, name):
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None:
+                return self.reply(404, {"error": "Job %s was not found" % name})
+            job["disabled"] = not job["disabled"]
+            self._changed()
+            return self.reply(200, job)
+
+    def _list_executions(self, name, query):
+        with self._lock:
+            if name not in self._jobs:
+                return self.reply(404, {"error": "Job %s was not found" % name})
+            executions = list(self._executions.get(name, ()))
+        params = dict(parse_qsl(query))
+        if params.get("_sort") == "started_at":
+            executions.sort(key=lambda execution: execution["started_at"])
+        if params.get("_order", "").upper() == "DESC":
+            executions.reverse()
+        if "_start" in params or "_end" in params:
+            start = int(params.get("_start", 0))
+            end = int(params["_end"]) if "_end" in params else None
+            executions = executions[start:end]
+        return self.reply(200, executions)
+
+    def dispatch(self, node, method, path, body, headers):
+        """
+        Answer a request that reached node, returns the status code, body and response headers
+        """
+        url = urlsplit(path)
+        path = url.path
+        if method == "GET":
+            if path in ("/v1", "/v1/"):
+                return self.reply(200, {
+                    "agent": {"name": node.name, "version": "fake"},
+                    "serf": {"members": str(len(self.nodes))},
+                    "tags": node.member()["Tags"],
+                })
+            if path == "/v1/members":
+                return self.reply(200, [member.member() for member in self.nodes])
+            if path == "/v1/leader":
+                leader = self.leader
+                if leader is None:
+                    return self.reply(404, {"error": "No leader"})
+                return self.reply(200, leader.member())
+            if path == "/v1/isleader":
+                if node.is_leader:
+                    return self.reply(200, "I am a leader")
+                return self.reply(404, "I am a follower")
+            if path == "/v1/jobs":
+                return self._jobs_listing(headers)
+        match = _JOB_PATH.match(path)
+        if path != "/v1/jobs" and match is None:
+            return self.reply(404, {"error": "Not found"})
+        if method != "GET":
+            leader = self.leader
+            if leader is None:
+                return self.reply(500, {"error": "No leader"})
+            if leader is not node and self.redirect_writes:
+                return self.reply(
+                    307, headers={"Location": "http://%s%s" % (leader.host, url.geturl())})
+        if path == "/v1/jobs":
+            if method == "POST":
+                return self._save(body)
+            return self.reply(405, {"error": "Method not allowed"})
+        name, action = match.group(1), match.group(2)
+        if action == "/toggle" and method == "POST":
+            return self._toggle(name)
+        if action and action.startswith("/executions") and method == "GET":
+            return self._list_executions(name, url.query)
+        if action is None:
+            if method == "GET":
+                job = self.get_job(name)
+                if job is None:
+                    return self.reply(404, {"error": "Job %s was not found" % name})
+                return self.reply(200, job)
+            if method == "POST":
+                return self._run(node, name)
+            if method == "DELETE":
+                return self._delete(name)
+        return self.reply(405, {"error": "Method not allowed"})
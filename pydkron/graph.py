@@ -0,0 +1,135 @@
+"""
+Job dependency graph and ordered bulk operations
+"""
+from pydkron.bulk import BulkResult, run_bulk
+from pydkron.exceptions import DkronClientException, DkronJobCycle
+
+
+class JobGraph(object):
+    """
+    DAG of a job set built from parent_job and dependent_jobs
+
+    Only relations between jobs of the set are edges, a parent outside of
+    it is assumed to exist already. waves() groups the jobs in topological
+    levels: every job of a wave only depends on jobs of earlier waves, so
+    the jobs of one wave can be written concurrently.
+    """
+    def __init__(self, jobs):
+        """
+        :param jobs: Iterable of DkronJob (or dict)
+        """
+        self.jobs = {}
+        for job in jobs:
+            self.jobs[job["name"]] = job
+        self.parents = dict((name, set()) for name in self.jobs)
+        self.children = dict((name, set()) for name in self.jobs)
+        for name, job in self.jobs.items():
+            parent = job.get("parent_job")
+            if parent and parent in self.jobs:
+                self._link(parent, name)
+            for child in job.get("dependent_jobs") or []:
+                if child in self.jobs:
+                    self._link(name, child)
+
+    def _link(self, parent, child):
+        self.parents[child].add(parent)
+        self.children[parent].add(child)
+
+    def waves(self):
+        """
+        Return the job names in topological waves, parents first
+
+        Raises DkronJobCycle when some jobs depend on each other.
+        """
+        pending = dict((name, len(parents)) for name, parents in self.parents.items())
+        wave = sorted(name for name, count in pending.items() if not count)
+        waves = []
+        while wave:
+            waves.append(wave)
+            following = []
+            for name in wave:
+                del pending[name]
+                for child in self.children[name]:
+                    pending[child] -= 1
+                    if not pending[child]:
+                        following.append(child)
+            wave = sorted(following)
+        if pending:
+            raise DkronJobCycle(list(pending))
+        return waves
+
+    def descendants(self, name):
+        """
+        Return the names of every job below name in the graph
+        """
+        found, stack = set(), [name]
+        while stack:
+            for child in self.children[stack.pop()]:
+                if child not in found:
+                    found.add(child)
+                    stack.append(child)
+        return found
+
+    def ancestors(self, name):
+        """
+        Return the names of every job above name in the graph
+        """
+        found, stack = set(), [name]
+        while stack:
+            for parent in self.parents[stack.pop()]:
+                if parent not in found:
+                    found.add(parent)
+                    stack.append(parent)
+        return found
+
+
+def _run_waves(func, waves, blocked_by, max_workers):
+    result = BulkResult()
+    blocked = set()
+    for wave in waves:
+        runnable = []
+        for name in wave:
+            if name in blocked:
+                result.failed[name] = DkronClientException(
+                    "Skipped, a related job failed: %s" % name)
+            else:
+                runnable.append(name)
+        done = run_bulk(func, runnable, max_workers=max_workers)
+        result.update(done)
+        for name in done.failed:
+            blocked.update(blocked_by(name))
+    return result
+
+
+def save_tree(save, jobs, max_workers=8):
+    """
+    Save jobs wave by wave, parents before their dependent jobs
+
+    The jobs of a wave are saved concurrently. When a save fails its
+    descendants are not attempted and are reported as failed.
+
+    :param save: Callable saving a single job, e.g. DkronClient.save_job
+    :param jobs: Iterable of DkronJob (or dict)
+    :param max_workers: Maximum number of concurrent saves
+    """
+    graph = JobGraph(jobs)
+    waves = graph.waves()
+    return _run_waves(
+        lambda name: save(graph.jobs[name]), waves, graph.descendants, max_workers)
+
+
+def delete_tree(delete, jobs, max_workers=8):
+    """
+    Delete jobs wave by wave, dependent jobs before their parents
+
+    The jobs of a wave are deleted concurrently. When a delete fails the
+    ancestors are kept and reported as failed. A job already gone counts
+    as not_found and does not block its parents.
+
+    :param delete: Callable deleting a job by name, e.g. DkronClient.delete_job
+    :param jobs: Iterable of DkronJob (or dict)
+    :param max_workers: Maximum number of concurrent deletes
+    """
+    graph = JobGraph(jobs)
+    waves = list(reversed(graph.waves()))
+    return _run_waves(delete, waves, graph.ancestors, max_workers)
@@ -0,0 +1,147 @@
+"""
+Health aware host selection
+"""
+from random import shuffle
+from threading import Lock
+import time
+
+LEAST_LATENCY = "least_latency"
+ROUND_ROBIN = "round_robin"
+RANDOM = "random"
+
+STRATEGIES = (LEAST_LATENCY, ROUND_ROBIN, RANDOM)
+
+_CLOSED = "closed"
+_OPEN = "open"
+_HALF_OPEN = "half_open"
+
+
+class HostState(object):
+    """
+    Latency and failure tracking for a single host
+
+    latency and error_rate are exponentially weighted moving averages,
+    failures counts the consecutive failures that trip the circuit.
+    """
+    def __init__(self, host):
+        self.host = host
+        self.latency = None
+        self.error_rate = 0.0
+        self.failures = 0
+        self.circuit = _CLOSED
+        self.opened_at = None
+
+    def as_dict(self):
+        """
+        Return the state as a plain dict
+        """
+        return {
+            "host": self.host,
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+            "failures": self.failures,
+            "circuit": self.circuit,
+        }
+
+
+class HostPool(object):
+    """
+    Orders the hosts to try for a request and ejects unhealthy ones
+
+    A host whose consecutive failures reach failure_threshold has its
+    circuit opened and is skipped. After reset_timeout seconds a single
+    request is let through as a half-open probe; success closes the
+    circuit again, failure re-opens it. Open hosts are still tried last
+    so a request is never refused while some host might answer.
+    """
+    def __init__(self, hosts, strategy=LEAST_LATENCY, failure_threshold=3,
+                 reset_timeout=30, alpha=0.3):
+        """
+        :param hosts: List of hosts (including port)
+        :param strategy: One of least_latency, round_robin or random
+        :param failure_threshold: Consecutive failures that open a host circuit
+        :param reset_timeout: Seconds before an open circuit is probed again
+        :param alpha: Weight of the newest sample in the moving averages
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError("Unknown host strategy %s [valid=%s]" % (
+                strategy, ",".join(STRATEGIES)))
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.alpha = alpha
+        self._states = dict((host, HostState(host)) for host in hosts)
+        self._hosts = list(hosts)
+        self._next = 0
+        self._lock = Lock()
+
+    def _sorted(self, states):
+        if self.strategy == LEAST_LATENCY:
+            # unmeasured hosts go first so every host gets a latency sample
+            return sorted(states, key=lambda state: state.latency or 0.0)
+        if self.strategy == ROUND_ROBIN:
+            offset = self._next % len(states)
+            self._next += 1
+            return states[offset:] + states[:offset]
+        shuffle(states)
+        return states
+
+    def order(self):
+        """
+        Return the hosts in the order they should be tried
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy, probe, ejected = [], [], []
+            for host in self._hosts:
+                state = self._states[host]
+                if state.circuit == _CLOSED:
+                    healthy.append(state)
+                elif not probe and now - state.opened_at >= self.reset_timeout:
+                    state.circuit = _HALF_OPEN
+                    state.opened_at = now
+                    probe.append(state)
+                else:
+                    ejected.append(state)
+            if healthy:
+                healthy = self._sorted(healthy)
+            ejected.sort(key=lambda state: state.opened_at or 0)
+        return [state.host for state in probe + healthy + ejected]
+
+    def record_success(self, host, latency):
+        """
+        Record a successful request to host that took latency seconds
+        """
+        with self._lock:
+            state = self._states.get(host)
+            if state is None:
+                return
+            if state.latency is None:
+                state.latency = latency
+            else:
+                state.latency += self.alpha * (latency - state.latency)
+            state.error_rate -= self.alpha * state.error_rate
+            state.failures = 0
+            state.circuit = _CLOSED
+            state.opened_at = None
+
+    def record_failure(self, host):
+        """
+        Record a failed request to host
+        """
+        with self._lock:
+            state = self._states.get(host)
+            if state is None:
+                return
+            state.error_rate += self.alpha * (1.0 - state.error_rate)
+            state.failures += 1
+            if state.circuit == _HALF_OPEN or state.failures >= self.failure_threshold:
+                state.circuit = _OPEN
+                state.opened_at = time.monotonic()
+
+    def snapshot(self):
+        """
+        Return the state of every host
+        """
+        with self._lock:
+            return [self._states[host].as_dict() for host in self._hosts]
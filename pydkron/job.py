@@ -1,7 +1,7 @@
 """
 Dkron Job Object
 """
-import json
+from pydkron.codec import JSON
 
 
 JOB_VALID_FIELDS = [
@@ -32,6 +32,9 @@ JOB_READ_ONLY_FIELDS = [
     "dependent_jobs",
 ]
 
+_VALID_FIELDS = frozenset(JOB_VALID_FIELDS)
+_READ_ONLY_FIELDS = frozenset(JOB_READ_ONLY_FIELDS)
+
 
 class DkronJob(dict):
     """
@@ -39,17 +42,24 @@ class DkronJob(dict):
     """
     def __init__(self, client, **kwargs):
         super(DkronJob, self).__init__(**kwargs)
-        self._client = client
+        # private attributes live outside the mapping so it can be encoded as is
+        object.__setattr__(self, "_client", client)
 
     def __getattr__(self, name):
-        if name in JOB_VALID_FIELDS or name.startswith("_"):
+        # private attributes live in __dict__, so only unset ones get here
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in _VALID_FIELDS:
             return self[name]
         raise KeyError("%s not a valid job field" % name)
 
 
     def __setattr__(self, name, value):
-        if name in JOB_VALID_FIELDS or name.startswith("_"):
-            if name in JOB_READ_ONLY_FIELDS:
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+            return
+        if name in _VALID_FIELDS:
+            if name in _READ_ONLY_FIELDS:
                 raise KeyError("%s is a read only field" % name)
             self[name] = value
             return
@@ -70,16 +80,185 @@ class DkronJob(dict):
         """
         return self._client.save_job(self)
 
-    def marshal(self):
+    def marshal(self, codec=None):
+        """
+        Marshal the job to a JSON document that can be uploaded to the server
+
+        :param codec: pydkron.codec codec, the standard library json by default
+        """
+        return (codec or JSON).dumps(self)
+
+    def executions(self):
+        """
+        Return the executions for this rule
+        """
+        return self._client.get_executions(self.name)
+
+    def run(self):
+        """
+        Runs this job
+        """
+        return self._client.run_job(self.name)
+
+    def delete(self):
         """
-        Marshal the job to a dict that can be uploaded to the server
+        Delete this job
         """
-        data = {}
-        for key, value in self.items():
-            if key.startswith("_"):
+        return self._client.delete_job(self.name)
+
+
+class CompactJob(object):
+    """
+    Memory compact, __slots__ based alternative to DkronJob
+
+    Known fields are stored in slots and read without any validation,
+    unknown fields returned by the server are kept in a separate dict so
+    converting to and from DkronJob is lossless.
+    """
+    __slots__ = tuple(JOB_VALID_FIELDS) + ("_client", "_extra", "_cluster")
+
+    def __init__(self, client, **kwargs):
+        setter = object.__setattr__
+        setter(self, "_client", client)
+        extra = None
+        for key, value in kwargs.items():
+            if key in _VALID_FIELDS:
+                setter(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        setter(self, "_extra", extra)
+
+    def __getattr__(self, name):
+        # only reached for unset slots and unknown names
+        if name.startswith("_") or name in _VALID_FIELDS:
+            raise AttributeError(name)
+        raise KeyError("%s not a valid job field" % name)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+            return
+        if name in _READ_ONLY_FIELDS:
+            raise KeyError("%s is a read only field" % name)
+        if name in _VALID_FIELDS:
+            object.__setattr__(self, name, value)
+            return
+        raise KeyError(
+            "%s not a valid job field [valid=%s]" % (
+                name, ",".join(JOB_VALID_FIELDS)))
+
+    def __getstate__(self):
+        # there is no __dict__, and read only fields can not go through __setattr__
+        state = {}
+        for name in self.__slots__:
+            try:
+                state[name] = object.__getattribute__(self, name)
+            except AttributeError:
                 continue
-            data[key] = value
-        return json.dumps(data)
+        return state
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "_extra", None)
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __getitem__(self, key):
+        if key in _VALID_FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, (CompactJob, dict)):
+            return self.to_dict() == dict(
+                (key, value) for key, value in other.items() if not key.startswith("_"))
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "CompactJob(%r)" % self.to_dict()
+
+    def get(self, key, default=None):
+        """
+        Return the field value or default when it is not set
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        """
+        Return the (field, value) pairs that are set
+        """
+        pairs = []
+        for key in JOB_VALID_FIELDS:
+            try:
+                pairs.append((key, getattr(self, key)))
+            except AttributeError:
+                continue
+        if self._extra:
+            pairs.extend(self._extra.items())
+        return pairs
+
+    def to_dict(self):
+        """
+        Return the job fields as a plain dict
+        """
+        return dict(self.items())
+
+    @classmethod
+    def from_dict(cls, data, client):
+        """
+        Unmarshal the dict into a CompactJob object
+        """
+        return cls(client, **data)
+
+    @classmethod
+    def from_job(cls, job):
+        """
+        Convert a DkronJob into a CompactJob
+        """
+        data = dict((key, value) for key, value in job.items() if not key.startswith("_"))
+        return cls(job._client, **data)
+
+    def to_job(self):
+        """
+        Convert this job into a DkronJob
+        """
+        return DkronJob.from_dict(self.to_dict(), self._client)
+
+    def marshal(self, codec=None):
+        """
+        Marshal the job to a JSON document that can be uploaded to the server
+
+        :param codec: pydkron.codec codec, the standard library json by default
+        """
+        return (codec or JSON).dumps(self.to_dict())
+
+    def save(self):
+        """
+        Save the job to the provided API endpoint
+        """
+        return self._client.save_job(self)
 
     def executions(self):
         """
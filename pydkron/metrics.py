@@ -0,0 +1,190 @@
+"""
+Client request instrumentation
+"""
+from collections import defaultdict
+from threading import Lock
+import re
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_JOB_PATH = re.compile(r"^/jobs/[^/?]+")
+
+
+def endpoint_label(method, endpoint):
+    """
+    Return the low cardinality label of a request, e.g. "GET /jobs/:name"
+    """
+    path = _JOB_PATH.sub("/jobs/:name", endpoint.split("?", 1)[0])
+    return "%s %s" % (method.upper(), path)
+
+
+class Histogram(object):
+    """
+    Fixed bucket latency histogram (not thread safe on its own)
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """
+        Add a sample
+        """
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, pct):
+        """
+        Return the upper bound of the bucket holding the pct percentile
+        """
+        if not self.count:
+            return None
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self):
+        """
+        Return the cumulative bucket counts, count and sum
+        """
+        cumulative, seen = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            cumulative.append((bound, seen))
+        return {"buckets": cumulative, "count": self.count, "sum": self.sum}
+
+
+class ClientMetrics(object):
+    """
+    Per endpoint and per host latency histograms and request counters
+
+    Hooks are called with a dict describing every request attempt, e.g. to
+    feed Prometheus or StatsD. Pass an instance to DkronClient(metrics=...).
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = Lock()
+        self._hooks = []
+        self.reset()
+
+    def reset(self):
+        """
+        Drop every recorded value
+        """
+        with self._lock:
+            self.endpoints = defaultdict(lambda: Histogram(self.buckets))
+            self.hosts = defaultdict(lambda: Histogram(self.buckets))
+            self.statuses = defaultdict(int)
+            self.errors = defaultdict(int)
+            self.requests = 0
+            self.failovers = 0
+            self.retries = 0
+            self.coalesced = 0
+            self.throttled = 0
+            self.throttle_wait = 0.0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+
+    def add_hook(self, hook):
+        """
+        Call hook(event) after every request attempt
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Stop calling hook
+        """
+        self._hooks.remove(hook)
+
+    def record(self, method, endpoint, host, latency, status=None, error=None,
+               sent=0, received=0):
+        """
+        Record a single request attempt, error is the exception raised (if any)
+        """
+        label = endpoint_label(method, endpoint)
+        with self._lock:
+            self.requests += 1
+            self.endpoints[label].observe(latency)
+            self.hosts[host].observe(latency)
+            if status is not None:
+                self.statuses[status] += 1
+            if error is not None:
+                self.errors[host] += 1
+            self.bytes_sent += sent
+            self.bytes_received += received
+        if self._hooks:
+            event = {
+                "endpoint": label,
+                "host": host,
+                "latency": latency,
+                "status": status,
+                "error": error,
+                "sent": sent,
+                "received": received,
+            }
+            for hook in list(self._hooks):
+                hook(event)
+
+    def record_failover(self):
+        """
+        Count a request that moved on to another host
+        """
+        with self._lock:
+            self.failovers += 1
+
+    def record_retry(self):
+        """
+        Count a retried request
+        """
+        with self._lock:
+            self.retries += 1
+
+    def record_coalesced(self):
+        """
+        Count a request answered by another caller's identical request
+        """
+        with self._lock:
+            self.coalesced += 1
+
+    def record_throttle(self, wait):
+        """
+        Count a request delayed wait seconds by the rate limit
+        """
+        with self._lock:
+            self.throttled += 1
+            self.throttle_wait += wait
+
+    def snapshot(self):
+        """
+        Return a plain dict copy of every metric
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "failovers": self.failovers,
+                "retries": self.retries,
+                "coalesced": self.coalesced,
+                "throttled": self.throttled,
+                "throttle_wait": self.throttle_wait,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "statuses": dict(self.statuses),
+                "errors": dict(self.errors),
+                "endpoints": dict(
+                    (label, hist.snapshot()) for label, hist in self.endpoints.items()),
+                "hosts": dict(
+                    (host, hist.snapshot()) for host, hist in self.hosts.items()),
+            }
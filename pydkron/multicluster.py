@@ -0,0 +1,234 @@
+"""
+Client for several independent Dkron clusters
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from pydkron.client import DkronClient
+from pydkron.exceptions import DkronClientException, DkronJobNotFound
+from pydkron.job import CompactJob, DkronJob
+
+
+def _label(job):
+    """
+    Return the cluster label of a job, None for unlabelled jobs and plain dicts
+    """
+    return getattr(job, "_cluster", None)
+
+
+class ClusterJobs(list):
+    """
+    Jobs merged from several clusters, errors maps the clusters that
+    could not be read to their exception
+    """
+    def __init__(self, jobs=(), errors=None):
+        super(ClusterJobs, self).__init__(jobs)
+        self.errors = errors or {}
+
+    @property
+    def complete(self):
+        """
+        True when every cluster answered
+        """
+        return not self.errors
+
+
+class ClusterStatus(dict):
+    """
+    Status of every cluster by name, errors maps the clusters that could
+    not be read to their exception
+    """
+    def __init__(self, statuses=(), errors=None):
+        super(ClusterStatus, self).__init__(statuses)
+        self.errors = errors or {}
+
+    @property
+    def complete(self):
+        """
+        True when every cluster answered
+        """
+        return not self.errors
+
+
+class MultiClusterClient(object):
+    """
+    Fans reads out to several Dkron clusters in parallel and routes writes
+    to one of them
+
+    Reads return what the available clusters answered and list the failed
+    ones in errors, they only raise when every cluster failed. Every job
+    read is labelled with its cluster name in job._cluster. Writes go to
+    the job's cluster: its label, else the sharding rule, else default.
+    """
+    def __init__(self, clusters, shard_by=None, default=None, **client_kwargs):
+        """
+        :param clusters: Mapping of cluster name to a DkronClient or its list of hosts
+        :param shard_by: Tag name, or callable(job) returning the cluster name
+        :param default: Cluster of the jobs the sharding rule does not place
+        :param client_kwargs: DkronClient arguments of the clusters given as hosts
+        """
+        if not clusters:
+            raise ValueError("At least one cluster is required")
+        self.clients = {}
+        for name, client in clusters.items():
+            if not isinstance(client, DkronClient):
+                client = DkronClient(client, **client_kwargs)
+            self.clients[name] = client
+        if default is not None and default not in self.clients:
+            raise ValueError("Unknown default cluster %s" % default)
+        self.shard_by = shard_by
+        self.default = default
+        self._executor = ThreadPoolExecutor(max_workers=len(self.clients))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close every cluster client
+        """
+        self._executor.shutdown(wait=False)
+        for client in self.clients.values():
+            client.close()
+
+    def _fanout(self, func, *args):
+        """
+        Call func(client, *args) for every cluster in parallel, returns the
+        results and the errors by cluster name
+        """
+        futures = dict(
+            (name, self._executor.submit(func, client, *args))
+            for name, client in self.clients.items())
+        results, errors = {}, {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                errors[name] = exc
+        if errors and not results:
+            raise DkronClientException(
+                "No cluster answered [%s]" % ", ".join(
+                    "%s: %s" % (name, exc) for name, exc in sorted(errors.items())))
+        return results, errors
+
+    def status(self):
+        """
+        Return the status of every cluster (a ClusterStatus)
+        """
+        results, errors = self._fanout(DkronClient.status)
+        return ClusterStatus(results, errors)
+
+    def jobs(self):
+        """
+        Return the jobs of every cluster (a ClusterJobs), labelled with job._cluster
+        """
+        results, errors = self._fanout(DkronClient.jobs)
+        merged = ClusterJobs(errors=errors)
+        for name in self.clients:
+            for job in results.get(name, ()):
+                job._cluster = name
+                merged.append(job)
+        return merged
+
+    def cluster_for(self, job):
+        """
+        Return the cluster name of a job: its label, else the sharding rule, else default
+        """
+        name = _label(job)
+        if name is None and self.shard_by is not None:
+            if callable(self.shard_by):
+                name = self.shard_by(job)
+            else:
+                name = (job.get("tags") or {}).get(self.shard_by)
+        if name is None:
+            name = self.default
+        if name is None:
+            raise DkronClientException("No cluster for job %s" % job["name"])
+        if name not in self.clients:
+            raise DkronClientException("Unknown cluster %s for job %s" % (name, job["name"]))
+        return name
+
+    def client_for(self, job):
+        """
+        Return the DkronClient of the job's cluster
+        """
+        return self.clients[self.cluster_for(job)]
+
+    def locate(self, name):
+        """
+        Return the name of the cluster that has the job
+
+        Raises DkronJobNotFound when no cluster has it, DkronClientException
+        when it was not found but some clusters could not be asked.
+        """
+        return self.get_job(name)._cluster
+
+    def get_job(self, name, cluster=None):
+        """
+        Return a job by name from the given cluster, or from the first one that has it
+        """
+        if cluster is not None:
+            job = self.clients[cluster].get_job(name)
+            job._cluster = cluster
+            return job
+
+        def _get(client, name):
+            try:
+                return client.get_job(name)
+            except DkronJobNotFound:
+                return None
+
+        results, errors = self._fanout(_get, name)
+        for cluster_name in self.clients:
+            job = results.get(cluster_name)
+            if job is not None:
+                job._cluster = cluster_name
+                return job
+        if errors:
+            raise DkronClientException(
+                "Job %s was not found, clusters %s did not answer" % (
+                    name, ", ".join(sorted(errors))))
+        raise DkronJobNotFound("Job %s was not found" % name)
+
+    def save_job(self, job):
+        """
+        Save a job (DkronJob, CompactJob or dict) to its cluster (see cluster_for)
+        """
+        cluster = self.cluster_for(job)
+        client = self.clients[cluster]
+        if not isinstance(job, (DkronJob, CompactJob)):
+            job = DkronJob.from_dict(job, client)
+        result = client.save_job(job)
+        job._cluster = cluster
+        return result
+
+    def _named(self, job, cluster):
+        """
+        Return the cluster name and job name of a job, a job name or a name and cluster
+        """
+        if isinstance(job, dict):
+            return cluster or self.cluster_for(job), job["name"]
+        return cluster or self.locate(job), job
+
+    def run_job(self, job, cluster=None):
+        """
+        Run a job (or job name, located across the clusters when cluster is not given)
+        """
+        cluster, name = self._named(job, cluster)
+        return self.clients[cluster].run_job(name)
+
+    def delete_job(self, job, cluster=None):
+        """
+        Delete a job (or job name, located across the clusters when cluster is not given)
+        """
+        cluster, name = self._named(job, cluster)
+        return self.clients[cluster].delete_job(name)
+
+    def toggle(self, job, cluster=None):
+        """
+        Enable/disable a job (or job name, located across the clusters when cluster is not given)
+        """
+        cluster, name = self._named(job, cluster)
+        return self.clients[cluster].toggle(name)
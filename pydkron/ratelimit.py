@@ -0,0 +1,127 @@
+"""
+Client side token bucket rate limiting
+"""
+from threading import Lock
+import time
+
+
+class TokenBucket(object):
+    """
+    Thread safe token bucket: rate tokens per second, at most burst stored
+    """
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: Tokens added per second
+        :param burst: Bucket size, rate (at least 1) by default
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self, tokens, timeout):
+        """
+        Take the tokens now, returns the seconds to wait before using them
+        or None when that would exceed timeout (nothing is taken then)
+        """
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                return None
+            # tokens may go negative: later callers queue behind the reserved ones
+            self._tokens -= tokens
+            return wait
+
+    def _refund(self, tokens):
+        """
+        Give back reserved tokens that will not be used
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.burst, self._tokens + tokens)
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Wait for tokens, returns the seconds waited or None after timeout
+
+        :param tokens: Number of tokens to take
+        :param timeout: Maximum seconds to wait, None waits as long as needed
+        """
+        wait = self._reserve(tokens, timeout)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens only if they are available right away
+        """
+        return self._reserve(tokens, 0) is not None
+
+
+class RateLimiter(object):
+    """
+    Request rate limits of a client, overall and per host
+
+    Every request attempt (including retries and hedges) takes a token
+    from the bucket of the host it is sent to and one from the client
+    bucket, or none of them when it would wait past its timeout. Pass an
+    instance to DkronClient(rate_limit=...).
+    """
+    def __init__(self, rate=None, burst=None, host_rate=None, host_burst=None):
+        """
+        :param rate: Maximum requests per second of the client, None for no limit
+        :param burst: Requests allowed at once above the client rate
+        :param host_rate: Maximum requests per second to each host, None for no limit
+        :param host_burst: Requests allowed at once above the host rate
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.hosts = {}
+        self._lock = Lock()
+
+    def host_bucket(self, host):
+        """
+        Return the bucket of a host, None without a per host limit
+        """
+        if not self.host_rate:
+            return None
+        bucket = self.hosts.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self.hosts.get(host)
+                if bucket is None:
+                    bucket = self.hosts[host] = TokenBucket(self.host_rate, self.host_burst)
+        return bucket
+
+    def acquire(self, host, timeout=None):
+        """
+        Wait until a request can be sent to host, returns the seconds waited
+        or None when that would take longer than timeout
+        """
+        reserved = []
+        wait = 0.0
+        # the host first: a busy host must not burn the tokens of the whole client
+        for bucket in (self.host_bucket(host), self.bucket):
+            if bucket is None:
+                continue
+            bucket_wait = bucket._reserve(1, timeout)
+            if bucket_wait is None:
+                for taken in reserved:
+                    taken._refund(1)
+                return None
+            reserved.append(bucket)
+            wait = max(wait, bucket_wait)
+        if wait:
+            time.sleep(wait)
+        return wait
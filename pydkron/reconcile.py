@@ -0,0 +1,126 @@
+"""
+Declarative job reconciliation against the cluster state
+"""
+from pydkron.job import DkronJob, JOB_READ_ONLY_FIELDS
+
+
+def diff_job(desired, live):
+    """
+    Return the writable fields of desired that differ from live
+
+    Only the fields set on the desired job are compared, read only and
+    private fields are ignored. The result maps the field name to a
+    (live value, desired value) tuple.
+    """
+    changes = {}
+    for key, value in desired.items():
+        if key.startswith("_") or key in JOB_READ_ONLY_FIELDS:
+            continue
+        current = live.get(key)
+        if current != value:
+            changes[key] = (current, value)
+    return changes
+
+
+class ReconcilePlan(object):
+    """
+    The minimal set of writes needed to reach the desired jobs
+
+    create and update hold the jobs to save, changes maps the updated job
+    names to their field diff, delete lists the job names to remove and
+    unchanged the job names that need no write. After apply() the
+    BulkResult of the saves and deletes are available as saved/deleted.
+    """
+    def __init__(self):
+        self.create = []
+        self.update = []
+        self.changes = {}
+        self.delete = []
+        self.unchanged = []
+        self.saved = None
+        self.deleted = None
+        self._live = {}
+
+    @property
+    def empty(self):
+        """
+        True when the cluster already matches the desired jobs
+        """
+        return not (self.create or self.update or self.delete)
+
+    def __repr__(self):
+        return "<ReconcilePlan create=%d update=%d delete=%d unchanged=%d>" % (
+            len(self.create), len(self.update), len(self.delete), len(self.unchanged))
+
+    def __str__(self):
+        lines = []
+        for job in self.create:
+            lines.append("+ %s" % job["name"])
+        for job in self.update:
+            lines.append("~ %s" % job["name"])
+            for key, (current, value) in sorted(self.changes[job["name"]].items()):
+                lines.append("    %s: %r -> %r" % (key, current, value))
+        for name in self.delete:
+            lines.append("- %s" % name)
+        return "\n".join(lines)
+
+    def apply(self, client, max_workers=None):
+        """
+        Issue the planned saves and deletes through the client
+
+        Saves run parents first and deletes dependent jobs first, see
+        DkronClient.save_job_tree and delete_job_tree.
+        """
+        self.saved = client.save_job_tree(self.create + self.update, max_workers=max_workers)
+        self.deleted = client.delete_job_tree(
+            [self._live.get(name, name) for name in self.delete], max_workers=max_workers)
+        return self
+
+
+def plan(desired_jobs, live_jobs, prune=False):
+    """
+    Build the ReconcilePlan that turns live_jobs into desired_jobs
+
+    :param desired_jobs: Iterable of DkronJob (or dict) definitions
+    :param live_jobs: Iterable of the jobs currently in the cluster
+    :param prune: Delete live jobs that are not desired
+    """
+    live = dict((job["name"], job) for job in live_jobs)
+    desired = {}
+    for job in desired_jobs:
+        desired[job["name"]] = job
+    result = ReconcilePlan()
+    for name, job in desired.items():
+        if name not in live:
+            result.create.append(job)
+            continue
+        changes = diff_job(job, live[name])
+        if changes:
+            result.update.append(job)
+            result.changes[name] = changes
+        else:
+            result.unchanged.append(name)
+    if prune:
+        result.delete = [name for name in live if name not in desired]
+        result._live = dict((name, live[name]) for name in result.delete)
+    return result
+
+
+def reconcile(client, desired_jobs, prune=False, dry_run=False, max_workers=None):
+    """
+    Fetch the cluster jobs once and apply the minimal set of writes
+
+    :param client: DkronClient
+    :param desired_jobs: Iterable of DkronJob (or dict) definitions
+    :param prune: Delete cluster jobs that are not desired
+    :param dry_run: Only return the plan, do not write anything
+    :param max_workers: Concurrency of the saves and deletes
+    """
+    desired = [
+        job if isinstance(job, DkronJob) else DkronJob.from_dict(job, client)
+        for job in desired_jobs
+    ]
+    result = plan(desired, client.jobs(), prune=prune)
+    if not dry_run:
+        result.apply(client, max_workers=max_workers)
+    return result
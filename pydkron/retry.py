@@ -0,0 +1,108 @@
+"""
+Request timeouts, retries and hedging
+"""
+from collections import deque
+from random import uniform
+from threading import Lock
+
+from requests.exceptions import ConnectTimeout, ConnectionError as RequestsConnectionError
+from urllib3.exceptions import NewConnectionError
+
+# statuses that are worth asking another host for
+RETRY_STATUSES = (502, 503, 504)
+
+
+class RetryPolicy(object):
+    """
+    Timeouts, retries, backoff and hedging of the client requests
+
+    Every call first tries each host once (in the host pool order); with
+    max_attempts above the number of hosts it then goes round the hosts
+    again, sleeping an exponential backoff with full jitter between rounds.
+    The whole call is bounded by deadline seconds when it is set.
+
+    Non-idempotent calls (run_job, toggle) are only retried when the
+    request was never sent, and never on a retryable status or hedged.
+
+    With hedge=True a GET that has not answered within the observed
+    hedge_percentile latency is also sent to the next host and the first
+    answer wins.
+    """
+    def __init__(self, connect_timeout=3.05, read_timeout=10, max_attempts=None,
+                 retry_statuses=RETRY_STATUSES, backoff_base=0.05, backoff_max=2.0,
+                 deadline=None, hedge=False, hedge_percentile=95, hedge_min_samples=20,
+                 hedge_window=200):
+        """
+        :param connect_timeout: Seconds to wait for a connection
+        :param read_timeout: Seconds to wait for the response
+        :param max_attempts: Attempts per call, one per host by default
+        :param retry_statuses: Statuses retried on another host
+        :param backoff_base: First backoff (seconds) between rounds over the hosts
+        :param backoff_max: Maximum backoff (seconds)
+        :param deadline: Maximum seconds for a whole call, including retries
+        :param hedge: Send slow GETs to a second host
+        :param hedge_percentile: Latency percentile after which a GET is hedged
+        :param hedge_min_samples: Latency samples needed before hedging starts
+        :param hedge_window: Number of recent latency samples kept
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_attempts = max_attempts
+        self.retry_statuses = frozenset(retry_statuses)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = deque(maxlen=hedge_window)
+        self._lock = Lock()
+
+    def attempts(self, hosts):
+        """
+        Return the number of attempts for a call over that many hosts
+        """
+        return self.max_attempts if self.max_attempts is not None else max(hosts, 1)
+
+    def timeout(self, remaining=None):
+        """
+        Return the (connect, read) timeout, capped to the remaining deadline
+        """
+        if remaining is None:
+            return (self.connect_timeout, self.read_timeout)
+        return (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+
+    def backoff(self, round_number):
+        """
+        Return the jittered sleep before the given round (1 based) over the hosts
+        """
+        return uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (round_number - 1)))
+
+    def record_latency(self, latency):
+        """
+        Add a successful request latency to the hedging window
+        """
+        with self._lock:
+            self._latencies.append(latency)
+
+    def hedge_delay(self):
+        """
+        Return the seconds to wait before hedging, None without enough samples
+        """
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100.0))
+        return ordered[index]
+
+
+def not_sent(exc):
+    """
+    True when a request exception was raised before the request reached the server
+    """
+    if isinstance(exc, ConnectTimeout):
+        return True
+    if isinstance(exc, RequestsConnectionError) and exc.args:
+        return isinstance(getattr(exc.args[0], "reason", None), NewConnectionError)
+    return False
@@ -0,0 +1,423 @@
+"""
+Dkron schedule expressions and fire time calculation
+
+Supports the schedules accepted by Dkron: 6 field cron expressions
+(seconds first, the day of week being optional), the @yearly, @monthly,
+@weekly, @daily, @hourly descriptors, @every <duration>, @at <RFC3339
+time>, @manually/@triggered and the CRON_TZ=/TZ= prefix. Times are handled
+as epoch seconds internally.
+"""
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import calendar
+import re
+import time
+
+from pydkron.executions import parse_time
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # pragma: no cover
+    ZoneInfo = None
+
+DESCRIPTORS = {
+    "@yearly": "0 0 0 1 1 *",
+    "@annually": "0 0 0 1 1 *",
+    "@monthly": "0 0 0 1 * *",
+    "@weekly": "0 0 0 * * 0",
+    "@daily": "0 0 0 * * *",
+    "@midnight": "0 0 0 * * *",
+    "@hourly": "0 0 * * * *",
+}
+
+NEVER = ("", "@manually", "@triggered")
+
+_MONTHS = dict((name.lower(), index) for index, name in enumerate(calendar.month_abbr) if name)
+_WEEKDAYS = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
+
+# (minimum, maximum, names) of the second, minute, hour, day, month and weekday fields
+_FIELDS = (
+    (0, 59, None),
+    (0, 59, None),
+    (0, 23, None),
+    (1, 31, None),
+    (1, 12, _MONTHS),
+    (0, 6, _WEEKDAYS),
+)
+
+_DURATION = re.compile(r"(\d+(?:\.\d*)?|\.\d+)(ns|us|\xb5s|ms|s|m|h)")
+_DURATION_UNITS = {
+    "ns": 1e-9, "us": 1e-6, "\xb5s": 1e-6, "ms": 1e-3, "s": 1, "m": 60, "h": 3600,
+}
+
+# a cron expression that matched no day in that many days never fires
+_MAX_DAYS = 366 * 5
+
+
+def _value(token, names):
+    if names is not None and token.lower() in names:
+        return names[token.lower()]
+    if not token.isdigit():
+        raise ValueError("Invalid value %s" % token)
+    return int(token)
+
+
+def _parse_field(field, minimum, maximum, names):
+    values = set()
+    star = False
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError("Invalid step %s" % step_text)
+            step = int(step_text)
+        if part in ("*", "?"):
+            low, high = minimum, maximum
+            star = star or step == 1
+        elif "-" in part:
+            low_text, high_text = part.split("-", 1)
+            low, high = _value(low_text, names), _value(high_text, names)
+        else:
+            low = _value(part, names)
+            high = maximum if step > 1 else low
+        if low < minimum or high > maximum or low > high:
+            raise ValueError("Value out of range %s [%d-%d]" % (field, minimum, maximum))
+        values.update(range(low, high + 1, step))
+    return frozenset(values), star
+
+
+def parse_duration(text):
+    """
+    Parse a Go duration (e.g. 1h30m, 90s) into seconds
+    """
+    position, total = 0, 0.0
+    for match in _DURATION.finditer(text):
+        if match.start() != position:
+            break
+        total += float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+        position = match.end()
+    if not text or position != len(text):
+        raise ValueError("Invalid duration %s" % text)
+    return total
+
+
+def _timezone(name):
+    if not name or name in ("UTC", "Etc/UTC"):
+        return timezone.utc
+    if ZoneInfo is None:
+        raise ValueError("Timezone %s requires zoneinfo" % name)
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        raise ValueError("Unknown timezone %s" % name)
+
+
+def _epoch(value):
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float)):
+        return value
+    return parse_time(value).timestamp()
+
+
+class Schedule(object):
+    """
+    Base of the parsed schedules, the fire times are epoch seconds
+    """
+    expression = None
+
+    def iter_epochs(self, start, inclusive=False):
+        """
+        Yield the fire times after (or at, when inclusive) the start epoch
+        """
+        raise NotImplementedError()
+
+    def fire_epochs(self, start, end):
+        """
+        Return the fire times in [start, end) as epoch seconds
+        """
+        fires = []
+        for fire in self.iter_epochs(start, inclusive=True):
+            if fire >= end:
+                break
+            fires.append(fire)
+        return fires
+
+    def next(self, after=None):
+        """
+        Return the first fire time (aware datetime) after the given time, None if none
+        """
+        runs = self.next_runs(after, 1)
+        return runs[0] if runs else None
+
+    def next_runs(self, after=None, count=10):
+        """
+        Return the next count fire times (aware datetimes) after the given time
+
+        :param after: datetime, RFC3339 string or epoch, now by default
+        :param count: Number of fire times
+        """
+        return [
+            datetime.fromtimestamp(fire, timezone.utc)
+            for fire in _next_epochs(self, int(_epoch(after)), count)
+        ]
+
+    def __repr__(self):
+        return "<%s %s>" % (type(self).__name__, self.expression)
+
+
+@lru_cache(maxsize=4096)
+def _next_epochs(schedule, after, count):
+    fires = []
+    for fire in schedule.iter_epochs(after):
+        fires.append(fire)
+        if len(fires) >= count:
+            break
+    return tuple(fires)
+
+
+class CronSchedule(Schedule):
+    """
+    Cron expression with seconds
+
+    As in cron, when both the day of month and the day of week are
+    restricted a day matching either one fires.
+    """
+    def __init__(self, expression, tz=timezone.utc):
+        fields = expression.split()
+        if len(fields) == 5:
+            fields.append("*")
+        if len(fields) != 6:
+            raise ValueError(
+                "Expected 5 or 6 fields, found %d: %s" % (len(fields), expression))
+        parsed = [
+            _parse_field(field, minimum, maximum, names)
+            for field, (minimum, maximum, names) in zip(fields, _FIELDS)
+        ]
+        self.expression = expression
+        self.tz = tz
+        self.seconds, self.minutes, self.hours = [values for values, _ in parsed[:3]]
+        (self.days, dom_star), (self.months, _), (self.weekdays, dow_star) = parsed[3:]
+        self.any_day = dom_star or dow_star
+        self.times = sorted(
+            hour * 3600 + minute * 60 + second
+            for hour in self.hours for minute in self.minutes for second in self.seconds)
+
+    def day_matches(self, day):
+        """
+        True when the schedule fires on the given date
+        """
+        if day.month not in self.months:
+            return False
+        dom = day.day in self.days
+        dow = day.isoweekday() % 7 in self.weekdays
+        return dom and dow if self.any_day else dom or dow
+
+    def _day_epochs(self, day):
+        if self.tz is timezone.utc:
+            base = calendar.timegm(day.timetuple())
+            return [base + offset for offset in self.times]
+        midnight = datetime(day.year, day.month, day.day)
+        return [
+            (midnight + timedelta(seconds=offset)).replace(tzinfo=self.tz).timestamp()
+            for offset in self.times
+        ]
+
+    def fire_epochs(self, start, end):
+        fires = []
+        day = datetime.fromtimestamp(start, self.tz).date()
+        last = datetime.fromtimestamp(end, self.tz).date()
+        while day <= last:
+            if self.day_matches(day):
+                fires.extend(self._day_epochs(day))
+            day += timedelta(days=1)
+        fires = fires[bisect_left(fires, start):bisect_left(fires, end)]
+        return fires if self.tz is timezone.utc else [int(fire) for fire in fires]
+
+    def iter_epochs(self, start, inclusive=False):
+        day = datetime.fromtimestamp(start, self.tz).date()
+        empty = 0
+        while empty < _MAX_DAYS:
+            if self.day_matches(day):
+                empty = 0
+                epochs = self._day_epochs(day)
+                index = bisect_left(epochs, start)
+                if not inclusive:
+                    while index < len(epochs) and epochs[index] <= start:
+                        index += 1
+                for fire in epochs[index:]:
+                    yield int(fire)
+            else:
+                empty += 1
+            day += timedelta(days=1)
+
+
+class EverySchedule(Schedule):
+    """
+    @every <duration>, fires every interval seconds from the anchor
+
+    Dkron starts counting when the job is scheduled (e.g. when the leader
+    starts), which is unknown offline: without an anchor the first fire
+    is one interval after the start of the queried window.
+    """
+    def __init__(self, expression, interval, anchor=None):
+        self.expression = expression
+        # sub second intervals are rounded up to a second, like Dkron does
+        self.interval = max(1, int(interval))
+        self.anchor = anchor
+
+    def iter_epochs(self, start, inclusive=False):
+        start = int(start)
+        anchor = start if self.anchor is None else int(self.anchor)
+        if start < anchor:
+            fire = anchor + self.interval
+        else:
+            fire = anchor + ((start - anchor) // self.interval + 1) * self.interval
+            if inclusive and self.anchor is not None and (start - anchor) % self.interval == 0:
+                fire = start
+        while True:
+            yield fire
+            fire += self.interval
+
+    def fire_epochs(self, start, end):
+        fires = self.iter_epochs(start, inclusive=True)
+        return list(range(next(fires), int(-(-end // 1)), self.interval))
+
+
+class AtSchedule(Schedule):
+    """
+    @at <RFC3339 time>, fires once
+    """
+    def __init__(self, expression, at):
+        self.expression = expression
+        self.at = int(parse_time(at).timestamp())
+
+    def iter_epochs(self, start, inclusive=False):
+        if self.at > start or (inclusive and self.at == start):
+            yield self.at
+
+
+class NeverSchedule(Schedule):
+    """
+    @manually, @triggered and the empty schedule of dependent jobs
+    """
+    def __init__(self, expression):
+        self.expression = expression
+
+    def iter_epochs(self, start, inclusive=False):
+        return iter(())
+
+
+@lru_cache(maxsize=65536)
+def parse_schedule(expression, tz=None):
+    """
+    Parse a Dkron schedule expression, results are cached
+
+    :param expression: Schedule, e.g. "0 */5 * * * *" or "@every 1m"
+    :param tz: Timezone name (the job timezone), overridden by a CRON_TZ= prefix
+    """
+    expression = (expression or "").strip()
+    if expression.startswith(("CRON_TZ=", "TZ=")):
+        prefix, _, expression = expression.partition(" ")
+        tz = prefix.split("=", 1)[1]
+        expression = expression.strip()
+    lowered = expression.lower()
+    if lowered in NEVER:
+        return NeverSchedule(expression)
+    if lowered.startswith("@every"):
+        return EverySchedule(expression, parse_duration(expression[6:].strip()))
+    if lowered.startswith("@at"):
+        return AtSchedule(expression, expression[3:].strip())
+    if lowered in DESCRIPTORS:
+        schedule = CronSchedule(DESCRIPTORS[lowered], _timezone(tz))
+        schedule.expression = expression
+        return schedule
+    if lowered.startswith("@"):
+        raise ValueError("Unknown schedule descriptor %s" % expression)
+    return CronSchedule(expression, _timezone(tz))
+
+
+def next_runs(expression, after=None, count=10, tz=None):
+    """
+    Return the next count fire times (aware datetimes) of a schedule expression
+    """
+    return parse_schedule(expression, tz).next_runs(after, count)
+
+
+def load_histogram(jobs, start, end, resolution=1, skip_disabled=True):
+    """
+    Count the jobs firing in every resolution seconds of [start, end)
+
+    The fire times are computed once per distinct (schedule, timezone)
+    and weighted by the number of jobs sharing it. @every schedules are
+    all anchored at start, as when the leader schedules every job at once.
+    Returns (counts, invalid): counts is a numpy array when numpy is
+    installed, a list otherwise, and invalid lists the jobs left out
+    because their schedule or timezone could not be parsed.
+
+    :param jobs: Iterable of DkronJob (or dict)
+    :param start: Window start (datetime, RFC3339 string or epoch)
+    :param end: Window end (datetime, RFC3339 string or epoch)
+    :param resolution: Bucket width in seconds
+    :param skip_disabled: Leave the disabled jobs out
+    """
+    start, end = int(_epoch(start)), int(_epoch(end))
+    buckets = max(0, -(-(end - start) // resolution))
+    groups = {}
+    for job in jobs:
+        if skip_disabled and job.get("disabled"):
+            continue
+        key = (job.get("schedule") or "", job.get("timezone") or None)
+        groups.setdefault(key, []).append(job)
+    fired = []
+    invalid = []
+    for (expression, tz), members in groups.items():
+        try:
+            fires = parse_schedule(expression, tz).fire_epochs(start, end)
+        except ValueError:
+            invalid.extend(members)
+            continue
+        if fires:
+            fired.append((fires, len(members)))
+    return _histogram(fired, start, buckets, resolution), invalid
+
+
+def _histogram(fired, start, buckets, resolution):
+    """
+    Sum the weighted (fires, weight) pairs into buckets of resolution seconds
+    """
+    if numpy is None:
+        counts = [0] * buckets
+        for fires, weight in fired:
+            for fire in fires:
+                counts[(fire - start) // resolution] += weight
+        return counts
+    if not fired:
+        return numpy.zeros(buckets, dtype=numpy.int64)
+    # one weighted bincount over every fire time
+    indexes = (numpy.concatenate(
+        [numpy.asarray(fires, dtype=numpy.int64) for fires, _ in fired]) - start) // resolution
+    repeats = numpy.repeat(
+        numpy.array([weight for _, weight in fired], dtype=numpy.int64),
+        [len(fires) for fires, _ in fired])
+    counts = numpy.bincount(indexes, weights=repeats, minlength=buckets)[:buckets]
+    return counts.astype(numpy.int64)
+
+
+def peaks(counts, start, resolution=1, top=10):
+    """
+    Return the top busiest buckets of a load histogram as (datetime, jobs)
+    """
+    start = int(_epoch(start))
+    ranked = sorted(range(len(counts)), key=lambda index: -counts[index])[:top]
+    return [
+        (datetime.fromtimestamp(start + index * resolution, timezone.utc), int(counts[index]))
+        for index in ranked if counts[index]
+    ]
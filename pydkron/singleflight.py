@@ -0,0 +1,62 @@
+"""
+Coalescing of identical concurrent calls
+"""
+from threading import Event, Lock
+
+
+class _Flight(object):
+    __slots__ = ("done", "result", "error", "callers")
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None
+        self.callers = 1
+
+
+class SingleFlight(object):
+    """
+    Run a call once for every caller asking for the same key at the same time
+
+    Callers arriving while a call with their key is in flight wait for it
+    and get its result (or exception) instead of making their own call.
+    """
+    def __init__(self):
+        self._flights = {}
+        self._lock = Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Return (result, shared) of func(*args, **kwargs) for key, shared is
+        True when the result came from another caller's call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.callers += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                leader = True
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+        try:
+            flight.result = func(*args, **kwargs)
+        except Exception as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def in_flight(self):
+        """
+        Return the number of calls currently running
+        """
+        with self._lock:
+            return len(self._flights)
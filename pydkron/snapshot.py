@@ -0,0 +1,156 @@
+"""
+On-disk job snapshots
+
+A snapshot is a line delimited JSON file, gzip compressed when the path
+ends with .gz. The first line is a header with the format version and
+the job fields; every following line is one job as a JSON array of its
+values in the header field order (null when the job does not have it),
+with a trailing object for the fields the header does not know about and
+the fields explicitly set to null. Loading maps the header fields by
+name, so snapshots stay readable when JOB_VALID_FIELDS changes.
+"""
+from contextlib import closing
+import gzip
+import mmap
+import os
+import time
+
+from pydkron.codec import get_codec
+from pydkron.exceptions import DkronClientException
+from pydkron.graph import JobGraph
+from pydkron.job import DkronJob, JOB_VALID_FIELDS
+
+SNAPSHOT_VERSION = 1
+
+
+def _is_gzip(path):
+    return path.endswith(".gz")
+
+
+def _encode(codec, obj):
+    data = codec.dumps(obj)
+    return data if isinstance(data, bytes) else data.encode("utf-8")
+
+
+def _row(job, fields, known):
+    row = [job.get(field) for field in fields]
+    while row and row[-1] is None:
+        row.pop()
+    # a null in the row is a missing field, explicit nulls go with the extra fields
+    extra = dict(
+        (key, value) for key, value in job.items()
+        if (key not in known or value is None) and not key.startswith("_"))
+    if extra:
+        row.extend([None] * (len(fields) - len(row)))
+        row.append(extra)
+    return row
+
+
+def _ordered(jobs):
+    # parents first, so a restore in chunks never saves a child before its parent
+    graph = JobGraph(jobs)
+    try:
+        waves = graph.waves()
+    except DkronClientException:
+        return jobs
+    return [graph.jobs[name] for wave in waves for name in wave]
+
+
+def export_snapshot(jobs, path, codec=None):
+    """
+    Write the jobs to a snapshot file, returns the number of jobs written
+
+    The file is written next to path and renamed once complete.
+
+    :param jobs: Iterable of DkronJob (or dict)
+    :param path: Snapshot path, gzip compressed when it ends with .gz
+    :param codec: Codec name or instance, the fastest installed by default
+    """
+    codec = get_codec(codec)
+    fields = list(JOB_VALID_FIELDS)
+    known = frozenset(fields)
+    header = {"version": SNAPSHOT_VERSION, "fields": fields, "created": int(time.time())}
+    tmp_path = "%s.tmp" % path
+    opener = gzip.open if _is_gzip(path) else open
+    count = 0
+    with opener(tmp_path, "wb") as output:
+        output.write(_encode(codec, header) + b"\n")
+        for job in _ordered(list(jobs)):
+            output.write(_encode(codec, _row(job, fields, known)) + b"\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def _lines(path):
+    if _is_gzip(path):
+        with gzip.open(path, "rb") as source:
+            for line in source:
+                yield line
+        return
+    with open(path, "rb") as source:
+        if not os.fstat(source.fileno()).st_size:
+            return
+        with closing(mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)) as mapped:
+            for line in iter(mapped.readline, b""):
+                yield line
+
+
+def read_header(path, codec=None):
+    """
+    Return the header of a snapshot file
+    """
+    codec = get_codec(codec)
+    for line in _lines(path):
+        return _check_header(codec.loads(line))
+    raise DkronClientException("Empty snapshot %s" % path)
+
+
+def _check_header(header):
+    if not isinstance(header, dict) or "fields" not in header:
+        raise DkronClientException("Not a job snapshot")
+    if header.get("version", 0) > SNAPSHOT_VERSION:
+        raise DkronClientException(
+            "Unsupported snapshot version %s [supported=%d]" % (
+                header.get("version"), SNAPSHOT_VERSION))
+    return header
+
+
+def iter_snapshot(path, client=None, job_class=DkronJob, codec=None):
+    """
+    Lazily yield the jobs of a snapshot file
+
+    Plain files are memory mapped and gzip files streamed, only one job
+    is decoded at a time. The jobs get back exactly the fields they were
+    exported with, including the ones set to null.
+
+    :param path: Snapshot path
+    :param client: Client bound to the jobs
+    :param job_class: DkronJob or CompactJob
+    :param codec: Codec name or instance, the fastest installed by default
+    """
+    codec = get_codec(codec)
+    fields = None
+    for line in _lines(path):
+        if fields is None:
+            fields = _check_header(codec.loads(line))["fields"]
+            continue
+        if not line.strip():
+            continue
+        row = codec.loads(line)
+        data = {}
+        if len(row) > len(fields):
+            data.update(row.pop())
+        for field, value in zip(fields, row):
+            if value is not None:
+                data[field] = value
+        yield job_class.from_dict(data, client)
+    if fields is None:
+        raise DkronClientException("Empty snapshot %s" % path)
+
+
+def load_snapshot(path, client=None, job_class=DkronJob, codec=None):
+    """
+    Return the list of jobs of a snapshot file, see iter_snapshot
+    """
+    return list(iter_snapshot(path, client, job_class, codec))
@@ -0,0 +1,75 @@
+"""
+Incremental JSON array parsing
+"""
+import codecs
+import json
+import re
+
+_SEPARATORS = re.compile(r"[\s,]*")
+_WHITESPACE = re.compile(r"\s*")
+# characters that can follow a partial number (includes "" for the end of the buffer)
+_NUMBER_TAIL = frozenset(["", ".", "e", "E", "+", "-"] + list("0123456789"))
+
+
+def iter_json_array(chunks):
+    """
+    Yield the elements of a JSON array as they are received
+
+    Only the element being parsed is buffered, so memory stays flat no
+    matter how large the whole array is. A null body yields nothing.
+
+    :param chunks: Iterable of bytes, e.g. response.iter_content()
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    started = False
+    for chunk in _with_final(chunks):
+        final = chunk is None
+        buf += text.decode(b"", final=True) if final else text.decode(chunk)
+        pos = _WHITESPACE.match(buf).end()
+        if not started:
+            if buf.startswith("null", pos):
+                return
+            # only whitespace or the start of "null" so far
+            if not final and "null".startswith(buf[pos:]):
+                continue
+            if buf[pos:pos + 1] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+        while True:
+            pos = _SEPARATORS.match(buf, pos).end()
+            if pos == len(buf):
+                break
+            if buf[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if final:
+                    raise
+                break
+            if not final and _may_continue(value) and buf[end:end + 1] in _NUMBER_TAIL:
+                break
+            yield value
+            pos = end
+        buf = buf[pos:]
+    raise ValueError("Truncated JSON array")
+
+
+def _with_final(chunks):
+    """
+    Yield the non-empty chunks followed by None
+    """
+    for chunk in chunks:
+        if chunk:
+            yield chunk
+    yield None
+
+
+def _may_continue(value):
+    """
+    True when a decoded value could still grow with more data (numbers)
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -0,0 +1,141 @@
+"""
+pydkron.aio test functions
+"""
+import unittest
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from pydkron.aio import AsyncDkronClient
+except (ImportError, SyntaxError):
+    web = None
+
+from pydkron.client import DkronJobNotFound, DkronClientException
+
+
+def _app(jobs):
+    """
+    Build a small aiohttp app that behaves like a Dkron node
+    """
+    async def status(request):
+        return web.json_response({"awesome": "stuff"})
+
+    async def list_jobs(request):
+        return web.json_response(list(jobs.values()))
+
+    async def save_job(request):
+        data = await request.json()
+        jobs[data["name"]] = data
+        return web.json_response(data, status=201)
+
+    async def get_job(request):
+        name = request.match_info["name"]
+        if name not in jobs:
+            return web.json_response({}, status=404)
+        if request.method == "DELETE":
+            return web.json_response(jobs.pop(name))
+        return web.json_response(jobs[name])
+
+    async def executions(request):
+        if request.match_info["name"] not in jobs:
+            return web.json_response({}, status=404)
+        return web.json_response([{"job_name": request.match_info["name"]}])
+
+    app = web.Application()
+    app.router.add_get("/v1/", status)
+    app.router.add_get("/v1/jobs", list_jobs)
+    app.router.add_post("/v1/jobs", save_job)
+    app.router.add_get("/v1/jobs/{name}", get_job)
+    app.router.add_delete("/v1/jobs/{name}", get_job)
+    app.router.add_get("/v1/jobs/{name}/executions/", executions)
+    return app
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class AsyncDkronClientTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for pydkron.aio
+    """
+    async def asyncSetUp(self):
+        self.jobs = {}
+        self.server = TestServer(_app(self.jobs))
+        await self.server.start_server()
+        self.client = AsyncDkronClient(hosts=["%s:%d" % (self.server.host, self.server.port)])
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_status(self):
+        """
+        AsyncDkronClient: Test status
+        """
+        got = await self.client.status()
+        self.assertEqual(got, {"awesome": "stuff"}, "Got: '%s'" % got)
+
+    async def test_job_lifecycle(self):
+        """
+        AsyncDkronClient: Test create, get, run, delete through the job object
+        """
+        job = await self.client.create_job({"name": "job1", "schedule": "@every 5m"})
+        self.assertEqual(job.name, "job1")
+        got = await self.client.get_job("job1")
+        self.assertEqual(got.schedule, "@every 5m", "Got: '%s'" % got.schedule)
+        executions = await got.executions()
+        self.assertEqual(executions, [{"job_name": "job1"}], "Got: '%s'" % executions)
+        await got.delete()
+        self.assertEqual(self.jobs, {}, "Got: '%s'" % self.jobs)
+        with self.assertRaises(DkronJobNotFound):
+            await self.client.get_job("job1")
+
+    async def test_jobs(self):
+        """
+        AsyncDkronClient: Test jobs
+        """
+        self.jobs["job1"] = {"name": "job1"}
+        jobs = await self.client.jobs()
+        self.assertEqual([job.name for job in jobs], ["job1"])
+
+    async def test_failover(self):
+        """
+        AsyncDkronClient: Test failover to a live host
+        """
+        client = AsyncDkronClient(hosts=["127.0.0.1:1"] + self.client.hosts)
+        for _ in range(3):
+            got = await client.status()
+            self.assertEqual(got, {"awesome": "stuff"}, "Got: '%s'" % got)
+        await client.close()
+
+    async def test_unhealthy_status(self):
+        """
+        AsyncDkronClient: Test 503 answers are retried on the next host, except for runs
+        """
+        hits = []
+
+        async def unavailable(request):
+            hits.append(request.method)
+            return web.json_response({}, status=503)
+
+        app = web.Application()
+        app.router.add_route("*", "/v1/{path:.*}", unavailable)
+        server = TestServer(app)
+        await server.start_server()
+        hosts = ["%s:%d" % (server.host, server.port)] + self.client.hosts
+        client = AsyncDkronClient(hosts=list(hosts))
+        got = await client.status()
+        self.assertEqual(got, {"awesome": "stuff"}, "Got: '%s'" % got)
+        await client.close()
+        client = AsyncDkronClient(hosts=list(hosts))
+        status, _ = await client._call("post", "/jobs/job1")
+        self.assertEqual((status, hits), (503, ["GET", "POST"]))
+        await client.close()
+        await server.close()
+
+    async def test_no_valid_host(self):
+        """
+        AsyncDkronClient: Test DkronClientException when all hosts are down
+        """
+        client = AsyncDkronClient(hosts=["127.0.0.1:1"])
+        with self.assertRaises(DkronClientException):
+            await client.status()
+        await client.close()
@@ -0,0 +1,127 @@
+"""
+pydkron.analytics test functions
+"""
+import json
+import unittest
+
+import requests_mock
+
+from pydkron import analytics
+from pydkron.analytics import ExecutionTable
+from pydkron.client import DkronClient
+from pydkron.exceptions import DkronJobNotFound
+
+GROUP = 1792144800 * 10 ** 9  # 2026-10-16T10:00:00Z
+
+
+def _execution(second, duration, success=True, node="node1", attempt=1, finished=True):
+    return {
+        "started_at": "2026-10-16T10:00:%02dZ" % second,
+        "finished_at": ("2026-10-16T10:%02d:%02dZ" % divmod(second + duration, 60)
+                        if finished else "0001-01-01T00:00:00Z"),
+        "success": success,
+        "node_name": node,
+        "attempt": attempt,
+        "group": GROUP,
+    }
+
+
+def _executions():
+    return {
+        "job1": [
+            _execution(1, 10),
+            _execution(2, 20, node="node2"),
+            _execution(3, 30, success=False, attempt=2),
+            _execution(4, 40),
+            _execution(5, 0, success=False, finished=False),
+        ],
+        "job2": [_execution(30, 5, node="node2")],
+    }
+
+
+JOBS = [
+    {"name": "job1", "schedule": "*/20 * * * * *", "tags": {"team": "data"}},
+    {"name": "job2", "tags": {"team": "data"}},
+]
+
+
+class AnalyticsTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.analytics
+    """
+    def _check(self, stats):
+        job1 = stats["job1"]
+        self.assertEqual((job1["count"], job1["failures"], job1["running"], job1["retries"]),
+                         (5, 1, 1, 1))
+        self.assertAlmostEqual(job1["failure_rate"], 0.25)
+        self.assertAlmostEqual(job1["duration_p50"], 25)
+        self.assertAlmostEqual(job1["duration_p95"], 38.5)
+        self.assertAlmostEqual(job1["duration_mean"], 25)
+        # job1 is measured against its schedule, job2 against the dispatch time
+        self.assertAlmostEqual(job1["skew_p50"], 3)
+        self.assertAlmostEqual(job1["skew_max"], 5)
+        self.assertAlmostEqual(stats["job2"]["skew_max"], 30)
+
+    def test_summary(self):
+        """
+        ExecutionTable: Test per job, node and tag statistics
+        """
+        table = ExecutionTable.from_executions(_executions(), JOBS)
+        self.assertEqual(len(table), 6)
+        self._check(table.summary())
+        by_node = table.summary(by="node")
+        self.assertEqual(sorted(by_node), ["node1", "node2"])
+        self.assertEqual(by_node["node2"]["count"], 2)
+        self.assertEqual(table.summary(by="tag", tag="team")["data"]["count"], 6)
+        with self.assertRaises(ValueError):
+            table.summary(by="tag")
+        with self.assertRaises(ValueError):
+            table.summary(by="owner")
+        self.assertEqual(ExecutionTable().summary(), {})
+
+    def test_summary_python(self):
+        """
+        ExecutionTable: Test the statistics without numpy match
+        """
+        numpy, analytics.numpy = analytics.numpy, None
+        try:
+            table = ExecutionTable.from_executions(_executions(), JOBS)
+            self._check(table.summary())
+            self.assertEqual(table.columns()["success"], [1, 1, 0, 1, 0, 1])
+        finally:
+            analytics.numpy = numpy
+
+    def test_execution_table(self):
+        """
+        DkronClient: Test execution_table fetches every job and records errors
+        """
+        client = DkronClient(hosts=["localhost:8080"])
+        with requests_mock.mock() as req:
+            req.get("http://localhost:8080/v1/jobs", text=json.dumps(JOBS + [{"name": "job3"}]))
+            for name, executions in _executions().items():
+                req.get("http://localhost:8080/v1/jobs/%s/executions/" % name,
+                        text=json.dumps(executions))
+            req.get("http://localhost:8080/v1/jobs/job3/executions/", status_code=404, text="{}")
+            table = client.execution_table()
+        self.assertEqual(len(table), 6)
+        self.assertEqual(sorted(table.job_names), ["job1", "job2"])
+        self.assertEqual(list(table.errors), ["job3"])
+        self.assertIsInstance(table.errors["job3"], DkronJobNotFound)
+        self._check(table.summary())
+
+    def test_execution_table_malformed(self):
+        """
+        DkronClient: Test execution_table reads a null body as no executions and records bad ones
+        """
+        client = DkronClient(hosts=["localhost:8080"])
+        with requests_mock.mock() as req:
+            for name, executions in _executions().items():
+                req.get("http://localhost:8080/v1/jobs/%s/executions/" % name,
+                        text=json.dumps(executions))
+            req.get("http://localhost:8080/v1/jobs/job3/executions/", text="null")
+            req.get("http://localhost:8080/v1/jobs/job4/executions/", text="[1]")
+            table = client.execution_table(["job1", "job2", "job3", "job4"])
+        self.assertEqual(len(table), 6)
+        self.assertEqual(list(table.errors), ["job4"])
+        self.assertTrue(all(len(column) == 6 for column in table.columns().values()))
+        self._check(table.summary())
@@ -0,0 +1,99 @@
+"""
+pydkron.bulk test functions
+"""
+import threading
+import time
+import unittest
+
+import requests_mock
+
+from pydkron.bulk import run_bulk
+from pydkron.client import DkronClient, DkronClientException
+from pydkron.job import DkronJob
+
+
+class RunBulkTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.bulk.run_bulk
+    """
+    def test_concurrency_cap(self):
+        """
+        run_bulk: Test no more than max_workers calls run at once
+        """
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def func(item):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+            return item * 2
+
+        result = run_bulk(func, iter(range(40)), max_workers=4)
+        self.assertEqual(len(result.succeeded), 40)
+        self.assertEqual(result.succeeded[3], 6)
+        self.assertTrue(state["peak"] <= 4, "Peak concurrency was %d" % state["peak"])
+
+    def test_serial(self):
+        """
+        run_bulk: Test max_workers=1 runs inline
+        """
+        result = run_bulk(lambda item: item, ["a", "b"], max_workers=1)
+        self.assertEqual(result.succeeded, {"a": "a", "b": "b"})
+        self.assertTrue(result.ok)
+
+
+class DkronClientBulkTestCase(unittest.TestCase):
+    """
+    Test cases for the DkronClient bulk operations
+    """
+    def setUp(self):
+        self.client = DkronClient(hosts=["localhost:8080"])
+
+    def test_save_jobs(self):
+        """
+        DkronClient: Test save_jobs collects per job failures
+        """
+        def reply(request, context):
+            context.status_code = 500 if request.json()["name"] == "bad" else 201
+            return request.text
+
+        jobs = [DkronJob(self.client, name=name) for name in ("job1", "job2", "bad")]
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(requests_mock.POST, "http://localhost:8080/v1/jobs", text=reply)
+            result = self.client.save_jobs(jobs)
+        self.assertEqual(sorted(result.succeeded), ["job1", "job2"])
+        self.assertEqual(list(result.failed), ["bad"])
+        self.assertIsInstance(result.failed["bad"], DkronClientException)
+        self.assertFalse(result.ok)
+
+    def test_delete_jobs_not_found(self):
+        """
+        DkronClient: Test delete_jobs reports DkronJobNotFound separately
+        """
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.DELETE, "http://localhost:8080/v1/jobs/job1", text="{}")
+            mocker.register_uri(
+                requests_mock.DELETE, "http://localhost:8080/v1/jobs/job2", status_code=404)
+            result = self.client.delete_jobs(["job1", "job2"])
+        self.assertEqual(result.succeeded, {"job1": {}})
+        self.assertEqual(result.not_found, ["job2"])
+
+    def test_run_and_toggle_jobs(self):
+        """
+        DkronClient: Test run_jobs and toggle_jobs
+        """
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.POST, "http://localhost:8080/v1/jobs/job1", text="{}")
+            mocker.register_uri(
+                requests_mock.POST, "http://localhost:8080/v1/jobs/job1/toggle",
+                text='{"name": "job1", "disabled": true}')
+            run = self.client.run_jobs(["job1"])
+            toggled = self.client.toggle_jobs(["job1"], max_workers=2)
+        self.assertTrue(run.ok)
+        self.assertTrue(toggled.succeeded["job1"].disabled)
@@ -0,0 +1,95 @@
+"""
+pydkron.cache test functions
+"""
+import json
+import time
+import unittest
+
+import requests_mock
+
+from pydkron.cache import TTLCache
+from pydkron.client import DkronClient, DkronJobNotFound
+
+
+class TTLCacheTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.cache.TTLCache
+    """
+    def test_expiry(self):
+        """
+        TTLCache: Test entries expire after the ttl
+        """
+        cache = TTLCache(ttl=0.01)
+        cache.set("key", 1)
+        self.assertEqual(cache.get("key"), 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 0})
+
+    def test_lru_eviction(self):
+        """
+        TTLCache: Test the least recently used entry is evicted
+        """
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(len(cache), 2)
+
+
+class DkronClientCacheTestCase(unittest.TestCase):
+    """
+    Test cases for the DkronClient read cache
+    """
+    def setUp(self):
+        self.client = DkronClient(hosts=["localhost:8080"], cache=TTLCache(ttl=60))
+        self.data = [{"name": "job1", "command": "cmd1"}]
+
+    def test_jobs_cached(self):
+        """
+        DkronClient: Test jobs() and get_job() are served from one snapshot
+        """
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs", text=json.dumps(self.data))
+            self.client.jobs()
+            jobs = self.client.jobs()
+            job = self.client.get_job("job1")
+            self.assertEqual(mocker.call_count, 1)
+        self.assertEqual(jobs[0].name, "job1")
+        self.assertEqual(job.command, "cmd1")
+        self.assertEqual(self.client.cache.hits, 2)
+
+    def test_get_job_cached(self):
+        """
+        DkronClient: Test get_job() caches found jobs only
+        """
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs/job1",
+                text=json.dumps(self.data[0]))
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs/job2", status_code=404)
+            self.client.get_job("job1")
+            self.client.get_job("job1")
+            self.assertRaises(DkronJobNotFound, self.client.get_job, "job2")
+            self.assertRaises(DkronJobNotFound, self.client.get_job, "job2")
+            self.assertEqual(mocker.call_count, 3)
+
+    def test_invalidation(self):
+        """
+        DkronClient: Test mutations invalidate the cached entries
+        """
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs", text=json.dumps(self.data))
+            mocker.register_uri(
+                requests_mock.POST, "http://localhost:8080/v1/jobs/job1/toggle",
+                text=json.dumps(self.data[0]))
+            self.client.jobs()
+            self.client.toggle("job1")
+            self.client.jobs()
+            self.assertEqual(mocker.call_count, 3)
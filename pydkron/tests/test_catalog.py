@@ -0,0 +1,79 @@
+"""
+pydkron.catalog test functions
+"""
+import json
+import unittest
+
+import requests_mock
+
+from pydkron.catalog import JobCatalog
+from pydkron.client import DkronClient
+
+
+def _jobs():
+    return [
+        {"name": "extract", "owner": "data", "schedule": "@every 1h",
+         "tags": {"role": "etl:1"}, "dependent_jobs": ["transform"]},
+        {"name": "transform", "owner": "data", "parent_job": "extract",
+         "tags": {"role": "etl:1", "tier": "batch"}, "dependent_jobs": ["load"]},
+        {"name": "load", "owner": "data", "parent_job": "transform", "disabled": True,
+         "tags": {"role": "etl:1"}},
+        {"name": "backup", "owner": "ops", "schedule": "@every 1h",
+         "tags": {"role": "db:1"}},
+    ]
+
+
+def _names(jobs):
+    return sorted(job["name"] for job in jobs)
+
+
+class CatalogTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.catalog
+    """
+    def test_query(self):
+        """
+        JobCatalog: Test single and compound queries
+        """
+        catalog = JobCatalog(jobs=_jobs())
+        self.assertEqual(len(catalog), 4)
+        self.assertEqual(_names(catalog.query(owner="data")), ["extract", "load", "transform"])
+        self.assertEqual(_names(catalog.query(tags={"role": "etl:1"}, disabled=False)),
+                         ["extract", "transform"])
+        self.assertEqual(_names(catalog.query(schedule="@every 1h", owner="ops")), ["backup"])
+        self.assertEqual(_names(catalog.query(tag_keys=["tier"])), ["transform"])
+        self.assertEqual(_names(catalog.children("extract")), ["transform"])
+        self.assertEqual(_names(catalog.query(child="load")), ["transform"])
+        self.assertEqual(catalog.query(owner="data", tags={"role": "db:1"}), [])
+        self.assertEqual(catalog.query(owner="nobody"), [])
+        self.assertEqual(len(catalog.query()), 4)
+        self.assertEqual(catalog.owners(), {"data": 3, "ops": 1})
+
+    def test_refresh(self):
+        """
+        JobCatalog: Test incremental refresh updates the indexes
+        """
+        catalog = JobCatalog(jobs=_jobs())
+        jobs = [job for job in _jobs() if job["name"] != "backup"]
+        jobs[0] = dict(jobs[0], owner="ops")
+        jobs.append({"name": "report", "owner": "ops"})
+        added, changed, removed = catalog.refresh(jobs)
+        self.assertEqual((added, changed, removed), (["report"], ["extract"], ["backup"]))
+        self.assertEqual(_names(catalog.query(owner="ops")), ["extract", "report"])
+        self.assertEqual(catalog.query(schedule="@every 1h", owner="data"), [])
+        self.assertNotIn("backup", catalog)
+        self.assertNotIn(("role", "db:1"), catalog.tags())
+        self.assertEqual(catalog.refresh(jobs), ([], [], []))
+
+    def test_client_catalog(self):
+        """
+        DkronClient: Test catalog from the cluster jobs
+        """
+        client = DkronClient(hosts=["localhost:8080"])
+        with requests_mock.mock() as req:
+            req.get("http://localhost:8080/v1/jobs", text=json.dumps(_jobs()))
+            catalog = client.catalog()
+            self.assertEqual(_names(catalog.query(owner="ops")), ["backup"])
+            self.assertIs(catalog.get("backup")._client, client)
+            req.get("http://localhost:8080/v1/jobs", text=json.dumps(_jobs()[:1]))
+            self.assertEqual(catalog.refresh()[2], ["transform", "load", "backup"])
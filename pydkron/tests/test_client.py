@@ -342,3 +342,46 @@ class DkronClientTestCase(unittest.TestCase):
                 status_code=404,
             )
             self.assertRaises(DkronJobNotFound, self.client.toggle, "job1")
+
+    def test_session_reused(self):
+        """
+        DkronClient: Test host sessions are pooled
+        """
+        session = self.client._session("localhost:8080")
+        got = self.client._session("localhost:8080")
+        self.assertIs(session, got, "Exp the same session for a host")
+        adapter = session.get_adapter("http://localhost:8080/")
+        self.assertEqual(
+            adapter._pool_maxsize,
+            self.client.max_connections,
+            "Exp: '%s', Got: '%s'" % (self.client.max_connections, adapter._pool_maxsize)
+        )
+
+    def test_keep_alive_disabled(self):
+        """
+        DkronClient: Test keep_alive=False closes connections
+        """
+        client = DkronClient(hosts="localhost:8080", keep_alive=False)
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET,
+                "http://localhost:8080/v1/",
+                text="{}",
+                status_code=200
+            )
+            client.status()
+            got = mocker.last_request.headers.get("Connection")
+            self.assertEqual(got, "close", "Exp: 'close', Got: '%s'" % got)
+
+    def test_close(self):
+        """
+        DkronClient: Test close and context manager drop the sessions
+        """
+        with DkronClient(hosts=["localhost:8080"]) as client:
+            client._session("localhost:8080")
+            self.assertEqual(len(client._sessions), 1)
+        self.assertEqual(
+            client._sessions,
+            {},
+            "Exp: '{}', Got: '%s'" % client._sessions
+        )
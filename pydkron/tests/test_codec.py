@@ -0,0 +1,55 @@
+"""
+pydkron.codec test functions
+"""
+import json
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.codec import get_codec, JSONCodec, OrjsonCodec, orjson
+from pydkron.job import DkronJob, CompactJob
+
+
+class CodecTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.codec
+    """
+    def test_get_codec(self):
+        """
+        get_codec: Test named, default and invalid codecs
+        """
+        self.assertIsInstance(get_codec("json"), JSONCodec)
+        exp = OrjsonCodec if orjson is not None else JSONCodec
+        self.assertIsInstance(get_codec(), exp)
+        codec = JSONCodec()
+        self.assertIs(get_codec(codec), codec)
+        self.assertRaises(ValueError, get_codec, "yaml")
+
+    def test_marshal(self):
+        """
+        DkronJob: Test marshal skips the client and honours the codec
+        """
+        job = DkronJob(object(), name="job1", tags={"role": "dkron:1"})
+        job._extra_state = True
+        exp = {"name": "job1", "tags": {"role": "dkron:1"}}
+        self.assertEqual(json.loads(job.marshal()), exp)
+        self.assertEqual(dict(job), exp)
+        for codec in ("json", "orjson") if orjson is not None else ("json",):
+            codec = get_codec(codec)
+            self.assertEqual(codec.loads(job.marshal(codec)), exp)
+            self.assertEqual(codec.loads(CompactJob.from_job(job).marshal(codec)), exp)
+
+    def test_client_codec(self):
+        """
+        DkronClient: Test the client codec encodes and decodes
+        """
+        client = DkronClient(hosts=["localhost:8080"], codec="json")
+        self.assertEqual(client.codec.name, "json")
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.POST, "http://localhost:8080/v1/jobs",
+                text='{"name": "job1"}', status_code=201)
+            got = client.save_job(DkronJob(client, name="job1"))
+            self.assertEqual(got, {"name": "job1"})
+            self.assertEqual(mocker.last_request.json(), {"name": "job1"})
@@ -0,0 +1,59 @@
+"""
+DkronClient conditional jobs() test functions
+"""
+import json
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+
+URL = "http://localhost:8080/v1/jobs"
+
+
+class DkronClientConditionalTestCase(unittest.TestCase):
+    """
+    Test cases for the DkronClient conditional jobs()
+    """
+    def setUp(self):
+        self.client = DkronClient(hosts=["localhost:8080"], conditional_jobs=True)
+        self.data = [{"name": "job1"}, {"name": "job2"}]
+
+    def test_etag(self):
+        """
+        DkronClient: Test jobs() sends If-None-Match and reuses the jobs on 304
+        """
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, URL,
+                [
+                    {"text": json.dumps(self.data), "headers": {"ETag": '"v1"'}},
+                    {"status_code": 304, "headers": {"ETag": '"v1"'}},
+                ])
+            first = self.client.jobs()
+            second = self.client.jobs()
+            self.assertEqual(mocker.last_request.headers["If-None-Match"], '"v1"')
+        self.assertEqual([job.name for job in second], ["job1", "job2"])
+        self.assertIs(first[0], second[0])
+        self.assertIsNot(first, second)
+
+    def test_content_hash(self):
+        """
+        DkronClient: Test jobs() skips decoding an unchanged body without validators
+        """
+        changed = self.data + [{"name": "job3"}]
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, URL,
+                [
+                    {"text": json.dumps(self.data)},
+                    {"text": json.dumps(self.data)},
+                    {"text": json.dumps(changed)},
+                ])
+            first = self.client.jobs()
+            self.assertNotIn("If-None-Match", mocker.last_request.headers)
+            second = self.client.jobs()
+            third = self.client.jobs()
+        self.assertIs(first[1], second[1])
+        self.assertEqual(len(third), 3)
+        self.assertIsNot(first[0], third[0])
@@ -0,0 +1,173 @@
+"""
+pydkron.diskcache test functions
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient, DkronJobNotFound
+from pydkron.diskcache import DiskCache
+
+
+class DiskCacheTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.diskcache.DiskCache
+    """
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_get_set(self):
+        """
+        DiskCache: Test bodies are shared between instances and keyed by cluster
+        """
+        DiskCache(self.path).set("a:8080", "/jobs", b"[1, 2]")
+        cache = DiskCache(self.path)
+        self.assertEqual(cache.get("a:8080", "/jobs"), b"[1, 2]")
+        self.assertIsNone(cache.get("b:8080", "/jobs"))
+        self.assertIsNone(cache.get("a:8080", "/jobs/job1"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 2, "entries": 1, "bytes": 35})
+
+    def test_expiry(self):
+        """
+        DiskCache: Test entries expire after the ttl and are evicted every evict_every writes
+        """
+        cache = DiskCache(self.path, ttl=0.01, evict_every=2)
+        cache.set("a", "/jobs", b"[]")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a", "/jobs"))
+        cache.set("a", "/", b"{}", ttl=60)
+        self.assertEqual(cache.stats()["entries"], 2)
+        cache.set("a", "/jobs/job1", b"{}", ttl=60)
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertIsNone(cache.get("a", "/jobs"))
+
+    def test_size_eviction(self):
+        """
+        DiskCache: Test the least recently used entries are evicted above max_bytes
+        """
+        cache = DiskCache(self.path, max_bytes=300)
+        for index in range(3):
+            cache.set("a", "/jobs/job%d" % index, b"x" * 100)
+            past = time.time() - 10 + index
+            os.utime(cache._file(cache._key("a", "/jobs/job%d" % index)), (past, past))
+        self.assertIsNone(cache.get("a", "/jobs/job0"))
+        self.assertIsNotNone(cache.get("a", "/jobs/job1"))
+        self.assertIsNotNone(cache.get("a", "/jobs/job2"))
+
+    def test_eviction_scans(self):
+        """
+        DiskCache: Test writes below the size estimate skip the scan and stale temp files go
+        """
+        cache = DiskCache(self.path, max_bytes=1000, evict_every=3)
+        stale = os.path.join(self.path, "dead.tmp")
+        fresh = os.path.join(self.path, "live.tmp")
+        for path in (stale, fresh):
+            with open(path, "wb") as output:
+                output.write(b"x")
+        past = time.time() - 120
+        os.utime(stale, (past, past))
+        scans = []
+        evict = cache._evict
+        cache._evict = lambda keep=None: (scans.append(keep), evict(keep))
+        for index in range(5):
+            cache.set("a", "/jobs/job%d" % index, b"x" * 100)
+        self.assertEqual(len(scans), 2)
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(fresh))
+        for index in range(5, 8):
+            cache.set("a", "/jobs/job%d" % index, b"x" * 100)
+        self.assertLessEqual(cache.stats()["bytes"], 1000)
+
+    def test_corrupt_entry(self):
+        """
+        DiskCache: Test a truncated entry is a miss
+        """
+        cache = DiskCache(self.path)
+        cache.set("a", "/jobs", b"[]")
+        with open(cache._file(cache._key("a", "/jobs")), "wb") as output:
+            output.write(b"PDKC")
+        self.assertIsNone(cache.get("a", "/jobs"))
+
+    def test_invalidate_clear(self):
+        """
+        DiskCache: Test invalidate() and clear() remove the entries
+        """
+        cache = DiskCache(self.path)
+        cache.set("a", "/jobs", b"[]")
+        cache.set("a", "/", b"{}")
+        cache.invalidate("a", "/jobs", "/missing")
+        self.assertIsNone(cache.get("a", "/jobs"))
+        self.assertEqual(cache.get("a", "/"), b"{}")
+        cache.clear()
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+class DkronClientDiskCacheTestCase(unittest.TestCase):
+    """
+    Test cases for the DkronClient disk cache
+    """
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.data = [{"name": "job1", "command": "cmd1"}]
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def _client(self, hosts=None):
+        return DkronClient(
+            hosts=hosts or ["b:8080", "a:8080"], disk_cache=DiskCache(self.path, ttl=60))
+
+    def test_jobs_shared(self):
+        """
+        DkronClient: Test a new client serves jobs() from the disk cache
+        """
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(requests_mock.GET, "http://b:8080/v1/jobs", json=self.data)
+            mocker.register_uri(requests_mock.GET, "http://a:8080/v1/jobs", json=self.data)
+            self.assertEqual(self._client().jobs()[0].name, "job1")
+            jobs = self._client(["a:8080", "b:8080"]).jobs()
+            self.assertEqual(mocker.call_count, 1)
+        self.assertEqual(jobs[0].name, "job1")
+        self.assertEqual(jobs[0].command, "cmd1")
+
+    def test_get_job(self):
+        """
+        DkronClient: Test get_job() is cached and a 404 is not
+        """
+        with requests_mock.Mocker() as mocker:
+            for host in ("a", "b"):
+                mocker.register_uri(
+                    requests_mock.GET, "http://%s:8080/v1/jobs/job1" % host,
+                    text=json.dumps(self.data[0]))
+                mocker.register_uri(
+                    requests_mock.GET, "http://%s:8080/v1/jobs/job2" % host, status_code=404)
+            self.assertEqual(self._client().get_job("job1").name, "job1")
+            self.assertEqual(self._client().get_job("job1").name, "job1")
+            for _ in range(2):
+                with self.assertRaises(DkronJobNotFound):
+                    self._client().get_job("job2")
+            self.assertEqual(mocker.call_count, 3)
+
+    def test_write_invalidates(self):
+        """
+        DkronClient: Test a write drops the cached entries in every process
+        """
+        with requests_mock.Mocker() as mocker:
+            for host in ("a", "b"):
+                mocker.register_uri(
+                    requests_mock.GET, "http://%s:8080/v1/jobs" % host, json=self.data)
+                mocker.register_uri(
+                    requests_mock.POST, "http://%s:8080/v1/jobs/job1" % host, status_code=202,
+                    json=self.data[0])
+            self._client().jobs()
+            self._client().run_job("job1")
+            self._client().jobs()
+            self.assertEqual(mocker.call_count, 3)
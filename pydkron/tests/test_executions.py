@@ -0,0 +1,142 @@
+"""
+pydkron.executions test functions
+"""
+from datetime import datetime, timezone
+import json
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.executions import (
+    UnsortedExecutions, parse_time, is_finished, filter_executions)
+
+URL = "http://localhost:8080/v1/jobs/job1/executions/"
+ZERO = "0001-01-01T00:00:00Z"
+
+
+def _execution(minute, finished=True):
+    started = "2020-07-26T01:%02d:00.123456789Z" % minute
+    return {
+        "id": "exec-%d" % minute,
+        "job_name": "job1",
+        "started_at": started,
+        "finished_at": started if finished else ZERO,
+        "success": True,
+    }
+
+
+class ExecutionsTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.executions
+    """
+    def test_parse_time(self):
+        """
+        parse_time: Test RFC3339 timestamps with fractions and offsets
+        """
+        exp = datetime(2020, 7, 26, 1, 44, 6, 459000, timezone.utc)
+        self.assertEqual(parse_time("2020-07-26T01:44:06.459Z"), exp)
+        self.assertEqual(parse_time("2020-07-26T03:44:06.459000001+02:00"), exp)
+        self.assertEqual(parse_time(exp.replace(tzinfo=None)), exp)
+        self.assertRaises(ValueError, parse_time, "yesterday")
+
+    def test_is_finished(self):
+        """
+        is_finished: Test the zero time means running
+        """
+        self.assertTrue(is_finished(_execution(1)))
+        self.assertFalse(is_finished(_execution(1, finished=False)))
+
+    def test_filter_executions(self):
+        """
+        filter_executions: Test since, until, limit and stop_early
+        """
+        executions = [_execution(minute) for minute in (5, 4, 3, 2, 1)]
+        got = filter_executions(
+            executions, since="2020-07-26T01:02:00Z", until="2020-07-26T01:04:00Z")
+        self.assertEqual([item["id"] for item in got], ["exec-3", "exec-2"])
+        got = filter_executions(executions, limit=2)
+        self.assertEqual([item["id"] for item in got], ["exec-5", "exec-4"])
+        consumed = []
+        got = filter_executions(
+            (consumed.append(item) or item for item in executions),
+            since="2020-07-26T01:04:00Z", stop_early=True)
+        self.assertEqual([item["id"] for item in got], ["exec-5", "exec-4"])
+        # the one after the first older execution confirms the order
+        self.assertEqual(len(consumed), 4)
+        for since in ("2020-07-26T01:02:00Z", None):
+            with self.assertRaises(UnsortedExecutions):
+                list(filter_executions(
+                    executions[::-1], since=since, limit=3, stop_early=True))
+
+
+class DkronClientExecutionsTestCase(unittest.TestCase):
+    """
+    Test cases for the DkronClient execution window and tailing
+    """
+    def setUp(self):
+        self.client = DkronClient(hosts=["localhost:8080"])
+        self.history = []
+
+    def _reply(self, request, context):
+        return json.dumps(sorted(self.history, key=lambda item: item["started_at"], reverse=True))
+
+    def test_get_executions_window(self):
+        """
+        DkronClient: Test get_executions with limit and since
+        """
+        self.history = [_execution(minute) for minute in range(10)]
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(requests_mock.GET, URL, text=self._reply)
+            got = self.client.get_executions("job1", limit=3)
+            self.assertEqual([item["id"] for item in got], ["exec-9", "exec-8", "exec-7"])
+            self.assertEqual(mocker.last_request.qs["_order"], ["desc"])
+            self.assertEqual(mocker.last_request.qs["_end"], ["3"])
+            got = self.client.get_executions(
+                "job1", since=datetime(2020, 7, 26, 1, 8, tzinfo=timezone.utc))
+            self.assertEqual([item["id"] for item in got], ["exec-9", "exec-8"])
+
+    def test_get_executions_unsorted(self):
+        """
+        DkronClient: Test get_executions falls back to a full scan when the server ignores _sort
+        """
+        self.history = [_execution(minute) for minute in range(10)]
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(requests_mock.GET, URL, text=json.dumps(self.history))
+            got = self.client.get_executions(
+                "job1", since=datetime(2020, 7, 26, 1, 7, tzinfo=timezone.utc))
+            self.assertEqual([item["id"] for item in got], ["exec-9", "exec-8", "exec-7"])
+            self.assertEqual(mocker.call_count, 2)
+            self.assertEqual(mocker.last_request.qs, {})
+            got = self.client.get_executions("job1", limit=3)
+            self.assertEqual([item["id"] for item in got], ["exec-9", "exec-8", "exec-7"])
+
+    def test_tail_executions(self):
+        """
+        DkronClient: Test tail_executions only returns new finished executions
+        """
+        self.history = [_execution(0), _execution(1)]
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(requests_mock.GET, URL, text=self._reply)
+            tail = self.client.tail_executions("job1", interval=0)
+            self.assertEqual(tail.poll(), [])
+            self.assertEqual(tail.poll(), [])
+            self.history += [_execution(2), _execution(3, finished=False)]
+            self.assertEqual([item["id"] for item in tail.poll()], ["exec-2"])
+            self.history[-1] = _execution(3)
+            self.history.append(_execution(4))
+            self.assertEqual([item["id"] for item in tail.poll()], ["exec-3", "exec-4"])
+            self.assertEqual(tail.poll(), [])
+            self.assertEqual(tail.since, parse_time(_execution(4)["started_at"]))
+
+    def test_tail_executions_since(self):
+        """
+        DkronClient: Test tail_executions from a start time
+        """
+        self.history = [_execution(minute) for minute in range(3)]
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(requests_mock.GET, URL, text=self._reply)
+            tail = self.client.tail_executions(
+                "job1", since=datetime(2020, 7, 26, 1, 1, tzinfo=timezone.utc))
+            self.assertEqual([item["id"] for item in tail.poll()], ["exec-1", "exec-2"])
+            self.assertEqual(tail.poll(), [])
@@ -0,0 +1,140 @@
+"""
+pydkron.fakeserver test functions
+"""
+import contextlib
+import io
+import time
+import unittest
+
+import requests
+
+from pydkron.client import DkronClient, DkronJobNotFound
+from pydkron.exceptions import DkronClientException
+from pydkron.fakeserver import FakeCluster
+
+
+class FakeClusterTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.fakeserver.FakeCluster through a DkronClient
+    """
+    def setUp(self):
+        self.cluster = FakeCluster(nodes=3, seed=1)
+        self.client = DkronClient(hosts=self.cluster.hosts)
+
+    def tearDown(self):
+        self.client.close()
+        self.cluster.shutdown()
+
+    def test_job_lifecycle(self):
+        """
+        FakeCluster: Test save, get, run, toggle and delete of a job
+        """
+        self.client.create_job({"name": "job1", "schedule": "@every 1m", "command": "ls"})
+        job = self.client.get_job("job1")
+        self.assertEqual(job.command, "ls")
+        self.assertEqual(job.success_count, 0)
+        self.assertEqual([job.name for job in self.client.jobs()], ["job1"])
+        self.assertEqual(self.client.run_job("job1")["success_count"], 1)
+        self.assertTrue(self.client.toggle("job1").disabled)
+        self.assertEqual(self.client.delete_job("job1")["name"], "job1")
+        with self.assertRaises(DkronJobNotFound):
+            self.client.get_job("job1")
+        with self.assertRaises(DkronJobNotFound):
+            self.client.toggle("job1")
+        self.assertEqual(self.cluster.hits("GET /v1/jobs/:name"), 2)
+
+    def test_executions(self):
+        """
+        FakeCluster: Test runs are recorded and the executions window is applied
+        """
+        self.cluster.add_jobs([{"name": "job1"}])
+        for _ in range(3):
+            self.client.run_job("job1")
+        executions = self.client.get_executions("job1", limit=2)
+        self.assertEqual([execution["id"] for execution in executions], ["job1-3", "job1-2"])
+        self.assertEqual(len(self.client.get_executions("job1")), 3)
+
+    def test_dependent_jobs(self):
+        """
+        FakeCluster: Test parents track their dependent jobs
+        """
+        with self.assertRaises(DkronClientException):
+            self.client.create_job({"name": "child", "parent_job": "parent"})
+        self.client.create_job({"name": "parent"})
+        self.client.create_job({"name": "child", "parent_job": "parent"})
+        self.assertEqual(self.cluster.get_job("parent")["dependent_jobs"], ["child"])
+        self.client.delete_job("parent")
+        self.assertEqual(self.cluster.job_names(), ["parent", "child"])
+        self.client.delete_job("child")
+        self.assertIsNone(self.cluster.get_job("parent")["dependent_jobs"])
+
+    def test_conditional_jobs(self):
+        """
+        FakeCluster: Test GET /v1/jobs answers 304 to a matching If-None-Match
+        """
+        self.cluster.add_jobs([{"name": "job1"}])
+        client = DkronClient(hosts=self.cluster.hosts[:1], conditional_jobs=True)
+        first = client.jobs()
+        self.assertIs(client.jobs()[0], first[0])
+        resp = requests.get(
+            "http://%s/v1/jobs" % self.cluster.hosts[0],
+            headers={"If-None-Match": client._jobs_state.etag})
+        self.assertEqual(resp.status_code, 304)
+
+    def test_leader(self):
+        """
+        FakeCluster: Test the leader is found and receives the writes
+        """
+        self.cluster.set_leader(2)
+        client = DkronClient(hosts=self.cluster.hosts, leader_routing=True)
+        self.assertEqual(client.leader(), self.cluster.hosts[2])
+        client.create_job({"name": "job1"})
+        self.assertEqual(self.cluster.nodes[2].hits["POST /v1/jobs"], 1)
+        self.cluster.set_leader(None)
+        with self.assertRaises(DkronClientException):
+            DkronClient(hosts=self.cluster.hosts).create_job({"name": "job2"})
+
+    def test_redirect_writes(self):
+        """
+        FakeCluster: Test followers redirect the writes to the leader
+        """
+        self.cluster.redirect_writes = True
+        client = DkronClient(hosts=self.cluster.hosts[1:2])
+        client.create_job({"name": "job1"})
+        self.assertEqual(self.cluster.nodes[0].hits["POST /v1/jobs"], 1)
+        self.assertEqual(self.cluster.nodes[1].hits["POST /v1/jobs"], 1)
+
+    def test_error_injection(self):
+        """
+        FakeCluster: Test injected failures and a node down fail over to the other nodes
+        """
+        self.cluster.nodes[0].fail_next(3, status=503)
+        self.cluster.nodes[1].down = True
+        for _ in range(3):
+            self.assertEqual(self.client.status()["agent"]["name"], "node2")
+        self.cluster.nodes[2].error_rate = 1.0
+        self.assertEqual(
+            requests.get("http://%s/v1/" % self.cluster.hosts[2]).status_code, 500)
+
+    def test_latency(self):
+        """
+        FakeCluster: Test the configured latency delays the responses
+        """
+        self.cluster.nodes[0].latency = 0.05
+        start = time.monotonic()
+        requests.get("http://%s/v1/" % self.cluster.hosts[0])
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_client_hang_up(self):
+        """
+        FakeCluster: Test clients giving up on a request print nothing
+        """
+        self.cluster.add_jobs(
+            {"name": "job%d" % index, "command": "x" * 200} for index in range(5000))
+        self.cluster.nodes[0].latency = 0.2
+        output = io.StringIO()
+        with contextlib.redirect_stderr(output):
+            with self.assertRaises(requests.exceptions.Timeout):
+                requests.get("http://%s/v1/jobs" % self.cluster.hosts[0], timeout=0.05)
+            time.sleep(0.4)
+        self.assertEqual(output.getvalue(), "")
@@ -0,0 +1,93 @@
+"""
+pydkron.graph test functions
+"""
+import json
+import threading
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.exceptions import DkronClientException, DkronJobCycle
+from pydkron.graph import JobGraph
+
+
+def _tree():
+    return [
+        {"name": "load", "parent_job": "transform"},
+        {"name": "transform", "parent_job": "extract"},
+        {"name": "report", "parent_job": "extract"},
+        {"name": "extract", "dependent_jobs": ["transform", "report"]},
+        {"name": "backup"},
+    ]
+
+
+class GraphTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.graph
+    """
+    def setUp(self):
+        self.client = DkronClient(hosts=["localhost:8080"], max_workers=4)
+
+    def test_waves(self):
+        """
+        JobGraph: Test topological waves and relations
+        """
+        graph = JobGraph(_tree() + [{"name": "orphan", "parent_job": "elsewhere"}])
+        self.assertEqual(graph.waves(), [
+            ["backup", "extract", "orphan"], ["report", "transform"], ["load"]])
+        self.assertEqual(graph.descendants("extract"), set(["transform", "report", "load"]))
+        self.assertEqual(graph.ancestors("load"), set(["transform", "extract"]))
+
+    def test_cycle(self):
+        """
+        JobGraph: Test cycles are detected
+        """
+        graph = JobGraph([
+            {"name": "a", "parent_job": "c"},
+            {"name": "b", "parent_job": "a"},
+            {"name": "c", "parent_job": "b"},
+            {"name": "d"},
+        ])
+        with self.assertRaises(DkronJobCycle) as ctx:
+            graph.waves()
+        self.assertEqual(sorted(ctx.exception.names), ["a", "b", "c"])
+        self.assertIsInstance(ctx.exception, DkronClientException)
+
+    def test_save_job_tree(self):
+        """
+        DkronClient: Test save_job_tree saves parents first and skips children of failures
+        """
+        order = []
+        lock = threading.Lock()
+
+        def _save(request, context):
+            name = request.json()["name"]
+            with lock:
+                order.append(name)
+            context.status_code = 500 if name == "transform" else 201
+            return json.dumps(request.json())
+
+        with requests_mock.mock() as req:
+            req.post("http://localhost:8080/v1/jobs", text=_save)
+            result = self.client.save_job_tree(_tree())
+        self.assertEqual(sorted(order[:2]), ["backup", "extract"])
+        self.assertNotIn("load", order)
+        self.assertEqual(sorted(result.succeeded), ["backup", "extract", "report"])
+        self.assertEqual(sorted(result.failed), ["load", "transform"])
+
+    def test_delete_job_tree(self):
+        """
+        DkronClient: Test delete_job_tree deletes children first from job names
+        """
+        order = []
+        with requests_mock.mock() as req:
+            req.get("http://localhost:8080/v1/jobs", text=json.dumps(_tree()))
+            for job in _tree():
+                req.delete("http://localhost:8080/v1/jobs/%s" % job["name"],
+                           text=lambda request, context: order.append(
+                               request.path.rsplit("/", 1)[1]) or "{}")
+            result = self.client.delete_job_tree(["extract", "transform", "load", "report"])
+        self.assertTrue(result.ok)
+        self.assertEqual(order[0], "load")
+        self.assertEqual(order[-1], "extract")
@@ -0,0 +1,84 @@
+"""
+pydkron.hosts test functions
+"""
+import time
+import unittest
+
+import requests.exceptions
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.hosts import HostPool, ROUND_ROBIN
+
+
+class HostPoolTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.hosts.HostPool
+    """
+    def test_least_latency(self):
+        """
+        HostPool: Test the fastest healthy host is preferred
+        """
+        pool = HostPool(["a", "b", "c"])
+        pool.record_success("a", 0.3)
+        pool.record_success("b", 0.1)
+        pool.record_success("c", 0.2)
+        self.assertEqual(pool.order(), ["b", "c", "a"])
+
+    def test_round_robin(self):
+        """
+        HostPool: Test round robin rotates the first host
+        """
+        pool = HostPool(["a", "b", "c"], strategy=ROUND_ROBIN)
+        got = [pool.order()[0] for _ in range(4)]
+        self.assertEqual(got, ["a", "b", "c", "a"])
+
+    def test_invalid_strategy(self):
+        """
+        HostPool: Test an unknown strategy raises ValueError
+        """
+        self.assertRaises(ValueError, HostPool, ["a"], strategy="fastest")
+
+    def test_circuit_breaker(self):
+        """
+        HostPool: Test failing hosts are ejected then probed once half-open
+        """
+        pool = HostPool(["a", "b"], failure_threshold=2, reset_timeout=0.05)
+        pool.record_success("a", 0.1)
+        pool.record_success("b", 0.2)
+        pool.record_failure("a")
+        self.assertEqual(pool.order(), ["a", "b"])
+        pool.record_failure("a")
+        self.assertEqual(pool.order(), ["b", "a"])
+        time.sleep(0.06)
+        self.assertEqual(pool.order(), ["a", "b"], "Exp the half-open probe first")
+        self.assertEqual(pool.order(), ["b", "a"], "Exp a single probe")
+        pool.record_failure("a")
+        self.assertEqual(pool.order(), ["b", "a"])
+        time.sleep(0.06)
+        pool.order()
+        pool.record_success("a", 0.05)
+        self.assertEqual(pool.order(), ["a", "b"])
+        self.assertEqual(pool.snapshot()[0]["circuit"], "closed")
+
+
+class DkronClientHostsTestCase(unittest.TestCase):
+    """
+    Test cases for the DkronClient host selection
+    """
+    def test_dead_host_ejected(self):
+        """
+        DkronClient: Test a dead host is skipped once its circuit opens
+        """
+        client = DkronClient(hosts=["dead:8080", "localhost:8080"], host_strategy=ROUND_ROBIN)
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(requests_mock.GET, "http://localhost:8080/v1/", text="{}")
+            mocker.register_uri(
+                requests_mock.GET, "http://dead:8080/v1/",
+                exc=requests.exceptions.ConnectTimeout)
+            for _ in range(10):
+                client.status()
+            dead = [req for req in mocker.request_history if req.hostname == "dead"]
+        self.assertEqual(client.host_pool.snapshot()[0]["circuit"], "open")
+        self.assertEqual(mocker.call_count, 10 + len(dead))
+        self.assertTrue(len(dead) <= 3, "Dead host tried %d times" % len(dead))
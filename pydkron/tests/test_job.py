@@ -1,13 +1,15 @@
 """
 campfire.lib.archiver test functions
 """
+import copy
 import unittest
 import json
 import os
+import pickle
 
 import requests_mock
 
-from pydkron.job import DkronJob
+from pydkron.job import DkronJob, CompactJob
 from pydkron.client import DkronClient
 
 
@@ -123,3 +125,100 @@ class DkronJobTestCase(unittest.TestCase):
                 got,
                 "Exp: '%s', Got: '%s'" % (exp, got)
             )
+
+    def test_copy(self):
+        """
+        DkronJob: Test copying a job and reading unset private attributes, like CompactJob
+        """
+        job = DkronJob(self.client, name="job1", tags={"role": "dkron:1"})
+        copied = copy.copy(job)
+        self.assertEqual(copied, job)
+        self.assertIs(copied._client, self.client)
+        for item in (job, CompactJob.from_job(job)):
+            self.assertFalse(hasattr(item, "_cluster"))
+            with self.assertRaises(AttributeError):
+                _ = item._cluster
+
+
+class CompactJobTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.job.CompactJob
+    """
+    def setUp(self):
+        self.client = DkronClient(hosts=["localhost:8080"])
+        self.data = {
+            "name": "job1",
+            "schedule": "@every 5m",
+            "success_count": 3,
+            "tags": {"role": "dkron:1"},
+            "displayname": "Job 1",
+        }
+
+    def test_fields(self):
+        """
+        CompactJob: Test field access and validation
+        """
+        job = CompactJob.from_dict(self.data, self.client)
+        self.assertEqual(job.schedule, "@every 5m")
+        self.assertEqual(job["displayname"], "Job 1")
+        job.schedule = "@every 1m"
+        self.assertEqual(job.schedule, "@every 1m")
+        with self.assertRaises(AttributeError):
+            _ = job.command
+        self.assertFalse(hasattr(job, "_cluster"))
+        self.assertIsNone(job.get("command"))
+        with self.assertRaises(KeyError):
+            _ = job["command"]
+        with self.assertRaises(KeyError):
+            _ = job.awesome
+        with self.assertRaises(KeyError):
+            job.awesome = True
+        with self.assertRaises(KeyError):
+            job.success_count = 1000
+        self.assertFalse(hasattr(job, "__dict__"))
+
+    def test_conversion(self):
+        """
+        CompactJob: Test lossless conversion to and from DkronJob
+        """
+        job = DkronJob.from_dict(self.data, self.client)
+        compact = CompactJob.from_job(job)
+        self.assertEqual(compact.to_dict(), self.data)
+        self.assertEqual(compact, job)
+        back = compact.to_job()
+        self.assertEqual(back, job)
+        self.assertIs(back._client, self.client)
+        self.assertEqual(json.loads(compact.marshal()), self.data)
+
+    def test_copy_and_pickle(self):
+        """
+        CompactJob: Test copying and pickling keep the fields and private attributes
+        """
+        job = CompactJob.from_dict(dict(self.data, extra_field=1), self.client)
+        job._cluster = "eu"
+        copied = copy.copy(job)
+        self.assertEqual(copied, job)
+        self.assertEqual(copied.success_count, 3)
+        self.assertEqual(copied._cluster, "eu")
+        self.assertIs(copied._client, self.client)
+        job = CompactJob.from_dict(self.data, None)
+        loaded = pickle.loads(pickle.dumps(job))
+        self.assertEqual(loaded.to_dict(), self.data)
+        self.assertIsNone(loaded._client)
+        self.assertFalse(hasattr(loaded, "_cluster"))
+        self.assertEqual(copy.deepcopy(job), job)
+
+    def test_save(self):
+        """
+        CompactJob: Test saving job
+        """
+        job = CompactJob(self.client, name="job1")
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.POST,
+                "http://localhost:8080/v1/jobs",
+                text=job.marshal(),
+                status_code=201,
+            )
+            got = job.save()
+        self.assertEqual(got, {"name": "job1"}, "Got: '%s'" % got)
@@ -0,0 +1,100 @@
+"""
+DkronClient leader routing test functions
+"""
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.hosts import ROUND_ROBIN
+
+HOSTS = ["node1:8080", "node2:8080", "node3:8080"]
+
+
+class FakeCluster(object):
+    """
+    requests_mock stub of a three node cluster with a movable leader
+    """
+    def __init__(self, mocker, leader):
+        self.leader = leader
+        for host in HOSTS:
+            mocker.register_uri(
+                requests_mock.GET, "http://%s/v1/isleader" % host,
+                text=self._is_leader(host))
+            mocker.register_uri(
+                requests_mock.POST, "http://%s/v1/jobs/job1" % host,
+                text=self._write(host))
+            mocker.register_uri(requests_mock.GET, "http://%s/v1/" % host, text="{}")
+        self.mocker = mocker
+
+    def _is_leader(self, host):
+        def reply(request, context):
+            context.status_code = 200 if host == self.leader else 404
+            return "{}"
+        return reply
+
+    def _write(self, host):
+        def reply(request, context):
+            # the old leader is stepping down and can not serve writes
+            context.status_code = 200 if host == self.leader else 503
+            return "{}"
+        return reply
+
+    def hits(self, method, path):
+        return [
+            "%s:%d" % (req.hostname, req.port)
+            for req in self.mocker.request_history
+            if req.method == method and req.path == path
+        ]
+
+
+class DkronClientLeaderTestCase(unittest.TestCase):
+    """
+    Test cases for the DkronClient leader routing
+    """
+    def setUp(self):
+        self.client = DkronClient(
+            hosts=list(HOSTS), leader_routing=True, host_strategy=ROUND_ROBIN)
+
+    def test_writes_to_leader(self):
+        """
+        DkronClient: Test writes go to the leader and reads to the followers
+        """
+        with requests_mock.Mocker() as mocker:
+            cluster = FakeCluster(mocker, "node2:8080")
+            for _ in range(4):
+                self.client.run_job("job1")
+                self.client.status()
+            self.assertEqual(set(cluster.hits("POST", "/v1/jobs/job1")), {"node2:8080"})
+            self.assertNotIn("node2:8080", cluster.hits("GET", "/v1/"))
+            self.assertTrue(len(cluster.hits("GET", "/v1/isleader")) <= 3)
+
+    def test_leader_change(self):
+        """
+        DkronClient: Test a leader change is detected on the next write error
+        """
+        with requests_mock.Mocker() as mocker:
+            cluster = FakeCluster(mocker, "node1:8080")
+            self.client.run_job("job1")
+            self.assertEqual(self.client.leader(), "node1:8080")
+            cluster.leader = "node3:8080"
+            self.client.run_job("job1")
+            self.assertIsNone(self.client._leader)
+            self.client.run_job("job1")
+            self.assertEqual(self.client.leader(), "node3:8080")
+            self.assertEqual(cluster.hits("POST", "/v1/jobs/job1")[-1], "node3:8080")
+
+    def test_no_leader(self):
+        """
+        DkronClient: Test requests still fail over when no leader is found
+        """
+        client = DkronClient(hosts=["localhost:8080"], leader_routing=True)
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/isleader", status_code=404)
+            mocker.register_uri(
+                requests_mock.POST, "http://localhost:8080/v1/jobs/job1", text="{}")
+            client.run_job("job1")
+            client.run_job("job1")
+            self.assertIsNone(client.leader())
+            self.assertEqual(mocker.call_count, 3)
@@ -0,0 +1,69 @@
+"""
+pydkron.metrics test functions
+"""
+import unittest
+
+import requests.exceptions
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.hosts import ROUND_ROBIN
+from pydkron.metrics import ClientMetrics, Histogram, endpoint_label
+
+
+class MetricsTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.metrics
+    """
+    def test_endpoint_label(self):
+        """
+        endpoint_label: Test job names and query strings are collapsed
+        """
+        self.assertEqual(endpoint_label("get", "/jobs"), "GET /jobs")
+        self.assertEqual(
+            endpoint_label("get", "/jobs/job1/executions/?_order=DESC"),
+            "GET /jobs/:name/executions/")
+        self.assertEqual(endpoint_label("post", "/jobs/job1/toggle"), "POST /jobs/:name/toggle")
+
+    def test_histogram(self):
+        """
+        Histogram: Test buckets and percentiles
+        """
+        hist = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.05, 0.5, 5.0):
+            hist.observe(value)
+        self.assertEqual(hist.percentile(50), 0.1)
+        self.assertEqual(hist.percentile(75), 1.0)
+        self.assertEqual(hist.percentile(100), float("inf"))
+        self.assertEqual(hist.snapshot()["buckets"], [(0.1, 2), (1.0, 3), (float("inf"), 4)])
+        self.assertIsNone(Histogram().percentile(99))
+
+    def test_client_metrics(self):
+        """
+        DkronClient: Test requests, failovers, statuses and hooks are recorded
+        """
+        metrics = ClientMetrics()
+        events = []
+        metrics.add_hook(events.append)
+        client = DkronClient(
+            hosts=["dead:8080", "localhost:8080"], metrics=metrics, host_strategy=ROUND_ROBIN)
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs/job1",
+                text='{"name": "job1"}', headers={"Content-Length": "16"})
+            mocker.register_uri(
+                requests_mock.GET, "http://dead:8080/v1/jobs/job1",
+                exc=requests.exceptions.ConnectionError)
+            client.get_job("job1")
+            client.get_job("job1")
+        got = metrics.snapshot()
+        self.assertEqual(got["requests"], 3)
+        self.assertEqual(got["failovers"], 1)
+        self.assertEqual(got["statuses"], {200: 2})
+        self.assertEqual(got["errors"], {"dead:8080": 1})
+        self.assertEqual(got["bytes_received"], 32)
+        self.assertEqual(got["endpoints"]["GET /jobs/:name"]["count"], 3)
+        self.assertEqual(got["hosts"]["localhost:8080"]["count"], 2)
+        self.assertEqual(len(events), 3)
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()["requests"], 0)
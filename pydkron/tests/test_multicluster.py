@@ -0,0 +1,118 @@
+"""
+pydkron.multicluster test functions
+"""
+import json
+import unittest
+
+import requests
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.exceptions import DkronClientException, DkronJobNotFound
+from pydkron.job import CompactJob, DkronJob
+from pydkron.multicluster import MultiClusterClient
+
+EU = "http://eu:8080/v1"
+US = "http://us:8080/v1"
+
+
+class MultiClusterTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.multicluster
+    """
+    def setUp(self):
+        self.client = MultiClusterClient(
+            {"eu": ["eu:8080"], "us": DkronClient(hosts=["us:8080"])},
+            shard_by="region", default="eu")
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_jobs(self):
+        """
+        MultiClusterClient: Test jobs are merged and labelled with their cluster
+        """
+        with requests_mock.mock() as req:
+            req.get(EU + "/jobs", text=json.dumps([{"name": "job1"}]))
+            req.get(US + "/jobs", text=json.dumps([{"name": "job2"}, {"name": "job3"}]))
+            req.get(EU + "/", text=json.dumps({"agent": {"name": "eu1"}}))
+            req.get(US + "/", text=json.dumps({"agent": {"name": "us1"}}))
+            jobs = self.client.jobs()
+            self.assertTrue(jobs.complete)
+            self.assertEqual([(job["name"], job._cluster) for job in jobs],
+                             [("job1", "eu"), ("job2", "us"), ("job3", "us")])
+            self.assertIs(jobs[1]._client, self.client.clients["us"])
+            self.assertEqual(self.client.status()["us"]["agent"]["name"], "us1")
+
+    def test_partial_outage(self):
+        """
+        MultiClusterClient: Test reads return the clusters that answered
+        """
+        with requests_mock.mock() as req:
+            req.get(EU + "/jobs", text=json.dumps([{"name": "job1"}]))
+            req.get(US + "/jobs", exc=requests.exceptions.ConnectTimeout)
+            jobs = self.client.jobs()
+            self.assertEqual([job["name"] for job in jobs], ["job1"])
+            self.assertEqual(list(jobs.errors), ["us"])
+            self.assertFalse(jobs.complete)
+            req.get(EU + "/jobs", exc=requests.exceptions.ConnectTimeout)
+            with self.assertRaises(DkronClientException):
+                self.client.jobs()
+            req.get(EU + "/jobs/job9", status_code=404, text="{}")
+            with self.assertRaises(DkronClientException):
+                self.client.get_job("job9")
+
+    def test_routing(self):
+        """
+        MultiClusterClient: Test writes follow the label, the shard tag then the default
+        """
+        with requests_mock.mock() as req:
+            req.post(EU + "/jobs", status_code=201, text="{}")
+            req.post(US + "/jobs", status_code=201, text="{}")
+            us_job = DkronJob(None, name="job1", tags={"region": "us"})
+            self.client.save_job(us_job)
+            self.assertEqual(us_job._cluster, "us")
+            self.client.save_job({"name": "job2"})
+            labelled = DkronJob(None, name="job3", tags={"region": "us"})
+            labelled._cluster = "eu"
+            self.client.save_job(labelled)
+            self.assertEqual([request.netloc for request in req.request_history],
+                             ["us:8080", "eu:8080", "eu:8080"])
+        with self.assertRaises(DkronClientException):
+            self.client.save_job({"name": "job4", "tags": {"region": "ap"}})
+        sharded = MultiClusterClient({"eu": ["eu:8080"]}, shard_by=lambda job: None)
+        with self.assertRaises(DkronClientException):
+            sharded.cluster_for({"name": "job5"})
+
+    def test_compact_jobs(self):
+        """
+        MultiClusterClient: Test CompactJob is routed and labelled like DkronJob
+        """
+        job = CompactJob(None, name="job1", tags={"region": "us"})
+        self.assertEqual(self.client.cluster_for(job), "us")
+        self.assertEqual(self.client.cluster_for(CompactJob(None, name="job2")), "eu")
+        with requests_mock.mock() as req:
+            req.post(US + "/jobs", status_code=201, text="{}")
+            self.client.save_job(job)
+            self.assertEqual(req.last_request.netloc, "us:8080")
+        self.assertEqual(job._cluster, "us")
+        job._cluster = "eu"
+        self.assertEqual(self.client.cluster_for(job), "eu")
+
+    def test_locate(self):
+        """
+        MultiClusterClient: Test run_job and delete_job by name find the job's cluster
+        """
+        with requests_mock.mock() as req:
+            req.get(EU + "/jobs/job1", status_code=404, text="{}")
+            req.get(US + "/jobs/job1", text=json.dumps({"name": "job1"}))
+            req.post(US + "/jobs/job1", text="{}")
+            req.delete(US + "/jobs/job1", text="{}")
+            req.get(EU + "/jobs/job2", status_code=404, text="{}")
+            req.get(US + "/jobs/job2", status_code=404, text="{}")
+            self.assertEqual(self.client.get_job("job1")._cluster, "us")
+            self.client.run_job("job1")
+            self.client.delete_job("job1", cluster="us")
+            with self.assertRaises(DkronJobNotFound):
+                self.client.run_job("job2")
+            self.assertEqual(req.request_history[-3].method, "DELETE")
@@ -0,0 +1,174 @@
+"""
+pydkron.ratelimit and pydkron.singleflight test functions
+"""
+import json
+import threading
+import time
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.exceptions import DkronClientException
+from pydkron.metrics import ClientMetrics
+from pydkron.ratelimit import RateLimiter, TokenBucket
+from pydkron.retry import RetryPolicy
+from pydkron.singleflight import SingleFlight
+
+
+def _wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise AssertionError("Condition not met")
+        time.sleep(0.005)
+
+
+class RateLimitTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.ratelimit
+    """
+    def test_token_bucket(self):
+        """
+        TokenBucket: Test burst, refill and timeout
+        """
+        bucket = TokenBucket(rate=20, burst=2)
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.assertIsNone(bucket.acquire(timeout=0.01))
+        start = time.monotonic()
+        self.assertGreater(bucket.acquire(), 0)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    def test_rate_limiter_hosts(self):
+        """
+        RateLimiter: Test per host buckets are independent
+        """
+        limiter = RateLimiter(host_rate=1, host_burst=1)
+        self.assertEqual(limiter.acquire("host1"), 0)
+        self.assertEqual(limiter.acquire("host2"), 0)
+        self.assertIsNone(limiter.acquire("host1", timeout=0.01))
+        self.assertIsNone(RateLimiter().host_bucket("host1"))
+
+    def test_rate_limiter_timeout(self):
+        """
+        RateLimiter: Test a timed out acquire keeps or gives back the tokens of both buckets
+        """
+        limiter = RateLimiter(rate=1, burst=2, host_rate=1, host_burst=1)
+        self.assertEqual(limiter.acquire("host1"), 0)
+        self.assertIsNone(limiter.acquire("host1", timeout=0.01))
+        self.assertTrue(limiter.bucket.try_acquire())
+        self.assertFalse(limiter.bucket.try_acquire())
+        self.assertIsNone(limiter.acquire("host2", timeout=0.01))
+        self.assertTrue(limiter.host_bucket("host2").try_acquire())
+
+    def test_client_rate_limit(self):
+        """
+        DkronClient: Test requests wait for the rate limit and fail past the deadline
+        """
+        metrics = ClientMetrics()
+        client = DkronClient(hosts=["localhost:8080"], rate_limit=RateLimiter(rate=20, burst=1),
+                             metrics=metrics)
+        with requests_mock.mock() as req:
+            req.get("http://localhost:8080/v1/", text="{}")
+            start = time.monotonic()
+            for _ in range(3):
+                client.status()
+            self.assertGreaterEqual(time.monotonic() - start, 0.08)
+            self.assertEqual(metrics.snapshot()["throttled"], 2)
+            client = DkronClient(hosts=["localhost:8080"], rate_limit=0.5,
+                                 retry=RetryPolicy(deadline=0.1))
+            client.status()
+            with self.assertRaises(DkronClientException):
+                client.status()
+
+    def test_leader_probe_rate_limit(self):
+        """
+        DkronClient: Test leader probes wait for the rate limit and are recorded
+        """
+        metrics = ClientMetrics()
+        client = DkronClient(hosts=["localhost:8080"], rate_limit=RateLimiter(rate=20, burst=1),
+                             metrics=metrics, leader_routing=True)
+        with requests_mock.mock() as req:
+            req.get("http://localhost:8080/v1/isleader", text='"I am a leader"')
+            for _ in range(3):
+                self.assertEqual(client.leader(refresh=True), "localhost:8080")
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["throttled"], 2)
+        self.assertEqual(snapshot["endpoints"]["GET /isleader"]["count"], 3)
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.singleflight
+    """
+    def test_do(self):
+        """
+        SingleFlight: Test concurrent callers share one call and its errors
+        """
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def _slow(value):
+            calls.append(value)
+            release.wait(5)
+            if value == "error":
+                raise ValueError(value)
+            return value
+
+        def _caller(value):
+            try:
+                results.append(flights.do(value, _slow, value))
+            except ValueError as exc:
+                results.append(exc)
+
+        threads = [threading.Thread(target=_caller, args=("a",)) for _ in range(3)]
+        threads += [threading.Thread(target=_caller, args=("error",)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: flights.in_flight() == 2 and all(
+            flight.callers > 1 for flight in flights._flights.values()))
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(calls), ["a", "error"])
+        shared = [result for result in results if isinstance(result, tuple)]
+        self.assertEqual(sorted(shared), [("a", False), ("a", True), ("a", True)])
+        self.assertEqual(len([result for result in results if isinstance(result, ValueError)]), 2)
+        self.assertEqual(flights.in_flight(), 0)
+        self.assertEqual(flights.do("b", lambda: 1), (1, False))
+
+    def test_client_coalesce(self):
+        """
+        DkronClient: Test identical concurrent get_job calls share one request
+        """
+        metrics = ClientMetrics()
+        client = DkronClient(hosts=["localhost:8080"], coalesce=True, metrics=metrics)
+        release = threading.Event()
+        jobs = []
+
+        def _job(request, context):
+            release.wait(5)
+            return json.dumps({"name": "job1"})
+
+        with requests_mock.mock() as req:
+            req.get("http://localhost:8080/v1/jobs/job1", text=_job)
+            threads = [
+                threading.Thread(target=lambda: jobs.append(client.get_job("job1")))
+                for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            _wait_for(lambda: client._flights.in_flight() == 1 and list(
+                client._flights._flights.values())[0].callers == 4)
+            release.set()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(req.call_count, 1)
+        self.assertEqual(len(jobs), 4)
+        self.assertEqual(len(set(id(job) for job in jobs)), 4)
+        self.assertEqual(metrics.snapshot()["coalesced"], 3)
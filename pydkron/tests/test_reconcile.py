@@ -0,0 +1,101 @@
+"""
+pydkron.reconcile test functions
+"""
+import json
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.job import DkronJob
+from pydkron.reconcile import diff_job, plan
+
+
+LIVE = [
+    {
+        "name": "job1",
+        "schedule": "@every 5m",
+        "command": "cmd1",
+        "success_count": 10,
+        "displayname": "",
+    },
+    {
+        "name": "job2",
+        "schedule": "@every 5m",
+        "command": "cmd2",
+    },
+    {
+        "name": "job3",
+        "schedule": "@every 1h",
+        "command": "cmd3",
+    },
+]
+
+
+class ReconcileTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.reconcile
+    """
+    def setUp(self):
+        self.client = DkronClient(hosts=["localhost:8080"])
+
+    def test_diff_job_ignores_read_only(self):
+        """
+        reconcile: Test diff_job only compares writable desired fields
+        """
+        desired = DkronJob(None, name="job1", schedule="@every 5m", success_count=0)
+        self.assertEqual(diff_job(desired, LIVE[0]), {})
+        desired["command"] = "new"
+        got = diff_job(desired, LIVE[0])
+        self.assertEqual(got, {"command": ("cmd1", "new")}, "Got: '%s'" % got)
+
+    def test_plan(self):
+        """
+        reconcile: Test plan creates, updates, prunes and skips unchanged jobs
+        """
+        desired = [
+            {"name": "job1", "command": "cmd1"},
+            {"name": "job2", "command": "changed"},
+            {"name": "job4", "command": "cmd4"},
+        ]
+        got = plan(desired, LIVE, prune=True)
+        self.assertEqual([job["name"] for job in got.create], ["job4"])
+        self.assertEqual([job["name"] for job in got.update], ["job2"])
+        self.assertEqual(got.unchanged, ["job1"])
+        self.assertEqual(got.delete, ["job3"])
+        self.assertIn("~ job2", str(got))
+        self.assertEqual(plan(desired, LIVE).delete, [])
+
+    def test_reconcile_steady_state(self):
+        """
+        DkronClient: Test reconcile makes no writes when nothing changed
+        """
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs", text=json.dumps(LIVE))
+            got = self.client.reconcile(
+                [{"name": job["name"], "command": job["command"]} for job in LIVE])
+            self.assertTrue(got.empty)
+            self.assertEqual(mocker.call_count, 1)
+
+    def test_reconcile_apply(self):
+        """
+        DkronClient: Test reconcile saves changed jobs and honours dry_run
+        """
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs", text=json.dumps(LIVE))
+            mocker.register_uri(
+                requests_mock.POST, "http://localhost:8080/v1/jobs", text="{}", status_code=201)
+            mocker.register_uri(
+                requests_mock.DELETE, "http://localhost:8080/v1/jobs/job3", text="{}")
+            desired = [
+                {"name": "job1", "command": "changed"},
+                {"name": "job2", "command": "cmd2"},
+            ]
+            self.client.reconcile(desired, prune=True, dry_run=True)
+            self.assertEqual(mocker.call_count, 1)
+            got = self.client.reconcile(desired, prune=True)
+            self.assertEqual(list(got.saved.succeeded), ["job1"])
+            self.assertEqual(list(got.deleted.succeeded), ["job3"])
+            self.assertEqual(mocker.call_count, 4)
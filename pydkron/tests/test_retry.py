@@ -0,0 +1,177 @@
+"""
+pydkron.retry test functions
+"""
+import threading
+import time
+import unittest
+
+import requests.exceptions
+import requests_mock
+from six.moves import BaseHTTPServer, socketserver
+from urllib3.exceptions import NewConnectionError
+
+from pydkron.client import DkronClient, DkronClientException
+from pydkron.hosts import ROUND_ROBIN
+from pydkron.retry import RetryPolicy, not_sent
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.retry.RetryPolicy
+    """
+    def test_timeout(self):
+        """
+        RetryPolicy: Test separate timeouts capped by the deadline
+        """
+        policy = RetryPolicy(connect_timeout=1, read_timeout=5)
+        self.assertEqual(policy.timeout(), (1, 5))
+        self.assertEqual(policy.timeout(2), (1, 2))
+
+    def test_backoff(self):
+        """
+        RetryPolicy: Test jittered exponential backoff is capped
+        """
+        policy = RetryPolicy(backoff_base=0.1, backoff_max=0.3)
+        for _ in range(20):
+            self.assertTrue(0 <= policy.backoff(1) <= 0.1)
+            self.assertTrue(0 <= policy.backoff(5) <= 0.3)
+
+    def test_hedge_delay(self):
+        """
+        RetryPolicy: Test the hedge delay is the observed percentile
+        """
+        policy = RetryPolicy(hedge_min_samples=10)
+        self.assertIsNone(policy.hedge_delay())
+        for index in range(100):
+            policy.record_latency(index / 100.0)
+        self.assertEqual(policy.hedge_delay(), 0.95)
+
+    def test_not_sent(self):
+        """
+        not_sent: Test only connection failures count as not sent
+        """
+        refused = requests.exceptions.ConnectionError(
+            type("MaxRetryError", (object,), {"reason": NewConnectionError(None, "refused")})())
+        self.assertTrue(not_sent(requests.exceptions.ConnectTimeout()))
+        self.assertTrue(not_sent(refused))
+        self.assertFalse(not_sent(requests.exceptions.ReadTimeout()))
+        self.assertFalse(not_sent(requests.exceptions.ConnectionError()))
+
+
+class DkronClientRetryTestCase(unittest.TestCase):
+    """
+    Test cases for the DkronClient retries
+    """
+    def setUp(self):
+        self.hosts = ["node1:8080", "node2:8080"]
+
+    def _client(self, **kwargs):
+        return DkronClient(
+            hosts=list(self.hosts), host_strategy=ROUND_ROBIN, retry=RetryPolicy(**kwargs))
+
+    def test_retry_status(self):
+        """
+        DkronClient: Test GETs move on to another host on a retryable status
+        """
+        client = self._client(max_attempts=6, backoff_base=0.001)
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(requests_mock.GET, "http://node1:8080/v1/", status_code=503)
+            mocker.register_uri(
+                requests_mock.GET, "http://node2:8080/v1/",
+                [{"status_code": 503}, {"status_code": 503}, {"text": "{}"}])
+            self.assertEqual(client.status(), {})
+            self.assertEqual(mocker.call_count, 6)
+
+    def test_run_job_not_duplicated(self):
+        """
+        DkronClient: Test run_job is not retried once it may have been sent
+        """
+        client = self._client()
+        with requests_mock.Mocker() as mocker:
+            for host in self.hosts:
+                mocker.register_uri(
+                    requests_mock.POST, "http://%s/v1/jobs/job1" % host,
+                    exc=requests.exceptions.ReadTimeout)
+            self.assertRaises(DkronClientException, client.run_job, "job1")
+            self.assertEqual(mocker.call_count, 1)
+            mocker.register_uri(
+                requests_mock.POST, "http://node1:8080/v1/jobs/job1", status_code=503)
+            mocker.register_uri(
+                requests_mock.POST, "http://node2:8080/v1/jobs/job1", status_code=503)
+            client.host_pool = self._client().host_pool
+            self.assertEqual(client._call("post", "/jobs/job1").status_code, 503)
+            self.assertEqual(mocker.call_count, 2)
+
+    def test_connect_failure_retried(self):
+        """
+        DkronClient: Test run_job fails over when the request was never sent
+        """
+        client = self._client()
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.POST, "http://node1:8080/v1/jobs/job1",
+                exc=requests.exceptions.ConnectTimeout)
+            mocker.register_uri(
+                requests_mock.POST, "http://node2:8080/v1/jobs/job1", text="{}")
+            self.assertEqual(client.run_job("job1"), {})
+
+    def test_deadline(self):
+        """
+        DkronClient: Test the deadline bounds the retries
+        """
+        client = self._client(max_attempts=100, backoff_base=0.05, deadline=0.1)
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(requests_mock.GET, requests_mock.ANY, status_code=503)
+            start = time.time()
+            self.assertRaises(DkronClientException, client.status)
+            self.assertTrue(time.time() - start < 1)
+            self.assertTrue(mocker.call_count < 100)
+
+    def test_hedged_read(self):
+        """
+        DkronClient: Test a slow GET is hedged to the next host
+        """
+        release = threading.Event()
+        slow = _server(b'{"host": "slow"}', release)
+        fast = _server(b'{"host": "fast"}')
+        client = DkronClient(
+            hosts=[slow.host, fast.host], host_strategy=ROUND_ROBIN,
+            retry=RetryPolicy(hedge=True, hedge_min_samples=1))
+        client.retry.record_latency(0.01)
+        start = time.time()
+        got = client.status()
+        elapsed = time.time() - start
+        release.set()
+        client.close()
+        for server in (slow, fast):
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(got, {"host": "fast"})
+        self.assertTrue(elapsed < 1, "Hedged read took %.2fs" % elapsed)
+
+
+def _server(body, release=None):
+    """
+    Start a local HTTP server answering body, after release is set when given
+    """
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if release is not None:
+                release.wait(2)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+        daemon_threads = True
+
+    server = Server(("127.0.0.1", 0), Handler)
+    server.host = "127.0.0.1:%d" % server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
@@ -0,0 +1,98 @@
+"""
+pydkron.schedule test functions
+"""
+from datetime import datetime, timezone
+import unittest
+
+from pydkron import schedule
+from pydkron.schedule import load_histogram, next_runs, parse_duration, parse_schedule, peaks
+
+START = "2026-10-16T00:00:00Z"
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class ScheduleTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.schedule
+    """
+    def test_cron(self):
+        """
+        Schedule: Test cron fields, names, steps and day matching
+        """
+        self.assertEqual(next_runs("0 30 9 * * mon-fri", START, 2),
+                         [_utc(2026, 10, 16, 9, 30), _utc(2026, 10, 19, 9, 30)])
+        self.assertEqual(next_runs("*/20 0 0 * * *", START, 3),
+                         [_utc(2026, 10, 16, 0, 0, 20), _utc(2026, 10, 16, 0, 0, 40),
+                          _utc(2026, 10, 17, 0, 0, 0)])
+        self.assertEqual(next_runs("0 0 0 29 feb ?", START, 1), [_utc(2028, 2, 29)])
+        # day of month or day of week when both are restricted
+        self.assertEqual(next_runs("0 0 0 20 * 6", START, 2),
+                         [_utc(2026, 10, 17), _utc(2026, 10, 20)])
+        self.assertEqual(next_runs("0 0 12 * *", START, 1), [_utc(2026, 10, 16, 12)])
+        self.assertEqual(parse_schedule("@daily").next(START), _utc(2026, 10, 17))
+        self.assertEqual(next_runs("CRON_TZ=Europe/Paris 0 0 9 * * *", START, 1),
+                         [_utc(2026, 10, 16, 7)])
+        self.assertEqual(next_runs("0 0 0 31 2 *", START, 1), [])
+        for invalid in ("* * *", "61 * * * * *", "0 0 0 * * xyz", "@fortnightly", "*/0 * * * * *"):
+            with self.assertRaises(ValueError):
+                parse_schedule(invalid)
+
+    def test_descriptors(self):
+        """
+        Schedule: Test @every, @at and @manually
+        """
+        self.assertEqual(parse_duration("1h30m"), 5400)
+        self.assertEqual(parse_duration("1.5s"), 1.5)
+        with self.assertRaises(ValueError):
+            parse_duration("5 minutes")
+        self.assertEqual(next_runs("@every 1h30m", START, 2),
+                         [_utc(2026, 10, 16, 1, 30), _utc(2026, 10, 16, 3)])
+        self.assertEqual(next_runs("@at 2026-12-01T00:00:00Z", START, 3), [_utc(2026, 12, 1)])
+        self.assertEqual(next_runs("@at 2026-01-01T00:00:00Z", START, 3), [])
+        self.assertEqual(next_runs("@manually", START), [])
+        self.assertEqual(next_runs("", START), [])
+        self.assertIs(parse_schedule("@every 1m"), parse_schedule("@every 1m"))
+
+    def test_load_histogram(self):
+        """
+        Schedule: Test load histogram weights shared schedules and skips disabled jobs
+        """
+        jobs = [
+            {"name": "a", "schedule": "@hourly"},
+            {"name": "b", "schedule": "@hourly"},
+            {"name": "c", "schedule": "0 */30 * * * *"},
+            {"name": "d", "schedule": "@hourly", "disabled": True},
+            {"name": "e", "schedule": "@every 20m"},
+            {"name": "f", "schedule": "@manually"},
+        ]
+        counts, invalid = load_histogram(jobs, START, "2026-10-16T02:00:00Z", resolution=600)
+        self.assertEqual([int(count) for count in counts], [3, 0, 1, 1, 1, 0, 4, 0, 1, 1, 1, 0])
+        self.assertEqual(invalid, [])
+        self.assertEqual(peaks(counts, START, 600, top=2),
+                         [(_utc(2026, 10, 16, 1), 4), (_utc(2026, 10, 16, 0), 3)])
+        numpy, schedule.numpy = schedule.numpy, None
+        try:
+            self.assertEqual(
+                load_histogram(jobs, START, "2026-10-16T02:00:00Z", resolution=600),
+                ([int(count) for count in counts], []))
+        finally:
+            schedule.numpy = numpy
+
+    def test_load_histogram_invalid(self):
+        """
+        Schedule: Test load histogram skips and returns the jobs it cannot parse
+        """
+        jobs = [
+            {"name": "a", "schedule": "@hourly"},
+            {"name": "b", "schedule": "@fortnightly"},
+            {"name": "c", "schedule": "0 61 * * * *"},
+            {"name": "d", "schedule": "@hourly", "timezone": "Mars/Olympus_Mons"},
+            {"name": "e", "schedule": "@fortnightly"},
+            {"name": "f", "schedule": "0 30 * * * *"},
+        ]
+        counts, invalid = load_histogram(jobs, START, "2026-10-16T01:00:00Z", resolution=1800)
+        self.assertEqual([int(count) for count in counts], [1, 1])
+        self.assertEqual(sorted(job["name"] for job in invalid), ["b", "c", "d", "e"])
@@ -0,0 +1,100 @@
+"""
+pydkron.snapshot test functions
+"""
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.exceptions import DkronClientException
+from pydkron.job import CompactJob
+from pydkron.snapshot import export_snapshot, load_snapshot, read_header, SNAPSHOT_VERSION
+
+
+def _jobs():
+    return [
+        {"name": "child", "parent_job": "parent", "command": "echo child"},
+        {"name": "parent", "schedule": "@every 1m", "tags": {"role": "web:1"},
+         "dependent_jobs": ["child"]},
+        {"name": "other", "schedule": "@daily", "disabled": False, "timezone": "UTC",
+         "owner": None, "processors": None},
+    ]
+
+
+class SnapshotTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.snapshot
+    """
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.client = DkronClient(hosts=["localhost:8080"])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def test_round_trip(self):
+        """
+        Snapshot: Test plain and gzip round trips keep every field, parents first
+        """
+        for name in ("jobs.ndjson", "jobs.ndjson.gz"):
+            path = self._path(name)
+            self.assertEqual(export_snapshot(_jobs(), path), 3)
+            jobs = load_snapshot(path)
+            self.assertEqual([job["name"] for job in jobs], ["other", "parent", "child"])
+            self.assertEqual(sorted(jobs, key=lambda job: job["name"]),
+                             sorted(_jobs(), key=lambda job: job["name"]))
+            self.assertNotIn("owner", jobs[1])
+            self.assertIsNone(jobs[0]["owner"])
+            self.assertEqual(read_header(path)["version"], SNAPSHOT_VERSION)
+            self.assertFalse(os.path.exists(path + ".tmp"))
+        with gzip.open(self._path("jobs.ndjson.gz"), "rb") as source:
+            self.assertEqual(len(source.read().splitlines()), 4)
+
+    def test_versioned_fields(self):
+        """
+        Snapshot: Test loading a snapshot written with other job fields
+        """
+        path = self._path("old.ndjson")
+        with open(path, "w") as output:
+            output.write(json.dumps({"version": 1, "fields": ["schedule", "name", "gone"]}) + "\n")
+            output.write(json.dumps(["@hourly", "job1", "x"]) + "\n")
+        jobs = load_snapshot(path, job_class=CompactJob)
+        self.assertEqual(jobs[0].to_dict(), {"name": "job1", "schedule": "@hourly", "gone": "x"})
+        with open(path, "w") as output:
+            output.write(json.dumps({"version": SNAPSHOT_VERSION + 1, "fields": []}) + "\n")
+        with self.assertRaises(DkronClientException):
+            load_snapshot(path)
+        open(path, "w").close()
+        with self.assertRaises(DkronClientException):
+            load_snapshot(path)
+
+    def test_client_export_restore(self):
+        """
+        DkronClient: Test export_snapshot and restore_snapshot in chunks
+        """
+        path = self._path("jobs.ndjson")
+        saved = []
+
+        def _save(request, context):
+            saved.append(request.json()["name"])
+            context.status_code = 201
+            return json.dumps(request.json())
+
+        with requests_mock.mock() as req:
+            req.get("http://localhost:8080/v1/jobs", text=json.dumps(_jobs()))
+            req.post("http://localhost:8080/v1/jobs", text=_save)
+            self.assertEqual(self.client.export_snapshot(path), 3)
+            jobs = list(self.client.load_snapshot(path))
+            self.assertIs(jobs[0]._client, self.client)
+            self.assertEqual(req.call_count, 1)
+            result = self.client.restore_snapshot(path, chunk_size=2, max_workers=1)
+        self.assertTrue(result.ok)
+        self.assertEqual(saved, ["other", "parent", "child"])
@@ -0,0 +1,92 @@
+"""
+pydkron.stream test functions
+"""
+import json
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient, DkronJobNotFound
+from pydkron.stream import iter_json_array
+
+
+def _chunks(text, size):
+    data = text.encode("utf-8")
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+class IterJsonArrayTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.stream.iter_json_array
+    """
+    def test_chunk_boundaries(self):
+        """
+        iter_json_array: Test elements split across every chunk size
+        """
+        exp = [{"name": "jöb", "tags": {"a": [1, 2]}}, 12345, "x, ]", True, None, [], 1.5]
+        text = " [ %s ] " % ", ".join(json.dumps(item) for item in exp)
+        for size in (1, 2, 3, 7, 64):
+            got = list(iter_json_array(_chunks(text, size)))
+            self.assertEqual(got, exp, "Chunk size %d, Got: '%s'" % (size, got))
+
+    def test_empty_and_null(self):
+        """
+        iter_json_array: Test empty arrays and null bodies
+        """
+        self.assertEqual(list(iter_json_array([b"[", b"]"])), [])
+        self.assertEqual(list(iter_json_array([b"null"])), [])
+
+    def test_split_start(self):
+        """
+        iter_json_array: Test a null body, [ and leading whitespace split across chunks
+        """
+        for chunks in ([b"nu", b"ll"], [b" n", b"ull"], [b"n", b"u", b"l", b"l"],
+                       [b" ", b"\n", b"null", b" "]):
+            self.assertEqual(list(iter_json_array(chunks)), [], chunks)
+        for chunks in ([b" ", b"[", b"1", b"]"], [b"\r\n ", b" [1", b"]"]):
+            self.assertEqual(list(iter_json_array(chunks)), [1], chunks)
+        self.assertRaises(ValueError, list, iter_json_array([b"nu"]))
+        self.assertRaises(ValueError, list, iter_json_array([b" ", b" "]))
+        self.assertRaises(ValueError, list, iter_json_array([b"nu", b"ts"]))
+
+    def test_invalid(self):
+        """
+        iter_json_array: Test non arrays and truncated arrays raise ValueError
+        """
+        self.assertRaises(ValueError, list, iter_json_array([b'{"a": 1}']))
+        self.assertRaises(ValueError, list, iter_json_array([b'[{"a": 1}, {"b"']))
+        self.assertRaises(ValueError, list, iter_json_array([b'[1, 2']))
+
+
+class DkronClientStreamTestCase(unittest.TestCase):
+    """
+    Test cases for the DkronClient streaming generators
+    """
+    def setUp(self):
+        self.client = DkronClient(hosts=["localhost:8080"])
+
+    def test_iter_jobs(self):
+        """
+        DkronClient: Test iter_jobs
+        """
+        data = [{"name": "job%d" % index} for index in range(100)]
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs", text=json.dumps(data))
+            got = [job.name for job in self.client.iter_jobs(chunk_size=10)]
+        self.assertEqual(got, [job["name"] for job in data])
+
+    def test_iter_executions(self):
+        """
+        DkronClient: Test iter_executions and DkronJobNotFound
+        """
+        data = [{"job_name": "job1", "success": True}]
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs/job1/executions/",
+                text=json.dumps(data))
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs/job2/executions/",
+                status_code=404)
+            self.assertEqual(list(self.client.iter_executions("job1")), data)
+            self.assertRaises(DkronJobNotFound, list, self.client.iter_executions("job2"))
@@ -0,0 +1,126 @@
+"""
+pydkron.watch test functions
+"""
+import json
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.job import DkronJob
+from pydkron.watch import (
+    JobWatcher, diff_snapshots, ADDED, REMOVED, MODIFIED, SUCCEEDED, FAILED)
+
+
+class _FakeClient(object):
+    def __init__(self):
+        self.data = []
+        self.calls = 0
+
+    def jobs(self):
+        self.calls += 1
+        return [DkronJob.from_dict(job_data, self) for job_data in self.data]
+
+
+class WatchTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.watch
+    """
+    def test_diff_snapshots(self):
+        """
+        diff_snapshots: Test added, removed, modified and run count events
+        """
+        previous = {
+            "job1": {"name": "job1", "schedule": "@every 1m", "success_count": 1, "next": "a"},
+            "job2": {"name": "job2"},
+        }
+        current = {
+            "job1": {"name": "job1", "schedule": "@every 5m", "success_count": 3,
+                     "error_count": 1, "next": "b"},
+            "job3": {"name": "job3"},
+        }
+        events = dict(
+            (event.kind, event) for event in diff_snapshots(previous, current))
+        self.assertEqual(sorted(events), sorted([ADDED, REMOVED, MODIFIED, SUCCEEDED, FAILED]))
+        self.assertEqual(events[MODIFIED].changes, {"schedule": ("@every 1m", "@every 5m")})
+        self.assertEqual(events[SUCCEEDED].count, 2)
+        self.assertEqual(events[FAILED].count, 1)
+        self.assertEqual(events[ADDED].name, "job3")
+        self.assertEqual(events[REMOVED].name, "job2")
+        self.assertEqual(diff_snapshots(current, current), [])
+
+    def test_shared_poller(self):
+        """
+        JobWatcher: Test every subscriber gets the events of a single poll
+        """
+        client = _FakeClient()
+        client.data = [{"name": "job1"}]
+        watcher = JobWatcher(client, interval=3600)
+        first = watcher.subscribe(initial=True)
+        second = watcher.subscribe()
+        self.assertEqual(first.get(timeout=2).kind, ADDED)
+        client.data = [{"name": "job1", "disabled": True}]
+        events = watcher.poll()
+        self.assertEqual([event.kind for event in events], [MODIFIED])
+        for subscription in (first, second):
+            event = subscription.get(timeout=1)
+            self.assertEqual(event.changes, {"disabled": (None, True)})
+        self.assertEqual(client.calls, 2)
+        first.close()
+        second.close()
+        self.assertIsNone(watcher._stop)
+        self.assertEqual(list(first), [])
+
+    def test_watch_jobs(self):
+        """
+        DkronClient: Test watch_jobs subscribers share a watcher
+        """
+        client = DkronClient(hosts=["localhost:8080"])
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs",
+                text=json.dumps([{"name": "job1"}]))
+            with client.watch_jobs(interval=3600, initial=True) as first:
+                with client.watch_jobs(interval=3600) as second:
+                    self.assertIs(first.watcher, second.watcher)
+                    self.assertEqual(first.get(timeout=2).name, "job1")
+                    self.assertIsNone(second.get(timeout=0.05))
+
+    def test_bounded_subscription(self):
+        """
+        JobWatcher: Test a full subscription drops and counts events without blocking the poller
+        """
+        client = _FakeClient()
+        watcher = JobWatcher(client, interval=3600)
+        client.data = [{"name": "job%d" % index} for index in range(3)]
+        watcher.poll()
+        slow = watcher.subscribe(maxsize=2)
+        fast = watcher.subscribe()
+        client.data = [{"name": "job%d" % index, "disabled": True} for index in range(3)]
+        self.assertEqual(len(watcher.poll()), 3)
+        self.assertEqual(slow.dropped, 1)
+        self.assertEqual(len([fast.get(timeout=1) for _ in range(3)]), 3)
+        slow.close()
+        self.assertEqual(len(list(slow)), 1)
+        self.assertEqual(slow.dropped, 2)
+        fast.close()
+
+    def test_client_close(self):
+        """
+        DkronClient: Test close ends the subscriptions and joins the polling loops
+        """
+        client = DkronClient(hosts=["localhost:8080"])
+        with requests_mock.Mocker() as mocker:
+            mocker.register_uri(
+                requests_mock.GET, "http://localhost:8080/v1/jobs",
+                text=json.dumps([{"name": "job1"}]))
+            first = client.watch_jobs(interval=3600, initial=True)
+            second = client.watch_jobs(interval=1800, maxsize=1)
+            self.assertEqual(first.get(timeout=2).name, "job1")
+            threads = [first.watcher._thread, second.watcher._thread]
+            client.close()
+        self.assertEqual(client._watchers, {})
+        self.assertTrue(first.closed and second.closed)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(list(first), [])
+        self.assertIsNone(second.get(timeout=1))
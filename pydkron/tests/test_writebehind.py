@@ -0,0 +1,164 @@
+"""
+pydkron.writebehind test functions
+"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import requests_mock
+
+from pydkron.client import DkronClient
+from pydkron.exceptions import DkronJobNotFound
+from pydkron.fakeserver import FakeCluster
+from pydkron.job import DkronJob
+
+URL = "http://localhost:8080/v1"
+
+EXIT_SCRIPT = """
+import sys
+from pydkron.client import DkronClient
+from pydkron.job import DkronJob
+client = DkronClient(hosts=[sys.argv[1]])
+client.enable_write_behind(interval=60)
+for index in range(3):
+    client.save_job(DkronJob(client, name="job%d" % index))
+client.toggle("job0")
+"""
+
+
+def _echo(request, context):
+    context.status_code = 201
+    return json.dumps(request.json())
+
+
+class WriteBehindTestCase(unittest.TestCase):
+    """
+    Test cases for pydkron.writebehind
+    """
+    def setUp(self):
+        self.client = DkronClient(hosts=["localhost:8080"])
+        self.queue = self.client.enable_write_behind(interval=60, max_pending=100)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_merge(self):
+        """
+        WriteBehindQueue: Test last save wins, toggles cancel out and delete supersedes,
+        a toggle behind a pending delete fails
+        """
+        job = DkronJob(self.client, name="job1", schedule="@every 1m", disabled=False)
+        with requests_mock.mock() as req:
+            req.post(URL + "/jobs", text=_echo)
+            req.post(URL + "/jobs/job2/toggle", text=json.dumps({"name": "job2"}))
+            req.delete(URL + "/jobs/job4", text=json.dumps({"name": "job4"}))
+            first = job.save()
+            job.schedule = "@every 5m"
+            second = job.save()
+            toggled = self.client.toggle("job1")
+            self.client.toggle("job2")
+            self.client.toggle("job3")
+            cancelled = self.client.toggle("job3")
+            self.client.save_job(DkronJob(self.client, name="job4"))
+            deleted = self.client.delete_job("job4")
+            orphan = self.client.toggle("job4")
+            self.assertEqual(len(self.queue), 4)
+            self.assertEqual(req.call_count, 0)
+            result = self.queue.flush()
+            self.assertTrue(result.ok)
+            sent = sorted((request.method, request.path) for request in req.request_history)
+            self.assertEqual(sent, [("DELETE", "/v1/jobs/job4"), ("POST", "/v1/jobs"),
+                              ("POST", "/v1/jobs/job2/toggle")])
+        saved = first.result(timeout=1)
+        self.assertEqual(saved, {"name": "job1", "schedule": "@every 5m", "disabled": True})
+        self.assertIs(second.result(), saved)
+        self.assertIsInstance(toggled.result(), DkronJob)
+        self.assertEqual(toggled.result(), saved)
+        self.assertIsNone(cancelled.result())
+        self.assertEqual(deleted.result(), {"name": "job4"})
+        with self.assertRaises(DkronJobNotFound):
+            orphan.result()
+        self.assertFalse(job.disabled)
+
+    def test_errors_and_triggers(self):
+        """
+        WriteBehindQueue: Test failures reach the futures and the size trigger flushes
+        """
+        self.client.disable_write_behind()
+        queue = self.client.enable_write_behind(interval=60, max_pending=2)
+        with requests_mock.mock() as req:
+            req.post(URL + "/jobs/job1/toggle", status_code=404, text="{}")
+            req.post(URL + "/jobs", text=_echo)
+            failed = self.client.toggle("job1")
+            saved = self.client.save_job(DkronJob(self.client, name="job2"))
+            self.assertEqual(saved.result(timeout=5), {"name": "job2"})
+            with self.assertRaises(DkronJobNotFound):
+                failed.result(timeout=5)
+            self.assertEqual(len(queue), 0)
+            # bulk operations are not queued
+            result = self.client.save_jobs([DkronJob(self.client, name="job3")])
+            self.assertEqual(result.succeeded["job3"], {"name": "job3"})
+
+    def test_close_flushes(self):
+        """
+        DkronClient: Test close flushes the pending writes and writes right away after
+        """
+        with requests_mock.mock() as req:
+            req.post(URL + "/jobs", text=_echo)
+            pending = self.client.save_job(DkronJob(self.client, name="job1"))
+            self.client.close()
+            self.assertTrue(pending.done())
+            self.assertTrue(self.queue.closed)
+            self.assertIsNone(self.client.write_behind)
+            with self.assertRaises(RuntimeError):
+                self.queue.save({"name": "job2"})
+            self.assertEqual(self.client.save_job(DkronJob(self.client, name="job2")),
+                             {"name": "job2"})
+
+    def test_delete_then_save(self):
+        """
+        WriteBehindQueue: Test a save queued after a delete sends the delete, then the save
+        """
+        with requests_mock.mock() as req:
+            req.delete(URL + "/jobs/job1", text=json.dumps({"name": "job1", "schedule": "old"}))
+            req.delete(URL + "/jobs/job2", status_code=404, text="{}")
+            req.post(URL + "/jobs", text=_echo)
+            deleted = self.client.delete_job("job1")
+            saved = self.client.save_job(DkronJob(self.client, name="job1", disabled=False))
+            toggled = self.client.toggle("job1")
+            missing = self.client.delete_job("job2")
+            created = self.client.save_job(DkronJob(self.client, name="job2"))
+            result = self.queue.flush()
+            sent = [(request.method, request.json()["name"] if request.body else request.path)
+                    for request in req.request_history]
+        # the jobs are flushed concurrently, the writes of each job in order
+        self.assertEqual([method for method, target in sent if target.endswith("job1")],
+                         ["DELETE", "POST"])
+        self.assertEqual([method for method, target in sent if target.endswith("job2")],
+                         ["DELETE", "POST"])
+        self.assertEqual(deleted.result(), {"name": "job1", "schedule": "old"})
+        self.assertEqual(saved.result(), {"name": "job1", "disabled": True})
+        self.assertEqual(toggled.result(), saved.result())
+        with self.assertRaises(DkronJobNotFound):
+            missing.result()
+        self.assertEqual(created.result(), {"name": "job2"})
+        self.assertTrue(result.ok)
+
+    def test_flush_at_exit(self):
+        """
+        WriteBehindQueue: Test the writes still queued at interpreter exit are sent
+        """
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))] +
+            [path for path in [env.get("PYTHONPATH")] if path])
+        with FakeCluster() as cluster:
+            proc = subprocess.run(
+                [sys.executable, "-c", EXIT_SCRIPT, cluster.hosts[0]], env=env,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=30)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertEqual(proc.stderr, b"")
+            self.assertEqual(cluster.job_names(), ["job0", "job1", "job2"])
+            self.assertTrue(cluster.get_job("job0")["disabled"])
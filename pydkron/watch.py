@@ -0,0 +1,265 @@
+"""
+Job change events from polled snapshots
+"""
+from threading import Event, Lock, Thread, current_thread
+
+from six.moves import queue
+
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# fields that change on every run, reported through SUCCEEDED/FAILED or not at all
+VOLATILE_FIELDS = frozenset([
+    "success_count",
+    "error_count",
+    "last_success",
+    "last_error",
+    "next",
+    "status",
+])
+
+
+class JobEvent(object):
+    """
+    A change of a single job between two snapshots
+
+    kind is one of added, removed, modified, succeeded or failed. changes
+    maps the modified fields to (old, new) and count is the number of new
+    successes/failures.
+    """
+    __slots__ = ("kind", "name", "job", "previous", "changes", "count")
+
+    def __init__(self, kind, name, job=None, previous=None, changes=None, count=0):
+        self.kind = kind
+        self.name = name
+        self.job = job
+        self.previous = previous
+        self.changes = changes
+        self.count = count
+
+    def __repr__(self):
+        return "<JobEvent %s %s>" % (self.kind, self.name)
+
+
+def _count_delta(previous, job, field):
+    return (job.get(field) or 0) - (previous.get(field) or 0)
+
+
+def diff_snapshots(previous, current, ignore=VOLATILE_FIELDS):
+    """
+    Return the JobEvents that turn the previous snapshot into the current one
+
+    :param previous: Mapping of job name to job
+    :param current: Mapping of job name to job
+    :param ignore: Fields left out of the modified diff
+    """
+    events = []
+    for name, job in current.items():
+        old = previous.get(name)
+        if old is None:
+            events.append(JobEvent(ADDED, name, job))
+            continue
+        if old is job:
+            continue
+        changes = {}
+        for key in set(old) | set(job):
+            if key in ignore or key.startswith("_"):
+                continue
+            if old.get(key) != job.get(key):
+                changes[key] = (old.get(key), job.get(key))
+        if changes:
+            events.append(JobEvent(MODIFIED, name, job, old, changes))
+        succeeded = _count_delta(old, job, "success_count")
+        if succeeded > 0:
+            events.append(JobEvent(SUCCEEDED, name, job, old, count=succeeded))
+        failed = _count_delta(old, job, "error_count")
+        if failed > 0:
+            events.append(JobEvent(FAILED, name, job, old, count=failed))
+    for name, old in previous.items():
+        if name not in current:
+            events.append(JobEvent(REMOVED, name, previous=old))
+    return events
+
+
+class Subscription(object):
+    """
+    Queue of JobEvents for one consumer of a JobWatcher, iterate it or call get()
+
+    A bounded subscription (maxsize > 0) never blocks the shared poller:
+    the events arriving while its queue is full are dropped and counted in
+    dropped.
+    """
+    def __init__(self, watcher, initial=False, maxsize=0):
+        self.watcher = watcher
+        self.initial = initial
+        self._queue = queue.Queue(maxsize)
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, event):
+        """
+        Deliver an event to this subscriber, dropping it when the queue is full
+        """
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def get(self, timeout=None):
+        """
+        Return the next event, None on timeout or once closed
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _end(self):
+        """
+        Mark the subscription closed and wake up its consumer
+        """
+        self.closed = True
+        while True:
+            try:
+                self._queue.put_nowait(None)
+                return
+            except queue.Full:
+                # make room for the end marker in a full bounded queue
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def close(self):
+        """
+        Stop receiving events
+        """
+        if not self.closed:
+            self._end()
+            self.watcher.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            yield event
+
+
+class JobWatcher(object):
+    """
+    Single polling loop over client.jobs() shared by every subscriber
+
+    The first poll only records the baseline snapshot (subscribers asking
+    for initial events get an added event per job); each following poll
+    publishes the JobEvents of the diff to every subscriber. The loop runs
+    while there are subscribers.
+    """
+    def __init__(self, client, interval=5, ignore=VOLATILE_FIELDS):
+        """
+        :param client: DkronClient
+        :param interval: Seconds between polls
+        :param ignore: Fields left out of the modified diff
+        """
+        self.client = client
+        self.interval = interval
+        self.ignore = ignore
+        self.snapshot = None
+        self.last_error = None
+        self._subscribers = []
+        self._lock = Lock()
+        self._stop = None
+        self._thread = None
+
+    def subscribe(self, initial=False, maxsize=0):
+        """
+        Return a new Subscription, starting the polling loop if needed
+
+        :param initial: Also get an added event for every job already in the cluster
+        :param maxsize: Bound of the subscription queue (0 is unbounded), the
+            events that do not fit are dropped
+        """
+        subscription = Subscription(self, initial, maxsize)
+        with self._lock:
+            if initial and self.snapshot is not None:
+                for name, job in self.snapshot.items():
+                    subscription.put(JobEvent(ADDED, name, job))
+            self._subscribers.append(subscription)
+            if self._stop is None:
+                self._stop = Event()
+                self._thread = Thread(
+                    target=self._run, args=(self._stop,), name="pydkron-watch")
+                self._thread.daemon = True
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscription, the polling loop stops with the last one
+        """
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+            if not self._subscribers and self._stop is not None:
+                self._stop.set()
+                self._stop = None
+                self._thread = None
+                self.snapshot = None
+
+    def close(self):
+        """
+        Close every subscription and wait for the polling loop to stop
+        """
+        with self._lock:
+            subscriptions, self._subscribers = self._subscribers, []
+            stop, self._stop = self._stop, None
+            thread, self._thread = self._thread, None
+            self.snapshot = None
+        for subscription in subscriptions:
+            subscription._end()
+        if stop is not None:
+            stop.set()
+        if thread is not None and thread is not current_thread():
+            thread.join()
+
+    def poll(self):
+        """
+        Fetch the jobs once and publish the changes, returns the events
+        """
+        current = dict((job["name"], job) for job in self.client.jobs())
+        with self._lock:
+            previous = self.snapshot
+            self.snapshot = current
+            subscribers = list(self._subscribers)
+        if previous is None:
+            added = [JobEvent(ADDED, name, job) for name, job in current.items()]
+            for subscription in subscribers:
+                if subscription.initial:
+                    for event in added:
+                        subscription.put(event)
+            return []
+        events = diff_snapshots(previous, current, self.ignore)
+        for event in events:
+            for subscription in subscribers:
+                subscription.put(event)
+        return events
+
+    def _run(self, stop):
+        while not stop.is_set():
+            try:
+                self.poll()
+                self.last_error = None
+            except Exception as exc:  # pylint: disable=broad-except
+                # keep polling through transient cluster errors
+                self.last_error = exc
+            stop.wait(self.interval)
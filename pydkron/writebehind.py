@@ -0,0 +1,216 @@
+"""
+Write-behind queue merging bursts of job mutations
+"""
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Event, Lock, Thread
+import atexit
+
+from pydkron.bulk import BulkResult, run_bulk
+from pydkron.exceptions import DkronJobNotFound
+from pydkron.job import DkronJob
+
+
+class _Pending(object):
+    """
+    The merged mutations of one job waiting for a flush
+    """
+    __slots__ = ("name", "job", "toggles", "delete", "futures", "sent")
+
+    def __init__(self, name):
+        self.name = name
+        self.job = None
+        self.toggles = 0
+        self.delete = False
+        # (future, kind) of every merged call, kind is save, toggle or delete
+        self.futures = []
+        self.sent = False
+
+
+def _outcome(func, *args):
+    """
+    Call func, returns (result, exception)
+    """
+    try:
+        return func(*args), None
+    except Exception as exc:  # pylint: disable=broad-except
+        return None, exc
+
+
+class WriteBehindQueue(object):
+    """
+    Collects save, toggle and delete calls and writes them in batches
+
+    The mutations of a job are merged until the next flush: the last save
+    wins, toggles flip the pending save (or cancel out in pairs) and a
+    delete supersedes everything queued before it (a toggle queued after
+    it fails with DkronJobNotFound). A save queued after a delete keeps
+    the delete, both are sent in that order. A flush happens every
+    interval seconds, as soon as max_pending jobs are waiting, on flush()
+    and on close(), which also runs at interpreter exit and then writes
+    from the calling thread. Every call returns a
+    concurrent.futures.Future: a delete resolves with the result of its
+    delete, a save with the result of the merged write and a toggle with
+    the merged write as a DkronJob (None when toggles cancelled out and
+    nothing was sent).
+    """
+    def __init__(self, client, interval=1.0, max_pending=100, max_workers=None):
+        """
+        :param client: DkronClient
+        :param interval: Maximum seconds a mutation waits before it is written
+        :param max_pending: Number of waiting jobs that triggers a flush
+        :param max_workers: Concurrency of a flush, the client max_workers by default
+        """
+        self.client = client
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_workers = max_workers if max_workers is not None else client.max_workers
+        self.closed = False
+        self._pending = OrderedDict()
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._wake = Event()
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name="pydkron-write-behind")
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _enqueue(self, name, kind, merge):
+        """
+        Merge a mutation into the pending entry of a job, merge returns an
+        exception to fail the mutation with instead
+        """
+        future = Future()
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("Write-behind queue is closed")
+            entry = self._pending.get(name)
+            if entry is None:
+                entry = self._pending[name] = _Pending(name)
+            error = merge(entry)
+            if error is None:
+                entry.futures.append((future, kind))
+            full = len(self._pending) >= self.max_pending
+        if error is not None:
+            future.set_exception(error)
+        elif full:
+            self._wake.set()
+        return future
+
+    def save(self, job):
+        """
+        Queue a save of the job (copied as it is now), returns a Future
+        """
+        job = DkronJob(self.client, **dict(job.items()))
+
+        def _merge(entry):
+            entry.job = job
+            entry.toggles = 0
+
+        return self._enqueue(job["name"], "save", _merge)
+
+    def toggle(self, name):
+        """
+        Queue an enable/disable of the job, returns a Future
+
+        The Future fails with DkronJobNotFound when a delete of the job is
+        pending and no save was queued after it.
+        """
+        def _merge(entry):
+            if entry.job is not None:
+                entry.job["disabled"] = not entry.job.get("disabled")
+            elif entry.delete:
+                return DkronJobNotFound("Job %s was not found (delete pending)" % name)
+            else:
+                entry.toggles += 1
+            return None
+
+        return self._enqueue(name, "toggle", _merge)
+
+    def delete(self, name):
+        """
+        Queue a delete of the job, returns a Future
+        """
+        def _merge(entry):
+            entry.job = None
+            entry.toggles = 0
+            entry.delete = True
+
+        return self._enqueue(name, "delete", _merge)
+
+    def _apply(self, entry):
+        """
+        Send the merged writes of a job and resolve its futures
+        """
+        client = self.client
+        entry.sent = True
+        deleted = None
+        if entry.delete:
+            deleted = _outcome(client._delete_job, entry.name)
+        if entry.job is not None:
+            merged = _outcome(client._save_job, entry.job)
+        elif entry.delete:
+            merged = deleted
+        elif entry.toggles % 2:
+            merged = _outcome(client._toggle, entry.name)
+        else:
+            merged = (None, None)
+        for future, kind in entry.futures:
+            result, exc = deleted if kind == "delete" else merged
+            if exc is not None:
+                future.set_exception(exc)
+            elif kind == "toggle" and result is not None and not isinstance(result, DkronJob):
+                future.set_result(DkronJob.from_dict(result, client))
+            else:
+                future.set_result(result)
+        result, exc = merged
+        if exc is not None:
+            raise exc
+        return result
+
+    def flush(self, serial=False):
+        """
+        Write every pending mutation now, returns a BulkResult by job name
+
+        :param serial: Write from the calling thread instead of a thread pool
+        """
+        with self._flush_lock:
+            with self._lock:
+                entries = list(self._pending.values())
+                self._pending = OrderedDict()
+            result = BulkResult()
+
+            def _send(entry):
+                result.add(entry.name, self._apply, entry)
+
+            try:
+                run_bulk(_send, entries, max_workers=1 if serial else self.max_workers)
+            except RuntimeError:
+                # no new threads once the interpreter is exiting, finish here
+                run_bulk(_send, [entry for entry in entries if not entry.sent], max_workers=1)
+            return result
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """
+        Flush the pending mutations and stop the background flushes
+        """
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        atexit.unregister(self.close)
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self.flush(serial=True)
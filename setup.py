@@ -6,8 +6,8 @@ import sys
 from setuptools import setup, find_packages
 
 
-if sys.version_info[:2] < (2, 6):
-    raise RuntimeError('Requires Python 2.6 or better')
+if sys.version_info[:2] < (3, 8):
+    raise RuntimeError('Requires Python 3.8 or better')
 
 with open(os.path.join(os.path.dirname(__file__), 'pydkron', '__init__.py')) as f:
     VERSION = re.search("__version__ = '([^']+)'", f.read()).group(1)
@@ -17,6 +17,12 @@ INSTALL_REQUIRES = [
     'six'
 ]
 
+EXTRAS_REQUIRE = {
+    'async': ['aiohttp'],
+    'fast': ['orjson'],
+    'numpy': ['numpy'],
+}
+
 HERE = pathlib.Path(__file__).parent
 
 README = (HERE / "README.md").read_text()
@@ -35,12 +41,19 @@ setup(
     license='MIT License',
     packages=find_packages(exclude=['test']),
     include_package_data=True,
+    python_requires='>=3.8',
     install_requires=INSTALL_REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'Intended Audience :: Developers',
         'Topic :: Software Development :: Build Tools',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 3'
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
     ]
 )